@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -128,6 +129,18 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache shared by every web and worker process on this host: entries (job
+# searches, lesson navigation, the home page) are dropped by whichever
+# process changes the data, which a per-process cache would never see.
+# Point this at Redis or Memcached once the site runs on several hosts.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'skillnest_cache'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
 # Authentication
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
@@ -135,4 +148,21 @@ LOGIN_REDIRECT_URL = 'dashboard'
 # Email backend for development
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Job match scoring: 'ratio' (share of required skills held) or 'weighted'
+# (inverse-frequency skill weights x proficiency, see skillnest_app/scoring.py).
+# Run `manage.py recompute_recommendations` after changing it.
+SKILLNEST_MATCH_SCORING = 'ratio'
+
+# Lesson videos are streamed by Django (sendfile where the WSGI server
+# supports it). Set to 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache)
+# to hand the transfer to the front-end server after the access check; for
+# nginx, map SKILLNEST_MEDIA_ACCEL_PREFIX to MEDIA_ROOT as an internal location.
+SKILLNEST_MEDIA_OFFLOAD = None
+SKILLNEST_MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+# Binaries used by `manage.py transcode_videos` to build HLS renditions of
+# uploaded lesson videos (see skillnest_app/transcoding.py)
+SKILLNEST_FFMPEG_BINARY = 'ffmpeg'
+SKILLNEST_FFPROBE_BINARY = 'ffprobe'
+
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
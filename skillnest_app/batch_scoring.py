@@ -0,0 +1,315 @@
+"""
+Batch Recommendation Engine
+Scores every student against every active job at once. Student and job skill
+sets are loaded into sparse user x skill and job x skill matrices; a single
+sparse product gives the matched-skill count for every (user, job) pair that
+shares at least one skill. Top-k per user is then written back in bulk.
+Under weighted scoring (see scoring.py) a second product over the same
+pattern, with skill weights on the job side and proficiency multipliers on
+the student side, gives the weighted score.
+
+Used by the `recompute_recommendations` management command for the nightly
+full refresh; per-user scoring still goes through recommendations.py.
+
+The job matrix can be published in shared memory so a process pool scores
+chunks of students against one read-only copy. Model imports are deferred so
+worker processes only need numpy/scipy, not a configured Django.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+
+from .scoring import PROFICIENCY_LEVELS, PROFICIENCY_WEIGHTS
+
+# Arrays making up a JobSkillMatrix, in the order they are shared
+MATRIX_ARRAYS = ('job_ids', 'skill_ids', 'indptr', 'indices', 'posted', 'weights')
+
+# Proficiency level code (index into PROFICIENCY_LEVELS) -> multiplier
+PROFICIENCY_MULTIPLIERS = np.array([PROFICIENCY_WEIGHTS[level] for level in PROFICIENCY_LEVELS])
+LEVEL_CODES = {level: code for code, level in enumerate(PROFICIENCY_LEVELS)}
+
+
+class JobSkillMatrix:
+    """Sparse job x skill matrix over all active jobs"""
+
+    def __init__(self, job_ids, skill_ids, indptr, indices, posted, weights):
+        self.job_ids = job_ids
+        self.skill_ids = skill_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.posted = posted
+        self.weights = weights
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(job_ids), len(skill_ids)),
+        )
+        self.required = np.diff(indptr)
+        # Same pattern with each required skill's weight, for weighted scoring
+        self.weighted_matrix = sparse.csr_matrix(
+            (weights[indices], indices, indptr),
+            shape=(len(job_ids), len(skill_ids)),
+        )
+        self.required_weight = np.asarray(self.weighted_matrix.sum(axis=1)).ravel()
+
+    @classmethod
+    def from_database(cls, scoring=None):
+        """Load all active jobs; `scoring` supplies per-skill weights (default 1.0)"""
+        from .job_search import live_jobs_q
+        from .models import Job
+
+        # The posting date rides along with every (job, skill) pair, so the
+        # jobs are not fetched again by id
+        rows = list(
+            Job.skills_required.through.objects.filter(
+                live_jobs_q(prefix='job__')
+            ).values_list('job_id', 'skill_id', 'job__posted_date')
+        )
+        pairs = np.array(
+            [(job_id, skill_id) for job_id, skill_id, _ in rows], dtype=np.int64,
+        ).reshape(-1, 2)
+        posted_dates = {job_id: posted_date for job_id, _, posted_date in rows}
+
+        job_ids = np.unique(pairs[:, 0])
+        skill_ids = np.unique(pairs[:, 1])
+        rows = np.searchsorted(job_ids, pairs[:, 0])
+        cols = np.searchsorted(skill_ids, pairs[:, 1])
+        matrix = sparse.csr_matrix(
+            (np.ones(len(pairs), dtype=np.int32), (rows, cols)),
+            shape=(len(job_ids), len(skill_ids)),
+        )
+        matrix.sort_indices()
+
+        posted = np.array(
+            [posted_dates[job_id].timestamp() for job_id in job_ids.tolist()],
+            dtype=np.float64,
+        )
+        weights = np.array(
+            [scoring.skill_weight(skill_id) if scoring else 1.0 for skill_id in skill_ids.tolist()],
+            dtype=np.float64,
+        )
+        return cls(job_ids, skill_ids, matrix.indptr.astype(np.int64), matrix.indices.astype(np.int64), posted, weights)
+
+    # ---------- shared memory ----------
+    def to_shared_memory(self):
+        """
+        Copy the matrix arrays into shared memory blocks.
+
+        Returns:
+            Tuple: (blocks, spec). Keep `blocks` alive while workers run and
+            call release_shared_memory(blocks) afterwards; `spec` is the
+            small picklable description passed to from_shared_memory.
+        """
+        blocks = []
+        spec = []
+        for name in MATRIX_ARRAYS:
+            array = getattr(self, name)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            blocks.append(block)
+            spec.append((block.name, array.shape, array.dtype.str))
+        return blocks, spec
+
+    @classmethod
+    def from_shared_memory(cls, spec):
+        """Attach to shared blocks without copying. Returns (matrix, blocks)"""
+        blocks = []
+        arrays = []
+        for name, shape, dtype in spec:
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            arrays.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+        return cls(*arrays), blocks
+
+    # ---------- scoring ----------
+    def user_matrix(self, user_ids, pairs, proficiency=False):
+        """
+        Build the sparse user x skill matrix for `user_ids` (sorted array)
+        from (user_id, skill_id, level_code) `pairs`.
+
+        Entries are 1, or the proficiency multiplier when `proficiency` is
+        set. Skills no active job requires are dropped; they cannot affect
+        scores.
+        """
+        cols = np.searchsorted(self.skill_ids, pairs[:, 1])
+        known = cols < len(self.skill_ids)
+        known[known] = self.skill_ids[cols[known]] == pairs[known, 1]
+        rows = np.searchsorted(user_ids, pairs[known, 0])
+        if proficiency:
+            data = PROFICIENCY_MULTIPLIERS[pairs[known, 2]]
+        else:
+            data = np.ones(int(known.sum()), dtype=np.int32)
+        return sparse.csr_matrix(
+            (data, (rows, cols[known])),
+            shape=(len(user_ids), len(self.skill_ids)),
+        )
+
+    def top_k(self, user_ids, pairs, limit, min_score=0.0, weighted=False):
+        """
+        Score `user_ids` against all jobs and yield the top matches.
+
+        Yields:
+            (user_id, [(job_id, match_score, matched_count, required_count), ...])
+            ordered by match score, then newest posting first.
+        """
+        counts = (self.user_matrix(user_ids, pairs) @ self.matrix.T).tocsr()
+        counts.sort_indices()
+        if weighted:
+            # Same sparsity pattern as `counts`, so the data arrays line up
+            gained = (self.user_matrix(user_ids, pairs, proficiency=True) @ self.weighted_matrix.T).tocsr()
+            gained.sort_indices()
+        for row, user_id in enumerate(user_ids.tolist()):
+            start, end = counts.indptr[row], counts.indptr[row + 1]
+            job_rows = counts.indices[start:end]
+            matched = counts.data[start:end]
+            required = self.required[job_rows]
+            if weighted:
+                scores = gained.data[start:end] / self.required_weight[job_rows]
+            else:
+                scores = matched / required
+
+            keep = scores > min_score
+            job_rows, matched, required, scores = job_rows[keep], matched[keep], required[keep], scores[keep]
+            order = np.lexsort((-self.posted[job_rows], -scores))[:limit]
+
+            yield user_id, [
+                (int(self.job_ids[j]), float(scores[i]), int(matched[i]), int(required[i]))
+                for i, j in zip(order, job_rows[order])
+            ]
+
+    def score_chunk(self, user_ids, pairs, limit, min_score=0.0, weighted=False):
+        """Score one chunk into (user_id, job_id, score, matched, required) rows"""
+        return [
+            (user_id, job_id, match_score, matched_count, required_count)
+            for user_id, matches in self.top_k(user_ids, pairs, limit, min_score, weighted)
+            for job_id, match_score, matched_count, required_count in matches
+        ]
+
+
+def release_shared_memory(blocks, unlink=True):
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def load_user_skill_pairs(user_ids):
+    """
+    Return (user_id, skill_id, level_code) rows for `user_ids` as an (n, 3)
+    array; level_code indexes PROFICIENCY_LEVELS.
+    """
+    from .models import StudentSkill
+
+    rows = StudentSkill.objects.filter(user_id__in=user_ids.tolist()).values_list(
+        'user_id', 'skill_id', 'proficiency_level'
+    )
+    return np.array(
+        [(user_id, skill_id, LEVEL_CODES.get(level, 0)) for user_id, skill_id, level in rows],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+
+
+# ---------- process pool workers ----------
+_worker_matrix = None
+_worker_blocks = None
+
+
+def _init_worker(spec):
+    global _worker_matrix, _worker_blocks
+    _worker_matrix, _worker_blocks = JobSkillMatrix.from_shared_memory(spec)
+
+
+def _score_in_worker(user_ids, pairs, limit, min_score, weighted):
+    return _worker_matrix.score_chunk(user_ids, pairs, limit, min_score, weighted)
+
+
+def score_in_chunks(jobs, user_ids, limit, min_score=0.0, chunk_size=2000, workers=1, weighted=False):
+    """
+    Score `user_ids` (ascending) in chunks, optionally across a process pool.
+
+    Chunks are yielded in order, so callers can persist and checkpoint each
+    one as it arrives. With workers > 1 the job matrix is shared with the
+    pool through shared memory instead of being pickled per task.
+
+    Yields:
+        (chunk_user_ids, rows) where rows are
+        (user_id, job_id, match_score, matched_count, required_count)
+    """
+    chunks = (user_ids[start:start + chunk_size] for start in range(0, len(user_ids), chunk_size))
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, jobs.score_chunk(chunk, load_user_skill_pairs(chunk), limit, min_score, weighted)
+        return
+
+    blocks, spec = jobs.to_shared_memory()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_score_in_worker, chunk, load_user_skill_pairs(chunk), limit, min_score, weighted)))
+                # Keep a bounded number of chunks in flight
+                if len(pending) >= workers * 2:
+                    chunk, future = pending.popleft()
+                    yield chunk, future.result()
+            while pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+    finally:
+        release_shared_memory(blocks)
+
+
+def refresh_all_recommendations(limit=None, chunk_size=2000, workers=1, user_ids=None, on_chunk=None):
+    """
+    Recompute stored JobRecommendation rows for every student with skills.
+
+    Users are processed in chunks of `chunk_size`; each chunk is scored with
+    one sparse product and written through the bulk upsert layer.
+
+    Args:
+        user_ids: Ascending array of user ids to refresh (default: every
+                  student with skills or stored rows)
+        on_chunk: Optional callback(chunk_user_ids, counts) run after each
+                  chunk is stored, in user_id order
+
+    Returns:
+        Dict with inserted, updated and deleted row counts
+    """
+    from django.db.models import F
+    from .models import StudentSkill, JobRecommendation, UserProfile
+    from .recommendations import RECOMMENDATION_LIMIT, MIN_MATCH_SCORE, persist_recommendations
+    from .scoring import get_match_scoring, refresh_skill_weights
+
+    scoring = get_match_scoring()
+    if scoring.uses_proficiency:
+        # Full recount so the weights match the data being scored
+        refresh_skill_weights()
+    jobs = JobSkillMatrix.from_database(scoring if scoring.uses_proficiency else None)
+    if user_ids is None:
+        # Students with skills, plus anyone still holding stale rows
+        user_ids = np.array(
+            sorted(
+                set(StudentSkill.objects.values_list('user_id', flat=True).distinct())
+                | set(JobRecommendation.objects.values_list('user_id', flat=True).distinct())
+            ),
+            dtype=np.int64,
+        )
+
+    totals = {'inserted': 0, 'updated': 0, 'deleted': 0}
+    chunks = score_in_chunks(
+        jobs, user_ids, limit or RECOMMENDATION_LIMIT, MIN_MATCH_SCORE,
+        chunk_size=chunk_size, workers=workers, weighted=scoring.uses_proficiency,
+    )
+    for chunk, rows in chunks:
+        counts = persist_recommendations(rows, replace_users=chunk.tolist())
+        UserProfile.objects.filter(user_id__in=chunk.tolist()).update(
+            recommendations_version=F('skills_version')
+        )
+        for key in totals:
+            totals[key] += counts[key]
+        if on_chunk is not None:
+            on_chunk(chunk.tolist(), counts)
+    return totals
@@ -0,0 +1,62 @@
+"""
+Cache Versions
+Version numbers of the data behind the per-process indexes and the cached
+results (the skill -> job index, job search results, ...). A writer bumps
+the version once its change has committed; every process compares the
+stored version with the one its copy was built from and rebuilds on a
+difference.
+
+The numbers live in the CacheVersion table, so a bump is one atomic
+increment that every web and worker process sees, whatever cache backend
+is configured. Reads are memoized: all versions are loaded with a single
+query, at most once per request (the memo is dropped on request_started,
+see models.py) and at most every VERSION_CHECK_INTERVAL seconds in
+long-running commands and workers.
+"""
+
+import time
+
+from django.db import transaction
+from django.db.models import F
+
+# Seconds a process trusts its loaded versions outside a request
+VERSION_CHECK_INTERVAL = 5
+
+_versions = {}
+_checked_at = None
+
+
+def get_cache_version(name):
+    """Current version of `name` (0 until it is first bumped)"""
+    global _versions, _checked_at
+    if _checked_at is None or time.monotonic() - _checked_at >= VERSION_CHECK_INTERVAL:
+        from .models import CacheVersion
+
+        _versions = dict(CacheVersion.objects.values_list('name', 'version'))
+        _checked_at = time.monotonic()
+    return _versions.get(name, 0)
+
+
+def bump_cache_version(name):
+    """
+    Move `name` to a new version in every process.
+
+    Returns:
+        The new version number
+    """
+    global _versions
+    from .models import CacheVersion
+
+    with transaction.atomic():
+        CacheVersion.objects.get_or_create(name=name)
+        # The increment locks the row, so concurrent bumps never share a number
+        CacheVersion.objects.filter(name=name).update(version=F('version') + 1)
+        version = CacheVersion.objects.filter(name=name).values_list('version', flat=True).get()
+    _versions = {**_versions, name: version}
+    return version
+
+
+def forget_cache_versions():
+    """Reload the versions on the next lookup (called as each request starts)"""
+    global _checked_at
+    _checked_at = None
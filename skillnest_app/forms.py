@@ -6,8 +6,10 @@ from .models import Course, Skill, Lesson, Job, SocialLink, UserProfile, Portfol
 class CourseCreateForm(forms.ModelForm):
 	# Optional initial lesson fields (not part of Course model)
 	initial_lesson_title = forms.CharField(required=False, max_length=200, label='First Lesson Title')
-	initial_lesson_video_file = forms.FileField(required=False, label='First Lesson Video File', widget=ClearableFileInput)
+	initial_lesson_video_file = forms.FileField(required=False, label='First Lesson Video File', widget=ClearableFileInput(attrs={'data-chunked-upload': 'initial_lesson_video_upload'}))
 	initial_lesson_video_url = forms.URLField(required=False, label='First Lesson Video Embed URL')
+	# Set by the chunked uploader (static/js/chunked_upload.js) instead of sending the file
+	initial_lesson_video_upload = forms.UUIDField(required=False, widget=forms.HiddenInput)
 
 	class Meta:
 		model = Course
@@ -18,11 +20,14 @@ class CourseCreateForm(forms.ModelForm):
 
 
 class LessonForm(forms.ModelForm):
+	# Set by the chunked uploader (static/js/chunked_upload.js) instead of sending the file
+	video_upload = forms.UUIDField(required=False, widget=forms.HiddenInput)
+
 	class Meta:
 		model = Lesson
 		fields = ['title', 'description', 'order', 'video_url', 'video_file', 'content', 'duration_minutes']
 		widgets = {
-			'video_file': ClearableFileInput,
+			'video_file': ClearableFileInput(attrs={'data-chunked-upload': 'video_upload'}),
 		}
 
 
@@ -0,0 +1,123 @@
+"""
+Home Page Cache
+The home page's counters (skills, courses, students) and its rendered
+featured-course fragment, cached so anonymous visits to the busiest page
+do not touch the database.
+
+Entries are keyed by a data version, kept in the same cache (shared by
+every process, see CACHES in settings.py), that the Course, Lesson, Skill
+and UserProfile signals (see models.py) bump after each commit, so a change
+shows up on the next visit and old entries simply expire. A warm hit runs
+no queries.
+
+A miss is recomputed by one process only: the first one takes a short
+lock in the cache and rebuilds the entry, while concurrent misses serve
+the last value that was built (whatever its version) or, on a cold cache,
+wait briefly for the rebuild instead of all querying at once.
+"""
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+HOME_VERSION_KEY = 'skillnest:home:version'
+HOME_CACHE_KEY = 'skillnest:home:{name}:{version}'
+HOME_STALE_KEY = 'skillnest:home:{name}:last'
+HOME_LOCK_KEY = 'skillnest:home:{name}:lock'
+HOME_CACHE_TIMEOUT = 60 * 15
+# Last built values outlive the versioned entries so misses have something to serve
+HOME_STALE_TIMEOUT = 60 * 60 * 24
+
+# A rebuild taking longer than this is presumed dead and may be retried
+REBUILD_LOCK_TIMEOUT = 30
+# How long a cold-cache miss waits for another process's rebuild
+REBUILD_WAIT = 5.0
+REBUILD_POLL_INTERVAL = 0.05
+
+FEATURED_COURSE_COUNT = 6
+
+
+def _home_version():
+    version = cache.get(HOME_VERSION_KEY)
+    if version is None:
+        cache.add(HOME_VERSION_KEY, 1, timeout=None)
+        version = cache.get(HOME_VERSION_KEY)
+    return version
+
+
+def invalidate_home():
+    """Retire the cached counters and fragment (the data behind them changed)"""
+    try:
+        cache.incr(HOME_VERSION_KEY)
+    except ValueError:
+        cache.add(HOME_VERSION_KEY, 1, timeout=None)
+
+
+def _cached(name, build):
+    """
+    Return a home page entry, rebuilding it at most once at a time.
+
+    Args:
+        name: Entry name, part of the cache keys
+        build: Callable producing the value on a miss
+    """
+    key = HOME_CACHE_KEY.format(name=name, version=_home_version())
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    stale_key = HOME_STALE_KEY.format(name=name)
+    lock_key = HOME_LOCK_KEY.format(name=name)
+    if not cache.add(lock_key, key, REBUILD_LOCK_TIMEOUT):
+        # Someone else is rebuilding: serve the previous value if there is one
+        stale = cache.get(stale_key)
+        if stale is not None:
+            return stale
+        deadline = time.monotonic() + REBUILD_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(REBUILD_POLL_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                return value
+        # The rebuild is stuck; do it ourselves rather than fail the page
+        return build()
+
+    try:
+        value = build()
+        cache.set(key, value, HOME_CACHE_TIMEOUT)
+        cache.set(stale_key, value, HOME_STALE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+def _count_home_stats():
+    from .models import Course, Skill
+
+    return {
+        'skills_count': Skill.objects.count(),
+        'courses_count': Course.objects.count(),
+        'total_students': User.objects.filter(profile__role='student').count(),
+    }
+
+
+def _render_featured_courses():
+    from .models import Course
+
+    featured_courses = Course.objects.select_related('instructor__profile')[:FEATURED_COURSE_COUNT]
+    return render_to_string(
+        'skillnest_app/home_featured_courses.html', {'trending_courses': featured_courses}
+    )
+
+
+def get_home_stats():
+    """Dict of skills_count, courses_count and total_students"""
+    return _cached('stats', _count_home_stats)
+
+
+def get_featured_courses_html():
+    """Rendered featured-course cards (request independent, so shared by every visitor)"""
+    return mark_safe(_cached('featured', _render_featured_courses))
@@ -0,0 +1,201 @@
+"""
+Image Derivatives
+Resized WebP and JPEG copies of uploaded images (profile pictures, course
+covers, project images, badge icons) so list pages send thumbnails instead
+of the original uploads.
+
+Every source image gets the same ladder of widths (DERIVATIVE_WIDTHS, never
+upscaled; smaller images end at their own width) in both formats, stored
+under MEDIA_ROOT/derivatives/ and recorded with their dimensions in the
+ImageDerivative table. Generation runs on a small background thread pool:
+model signals queue it after an upload is committed (see models.py), and
+the {% responsive_image %} tag queues it for older images it finds without
+derivatives, rendering the original until they exist. Looked-up derivative
+sets are kept in the cache.
+"""
+
+import hashlib
+import io
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+
+DERIVATIVE_ROOT = 'derivatives'
+DERIVATIVE_WIDTHS = (96, 192, 384, 768, 1536)
+
+# (format, file extension, Pillow save options)
+DERIVATIVE_FORMATS = (
+    ('webp', 'webp', {'quality': 80, 'method': 4}),
+    ('jpeg', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+
+# EXIF orientations that swap width and height (rotated by 90 degrees)
+ORIENTATION_TAG = 0x0112
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+DERIVATIVES_CACHE_KEY = 'skillnest:image_derivatives:{digest}'
+DERIVATIVES_CACHE_TIMEOUT = 60 * 60 * 24
+# Sources that could not be processed are not retried for this long
+FAILED_CACHE_TIMEOUT = 60 * 60
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='skillnest-images')
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
+
+def _cache_key(source_name):
+    return DERIVATIVES_CACHE_KEY.format(digest=hashlib.sha1(source_name.encode()).hexdigest())
+
+
+def derivative_name(source_name, width, extension):
+    """
+    Storage name of one derivative. A short hash of the full source name
+    keeps me.png and me.jpg from sharing derivative files.
+    """
+    stem = posixpath.splitext(source_name)[0]
+    source_digest = hashlib.sha1(source_name.encode()).hexdigest()[:8]
+    return posixpath.join(DERIVATIVE_ROOT, f'{stem}-{source_digest}-{width}w.{extension}')
+
+
+def derivative_widths(image_width):
+    """Target widths of an image `image_width` pixels wide (never upscaled)"""
+    widths = [width for width in DERIVATIVE_WIDTHS if width < image_width]
+    if image_width <= DERIVATIVE_WIDTHS[-1]:
+        # Top the ladder off at full size rather than dropping the last step
+        widths.append(image_width)
+    return widths
+
+
+def generate_derivatives(source_name):
+    """
+    Create the missing derivatives of one stored image.
+
+    Returns:
+        Number of derivative files written
+    """
+    from PIL import Image, ImageOps
+    from .models import ImageDerivative
+
+    existing = set(
+        ImageDerivative.objects.filter(source=source_name).values_list('target_width', 'format')
+    )
+    with default_storage.open(source_name, 'rb') as source_file:
+        # Opening only reads the header; the pixels are decoded below if needed
+        image = Image.open(source_file)
+        source_width, source_height = image.size
+        if image.getexif().get(ORIENTATION_TAG) in TRANSPOSED_ORIENTATIONS:
+            source_width = source_height
+        widths = derivative_widths(source_width)
+        expected = {(width, format_name) for width in widths for format_name, _, _ in DERIVATIVE_FORMATS}
+        if expected <= existing:
+            return 0
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    created = []
+    for width in widths:
+        resized = None
+        for format_name, extension, options in DERIVATIVE_FORMATS:
+            if (width, format_name) in existing:
+                continue
+            if resized is None:
+                resized = image.copy()
+                resized.thumbnail((width, width * 10), Image.LANCZOS)
+            output = resized
+            if format_name == 'jpeg' and output.mode != 'RGB':
+                output = output.convert('RGB')
+            elif format_name == 'webp' and output.mode not in ('RGB', 'RGBA'):
+                output = output.convert('RGBA' if 'A' in output.getbands() else 'RGB')
+
+            buffer = io.BytesIO()
+            output.save(buffer, format=format_name.upper(), **options)
+            name = derivative_name(source_name, width, extension)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            created.append(ImageDerivative(
+                source=source_name,
+                target_width=width,
+                format=format_name,
+                name=name,
+                width=resized.width,
+                height=resized.height,
+            ))
+
+    ImageDerivative.objects.bulk_create(created, ignore_conflicts=True)
+    cache.delete(_cache_key(source_name))
+    return len(created)
+
+
+def _generate_in_background(source_name):
+    try:
+        generate_derivatives(source_name)
+    except Exception:
+        # Missing or unreadable source: remember it so pages stop re-queueing it
+        cache.set(_cache_key(source_name), {}, FAILED_CACHE_TIMEOUT)
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard(source_name)
+        close_old_connections()
+
+
+def schedule_derivatives(source_name):
+    """Queue derivative generation for an image, once per image at a time"""
+    if not source_name:
+        return
+    with _in_flight_lock:
+        if source_name in _in_flight:
+            return
+        _in_flight.add(source_name)
+    _executor.submit(_generate_in_background, source_name)
+
+
+def ensure_derivatives(source_name):
+    """Queue generation unless the image's derivatives are already cached"""
+    if source_name and cache.get(_cache_key(source_name)) is None:
+        schedule_derivatives(source_name)
+
+
+def get_derivatives(source_name):
+    """
+    Derivatives of a stored image, grouped by format.
+
+    Returns:
+        Dict: format -> list of (url, width, height) sorted by width; empty
+        while the derivatives are still being generated (which this queues)
+    """
+    key = _cache_key(source_name)
+    derivatives = cache.get(key)
+    if derivatives is not None:
+        return derivatives
+
+    from .models import ImageDerivative
+
+    derivatives = {}
+    for format_name, name, width, height in (
+        ImageDerivative.objects.filter(source=source_name)
+        .order_by('format', 'target_width')
+        .values_list('format', 'name', 'width', 'height')
+    ):
+        derivatives.setdefault(format_name, []).append((default_storage.url(name), width, height))
+
+    if len(derivatives) < len(DERIVATIVE_FORMATS):
+        schedule_derivatives(source_name)
+        return derivatives
+    cache.set(key, derivatives, DERIVATIVES_CACHE_TIMEOUT)
+    return derivatives
+
+
+def delete_derivatives(source_name):
+    """Remove the derivative files and rows of an image that was replaced or deleted"""
+    from .models import ImageDerivative
+
+    for name in ImageDerivative.objects.filter(source=source_name).values_list('name', flat=True):
+        default_storage.delete(name)
+    ImageDerivative.objects.filter(source=source_name).delete()
+    cache.delete(_cache_key(source_name))
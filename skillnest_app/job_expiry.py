@@ -0,0 +1,94 @@
+"""
+Job Expiry
+Deactivates postings whose last_date has passed, so every "active jobs"
+read path (the listing, recommendations, the skill index, the admin
+dashboard) only ever deals with live postings instead of an ever-growing
+tail of stale ones.
+
+The `expire_jobs` management command runs the sweep and is meant to be
+scheduled (e.g. hourly from cron). Each batch is flipped with a single
+UPDATE and its stored recommendations deleted in the same transaction;
+the in-memory skill index, skill weights and cached job searches are
+updated once the batch commits. Update signals are bypassed, so this does
+by hand what the Job signals in models.py do for a single deactivation.
+
+Read paths that cannot wait for the next sweep filter on
+job_search.live_jobs_q(), which the partial index job_live_idx
+(last_date, posted_date WHERE is_active) serves.
+"""
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .job_index import job_skill_index
+from .job_search import invalidate_job_search
+from .models import Job, JobRecommendation
+from .recommendations import RECOMMENDATION_LIMIT, refresh_for_user
+from .scoring import refresh_skill_weights, skill_weights_in_use
+from .stats import adjust_platform_stats
+
+# Postings deactivated per transaction
+EXPIRY_BATCH_SIZE = 500
+
+
+def expired_jobs(now=None):
+    """Active postings whose last date has passed"""
+    return Job.objects.filter(is_active=True, last_date__lt=now or timezone.now())
+
+
+def _expire_batch(job_ids):
+    """Deactivate one batch; returns (jobs deactivated, recommendations deleted, users to refill)"""
+    with transaction.atomic():
+        deactivated = Job.objects.filter(id__in=job_ids, is_active=True).update(is_active=False)
+        adjust_platform_stats(active_jobs=-deactivated)
+        skill_ids = list(
+            Job.skills_required.through.objects.filter(job_id__in=job_ids)
+            .values_list('skill_id', flat=True).distinct()
+        ) if skill_weights_in_use() else []
+        recommendations = JobRecommendation.objects.filter(job_id__in=job_ids)
+        # Students with a full list may have had jobs cut by the limit that now fit
+        full_users = list(
+            JobRecommendation.objects.filter(user_id__in=recommendations.values('user_id'))
+            .values('user_id')
+            .annotate(stored=Count('id'))
+            .filter(stored__gte=RECOMMENDATION_LIMIT)
+            .values_list('user_id', flat=True)
+        )
+        deleted, _ = recommendations.delete()
+
+        def sync_caches():
+            for job_id in job_ids:
+                job_skill_index.remove_job(job_id)
+            refresh_skill_weights(skill_ids)
+            invalidate_job_search()
+
+        transaction.on_commit(sync_caches)
+    return deactivated, deleted, full_users
+
+
+def expire_jobs(now=None, batch_size=EXPIRY_BATCH_SIZE):
+    """
+    Deactivate every posting past its last date and prune its recommendations.
+
+    Args:
+        now: Reference time (default: now)
+        batch_size: Postings deactivated per transaction
+
+    Returns:
+        Tuple of (jobs deactivated, recommendations deleted)
+    """
+    now = now or timezone.now()
+    deactivated = deleted = 0
+    refill = set()
+    while True:
+        job_ids = list(expired_jobs(now).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not job_ids:
+            break
+        batch_deactivated, batch_deleted, full_users = _expire_batch(job_ids)
+        deactivated += batch_deactivated
+        deleted += batch_deleted
+        refill.update(full_users)
+    for user_id in refill:
+        refresh_for_user(user_id)
+    return deactivated, deleted
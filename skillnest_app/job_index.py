@@ -0,0 +1,193 @@
+"""
+Skill -> Job Inverted Index
+Posting lists mapping each skill to the active jobs that require it, so the
+recommendation engine only looks at jobs sharing at least one skill with the
+student instead of scanning every active job.
+
+The index lives in process memory and is built lazily with a single query.
+Model signals (see models.py) apply incremental updates after each commit and
+bump the index version (see cache_versions.py); other processes notice the
+new version on their next request and rebuild their copy. Every copy is also
+rebuilt after INDEX_MAX_AGE seconds, which catches postings passing their
+last date and writes that bypass the signals.
+"""
+
+import threading
+import time
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .job_search import live_jobs_q
+from .skill_vectors import SkillVocabulary, score_user_against_jobs
+
+INDEX_VERSION = 'job_skill_index'
+INDEX_MAX_AGE = 60 * 15
+
+
+class JobSkillIndex:
+    """In-memory skill -> active job posting lists"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._loaded_at = None
+        self._version = None
+        self.skill_jobs = {}   # skill_id -> set of job ids
+        self.job_skills = {}   # job_id -> frozenset of skill ids
+        self.job_posted = {}   # job_id -> posted_date timestamp
+        self.job_vectors = {}  # job_id -> int bitset over self.vocabulary
+        self.vocabulary = SkillVocabulary()
+
+    # ---------- loading ----------
+    def _is_current(self, version):
+        return (
+            self._loaded and version == self._version
+            and time.monotonic() - self._loaded_at < INDEX_MAX_AGE
+        )
+
+    def _ensure_loaded(self):
+        version = get_cache_version(INDEX_VERSION)
+        if self._is_current(version):
+            return
+        with self._lock:
+            if not self._is_current(version):
+                self._rebuild(version)
+
+    def _rebuild(self, version):
+        from .models import Job
+
+        rows = Job.skills_required.through.objects.filter(
+            live_jobs_q(prefix='job__')
+        ).values_list('job_id', 'skill_id', 'job__posted_date')
+
+        skill_jobs = {}
+        job_skills = {}
+        job_posted = {}
+        for job_id, skill_id, posted_date in rows.iterator(chunk_size=5000):
+            skill_jobs.setdefault(skill_id, set()).add(job_id)
+            job_skills.setdefault(job_id, set()).add(skill_id)
+            job_posted[job_id] = posted_date.timestamp()
+
+        vocabulary = SkillVocabulary(skill_jobs)
+        self.skill_jobs = skill_jobs
+        self.job_skills = {job_id: frozenset(ids) for job_id, ids in job_skills.items()}
+        self.job_vectors = {job_id: vocabulary.encode(ids) for job_id, ids in job_skills.items()}
+        self.job_posted = job_posted
+        self.vocabulary = vocabulary
+        self._version = version
+        self._loaded_at = time.monotonic()
+        self._loaded = True
+
+    def _bump_version(self):
+        previous = self._version
+        version = bump_cache_version(INDEX_VERSION)
+        # Another process changed the index since we last synced; our
+        # incremental update alone is not enough, so rebuild next time.
+        if previous is None or version != previous + 1:
+            self._loaded = False
+        self._version = version
+
+    # ---------- lookups ----------
+    def candidates(self, skill_ids):
+        """Return ids of active jobs requiring at least one of `skill_ids`"""
+        self._ensure_loaded()
+        result = set()
+        for skill_id in skill_ids:
+            postings = self.skill_jobs.get(skill_id)
+            if postings:
+                result |= postings
+        return result
+
+    def skills_for(self, job_id):
+        """Return the required skill ids of an active job"""
+        self._ensure_loaded()
+        return self.job_skills.get(job_id, frozenset())
+
+    def posted(self, job_id):
+        """Return the posted_date timestamp of an active job"""
+        self._ensure_loaded()
+        return self.job_posted.get(job_id, 0.0)
+
+    def vector_for(self, job_id):
+        """Return the skill bitset of an active job (0 if not indexed)"""
+        self._ensure_loaded()
+        return self.job_vectors.get(job_id, 0)
+
+    def user_vector(self, skill_ids):
+        """Encode a student's skills against the index vocabulary"""
+        self._ensure_loaded()
+        return self.vocabulary.encode(skill_ids)
+
+    def score_jobs(self, skill_ids, job_ids, scoring=None):
+        """
+        Score one student against many jobs.
+
+        Args:
+            skill_ids: Skill ids the student holds, or a mapping of
+                       skill_id -> proficiency_level
+            scoring: Optional strategy from scoring.py; without one (or
+                     with the plain ratio) the skill bitsets are used
+
+        Returns:
+            Dict: job_id -> (match_score, matched_count, required_count);
+            jobs that are inactive or require no skills score (0.0, 0, 0).
+        """
+        self._ensure_loaded()
+        job_ids = list(job_ids)
+        if scoring is not None and scoring.uses_proficiency:
+            job_skills = self.job_skills
+            return {
+                job_id: scoring.score(skill_ids, job_skills.get(job_id, frozenset()))
+                for job_id in job_ids
+            }
+        user_bits = self.vocabulary.encode(skill_ids)
+        job_vectors = self.job_vectors
+        scores = score_user_against_jobs(user_bits, [job_vectors.get(job_id, 0) for job_id in job_ids])
+        return dict(zip(job_ids, scores))
+
+    # ---------- maintenance ----------
+    def _discard(self, job_id):
+        for skill_id in self.job_skills.pop(job_id, ()):
+            postings = self.skill_jobs.get(skill_id)
+            if postings is not None:
+                postings.discard(job_id)
+                if not postings:
+                    del self.skill_jobs[skill_id]
+        self.job_posted.pop(job_id, None)
+        self.job_vectors.pop(job_id, None)
+
+    def refresh_job(self, job_id):
+        """Reload one job's postings from the database"""
+        from .models import Job
+
+        with self._lock:
+            if self._loaded:
+                rows = list(
+                    Job.skills_required.through.objects.filter(
+                        live_jobs_q(prefix='job__'), job_id=job_id
+                    ).values_list('skill_id', 'job__posted_date')
+                )
+                self._discard(job_id)
+                if rows:
+                    skill_ids = frozenset(skill_id for skill_id, _ in rows)
+                    for skill_id in skill_ids:
+                        self.skill_jobs.setdefault(skill_id, set()).add(job_id)
+                    self.job_skills[job_id] = skill_ids
+                    self.job_vectors[job_id] = self.vocabulary.encode(skill_ids, extend=True)
+                    self.job_posted[job_id] = rows[0][1].timestamp()
+            self._bump_version()
+
+    def remove_job(self, job_id):
+        """Drop a job from every posting list"""
+        with self._lock:
+            if self._loaded:
+                self._discard(job_id)
+            self._bump_version()
+
+    def invalidate(self):
+        """Force a full rebuild on the next lookup in every process"""
+        with self._lock:
+            self._loaded = False
+            self._bump_version()
+
+
+job_skill_index = JobSkillIndex()
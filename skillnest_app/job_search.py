@@ -0,0 +1,301 @@
+"""
+Faceted Job Search
+Filters the active, unexpired job postings by job type, location, salary
+range and required skills, and counts how many postings each facet value
+would leave, so the listing can offer drill-down filters with live counts.
+
+Facet counts follow the usual disjunctive rule: each group is counted with
+every filter applied except its own, so picking "Contract" still shows how
+many full-time jobs there are. Each group is a single GROUP BY (or
+conditional COUNT) query over the indexed Job columns; the normalized
+location is stored on the job (Job.location_key) so it can be grouped
+without string functions.
+
+Results (the matching job ids, newest first, and the facet counts) are
+cached per normalized query. A version number in the cache (shared by
+every process, see CACHES in settings.py), bumped by the Job and Skill
+signals in models.py, retires every cached result at once; the short
+timeout covers postings passing their last date. A cached search runs no
+queries at all.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+SEARCH_VERSION_KEY = 'skillnest:job_search:version'
+SEARCH_CACHE_KEY = 'skillnest:job_search:{version}:{digest}'
+SEARCH_CACHE_TIMEOUT = 60 * 2
+
+# Values listed per facet group (selected ones are always listed)
+LOCATION_FACET_LIMIT = 15
+SKILL_FACET_LIMIT = 20
+
+# (lower bound, upper bound or None, label) in rupees per year
+SALARY_BUCKETS = (
+    (0, 300000, 'Up to ₹3L'),
+    (300000, 600000, '₹3L - ₹6L'),
+    (600000, 1000000, '₹6L - ₹10L'),
+    (1000000, None, '₹10L+'),
+)
+
+SKILL_MODES = ('all', 'any')
+
+_SPACES_RE = re.compile(r'\s+')
+
+
+def normalize_location(location):
+    """Grouping key of a location: its first part, case-folded ('Pune, MH ' -> 'pune')"""
+    first_part = (location or '').split(',')[0]
+    return _SPACES_RE.sub(' ', first_part).strip().casefold()
+
+
+def live_jobs_q(now=None, prefix=''):
+    """
+    Filter for postings that are active and not past their last date.
+
+    Args:
+        now: Reference time (default: now)
+        prefix: Lookup path to the Job, e.g. 'job__' from a through table
+    """
+    return Q(**{f'{prefix}is_active': True, f'{prefix}last_date__gte': now or timezone.now()})
+
+
+def _int_list(values):
+    result = set()
+    for value in values:
+        try:
+            result.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return tuple(sorted(result))
+
+
+def _parse_salary(value):
+    """'300000-600000' / '1000000-' -> (300000, 600000) / (1000000, None); None if malformed"""
+    low, sep, high = (value or '').partition('-')
+    if not sep:
+        return None
+    try:
+        low = int(low) if low else 0
+        high = int(high) if high else None
+    except ValueError:
+        return None
+    if low < 0 or (high is not None and high < low):
+        return None
+    return low, high
+
+
+def _salary_param(low, high):
+    return f"{low}-{'' if high is None else high}"
+
+
+@dataclass(frozen=True)
+class JobQuery:
+    """A normalized job search; equal searches share one cache entry"""
+    text: str = ''
+    job_types: tuple = ()
+    locations: tuple = ()
+    salary: tuple = None  # (low, high or None)
+    skills: tuple = ()
+    skill_mode: str = 'all'
+
+    @classmethod
+    def from_params(cls, params):
+        """Build a query from request.GET (unknown or malformed values are dropped)"""
+        from .models import Job
+
+        valid_types = {value for value, _ in Job._meta.get_field('job_type').choices}
+        skill_mode = params.get('skill_mode', 'all')
+        return cls(
+            text=_SPACES_RE.sub(' ', params.get('search', '')).strip(),
+            job_types=tuple(sorted({value for value in params.getlist('job_type') if value in valid_types})),
+            locations=tuple(sorted({normalize_location(value) for value in params.getlist('location')} - {''})),
+            salary=_parse_salary(params.get('salary')),
+            skills=_int_list(params.getlist('skill')),
+            skill_mode=skill_mode if skill_mode in SKILL_MODES else 'all',
+        )
+
+    @property
+    def cache_key(self):
+        digest = hashlib.sha1(repr(self).encode()).hexdigest()
+        return SEARCH_CACHE_KEY.format(version=_search_version(), digest=digest)
+
+    # ---------- filters ----------
+    def _base(self):
+        from .models import Job
+
+        jobs = Job.objects.filter(live_jobs_q())
+        if self.text:
+            jobs = jobs.filter(
+                Q(job_title__icontains=self.text)
+                | Q(company_name__icontains=self.text)
+                | Q(location__icontains=self.text)
+            )
+        return jobs
+
+    def _apply(self, jobs, skip=None):
+        """Apply every facet filter but `skip`"""
+        from .models import Job
+
+        if self.job_types and skip != 'job_type':
+            jobs = jobs.filter(job_type__in=self.job_types)
+        if self.locations and skip != 'location':
+            jobs = jobs.filter(location_key__in=self.locations)
+        if self.salary and skip != 'salary':
+            jobs = jobs.filter(_salary_overlap(*self.salary))
+        if self.skills and skip != 'skills':
+            postings = Job.skills_required.through.objects
+            if self.skill_mode == 'any':
+                jobs = jobs.filter(id__in=postings.filter(skill_id__in=self.skills).values('job_id'))
+            else:
+                for skill_id in self.skills:
+                    jobs = jobs.filter(id__in=postings.filter(skill_id=skill_id).values('job_id'))
+        return jobs
+
+    def jobs(self):
+        """Matching postings as a QuerySet"""
+        return self._apply(self._base())
+
+    # ---------- facets ----------
+    def _facet(self, value, label, count, selected):
+        return {'value': value, 'label': label, 'count': count, 'selected': selected}
+
+    def _job_type_facet(self, base):
+        from .models import Job
+
+        counts = dict(
+            self._apply(base, skip='job_type').order_by()
+            .values_list('job_type').annotate(count=Count('id'))
+        )
+        return [
+            self._facet(value, label, counts.get(value, 0), value in self.job_types)
+            for value, label in Job._meta.get_field('job_type').choices
+        ]
+
+    def _location_facet(self, base):
+        rows = list(
+            self._apply(base, skip='location').exclude(location_key='').order_by()
+            .values('location_key').annotate(count=Count('id'), label=Min('location'))
+            .order_by('-count', 'location_key')
+        )
+        listed = rows[:LOCATION_FACET_LIMIT]
+        listed += [row for row in rows[LOCATION_FACET_LIMIT:] if row['location_key'] in self.locations]
+        # Selected locations no posting matches any more still get a (zero) entry
+        selected_missing = set(self.locations) - {row['location_key'] for row in rows}
+        facets = [
+            self._facet(
+                row['location_key'], row['label'].split(',')[0].strip(), row['count'],
+                row['location_key'] in self.locations,
+            )
+            for row in listed
+        ]
+        facets += [self._facet(key, key.title(), 0, True) for key in sorted(selected_missing)]
+        return facets
+
+    def _salary_facet(self, base):
+        counts = self._apply(base, skip='salary').aggregate(**{
+            f'bucket_{index}': Count('id', filter=_salary_overlap(low, high))
+            for index, (low, high, _) in enumerate(SALARY_BUCKETS)
+        })
+        return [
+            self._facet(
+                _salary_param(low, high), label, counts[f'bucket_{index}'],
+                self.salary == (low, high),
+            )
+            for index, (low, high, label) in enumerate(SALARY_BUCKETS)
+        ]
+
+    def _skill_facet(self, base):
+        from .models import Job, Skill
+
+        rows = list(
+            Job.skills_required.through.objects
+            .filter(job_id__in=self._apply(base, skip='skills').values('id'))
+            .values('skill_id').annotate(count=Count('job_id'))
+            .order_by('-count', 'skill_id')
+        )
+        listed = rows[:SKILL_FACET_LIMIT]
+        listed += [row for row in rows[SKILL_FACET_LIMIT:] if row['skill_id'] in self.skills]
+        counts = {row['skill_id']: row['count'] for row in listed}
+        for skill_id in self.skills:
+            counts.setdefault(skill_id, 0)
+        names = dict(Skill.objects.filter(id__in=list(counts)).values_list('id', 'skill_name'))
+        return [
+            self._facet(skill_id, names[skill_id], count, skill_id in self.skills)
+            for skill_id, count in counts.items()
+            if skill_id in names
+        ]
+
+    def facets(self):
+        base = self._base()
+        return {
+            'job_type': self._job_type_facet(base),
+            'location': self._location_facet(base),
+            'salary': self._salary_facet(base),
+            'skills': self._skill_facet(base),
+        }
+
+
+def _salary_overlap(low, high):
+    """
+    Postings whose advertised range overlaps [low, high] (open-ended if high
+    is None). A missing bound leaves that side of the posting open; postings
+    with no salary at all never match.
+    """
+    condition = Q(salary_min__isnull=False) | Q(salary_max__isnull=False)
+    condition &= Q(salary_max__gte=low) | Q(salary_max__isnull=True)
+    if high is not None:
+        condition &= Q(salary_min__lte=high) | Q(salary_min__isnull=True)
+    return condition
+
+
+@dataclass
+class JobSearchResult:
+    job_ids: list = field(default_factory=list)  # newest first
+    facets: dict = field(default_factory=dict)
+
+    @property
+    def total(self):
+        return len(self.job_ids)
+
+
+def search_jobs(query):
+    """
+    Run a job search, from the cache when the same search ran recently.
+
+    Args:
+        query: JobQuery
+
+    Returns:
+        JobSearchResult
+    """
+    key = query.cache_key
+    result = cache.get(key)
+    if result is None:
+        result = JobSearchResult(
+            job_ids=list(query.jobs().order_by('-posted_date', '-id').values_list('id', flat=True)),
+            facets=query.facets(),
+        )
+        cache.set(key, result, SEARCH_CACHE_TIMEOUT)
+    return result
+
+
+def _search_version():
+    version = cache.get(SEARCH_VERSION_KEY)
+    if version is None:
+        cache.add(SEARCH_VERSION_KEY, 1, timeout=None)
+        version = cache.get(SEARCH_VERSION_KEY)
+    return version
+
+
+def invalidate_job_search():
+    """Retire every cached search result (postings or skills changed)"""
+    try:
+        cache.incr(SEARCH_VERSION_KEY)
+    except ValueError:
+        cache.add(SEARCH_VERSION_KEY, 1, timeout=None)
@@ -0,0 +1,90 @@
+"""
+Lesson Navigation Index
+The ordered lesson list of a course, shared by the lesson player, its
+sidebar and the course page: lesson numbers, previous/next lookups and
+completion flags without querying the lessons again.
+
+One entry per course is kept in the shared cache and dropped by the Lesson
+signals (see models.py) whenever a lesson is saved or deleted. A lookup for
+a lesson the entry does not list rebuilds it from the database, so a drop
+that went missing never turns into an error.
+"""
+
+from collections import namedtuple
+
+from django.core.cache import cache
+
+NAVIGATION_CACHE_KEY = 'skillnest:lesson_navigation:{course_id}'
+NAVIGATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Field names match Lesson so templates can use either
+LessonEntry = namedtuple('LessonEntry', ['id', 'title', 'duration_minutes', 'description', 'slot'])
+
+
+class LessonNavigation:
+    """Lessons of one course in display order, with a position map"""
+
+    def __init__(self, entries):
+        self.entries = tuple(entries)
+        self.positions = {entry.id: index for index, entry in enumerate(self.entries)}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __contains__(self, lesson_id):
+        return lesson_id in self.positions
+
+    def number(self, lesson_id):
+        """1-based position of a lesson in the course"""
+        return self.positions[lesson_id] + 1
+
+    def previous(self, lesson_id):
+        position = self.positions[lesson_id]
+        return self.entries[position - 1] if position > 0 else None
+
+    def next(self, lesson_id):
+        position = self.positions[lesson_id]
+        return self.entries[position + 1] if position + 1 < len(self.entries) else None
+
+    def completed_ids(self, enrollment):
+        """Ids of the lessons `enrollment` has completed, read from its bitmap"""
+        if enrollment is None:
+            return set()
+        bits = enrollment.completed_bits
+        return {entry.id for entry in self.entries if bits >> entry.slot & 1}
+
+
+def _build_entries(course_id):
+    from .models import Lesson
+
+    entries = [
+        LessonEntry(*row)
+        for row in Lesson.objects.filter(course_id=course_id)
+        .order_by('order', 'id')
+        .values_list('id', 'title', 'duration_minutes', 'description', 'slot')
+    ]
+    cache.set(NAVIGATION_CACHE_KEY.format(course_id=course_id), entries, NAVIGATION_CACHE_TIMEOUT)
+    return entries
+
+
+def get_lesson_navigation(course_id, lesson_id=None):
+    """
+    Return the LessonNavigation of a course, building it on a cache miss.
+
+    Args:
+        course_id: Course whose lessons to list
+        lesson_id: Lesson the caller is about to look up; a cached entry
+                   without it is out of date and is rebuilt once. Callers
+                   still check `lesson_id in navigation` (the lesson may be gone).
+    """
+    entries = cache.get(NAVIGATION_CACHE_KEY.format(course_id=course_id))
+    if entries is None or (lesson_id is not None and all(entry.id != lesson_id for entry in entries)):
+        entries = _build_entries(course_id)
+    return LessonNavigation(entries)
+
+
+def invalidate_lesson_navigation(course_id):
+    cache.delete(NAVIGATION_CACHE_KEY.format(course_id=course_id))
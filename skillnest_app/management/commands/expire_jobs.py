@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from skillnest_app.job_expiry import EXPIRY_BATCH_SIZE, expire_jobs, expired_jobs
+
+
+class Command(BaseCommand):
+    help = 'Deactivate job postings past their last date and prune their recommendations (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=EXPIRY_BATCH_SIZE,
+                            help='Postings deactivated per transaction')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many postings have expired')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f'{expired_jobs().count()} active posting(s) past their last date.')
+            return
+        deactivated, pruned = expire_jobs(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{deactivated} posting(s) deactivated, {pruned} recommendation(s) pruned.'
+        ))
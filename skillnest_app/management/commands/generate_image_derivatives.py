@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from skillnest_app.images import delete_derivatives, generate_derivatives
+from skillnest_app.models import DERIVATIVE_IMAGE_FIELDS, ImageDerivative
+
+
+class Command(BaseCommand):
+    help = 'Generate missing WebP/JPEG derivatives of uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune', action='store_true',
+                            help='Also delete derivatives of images no longer referenced by any model')
+
+    def referenced_images(self):
+        names = set()
+        for model, field_names in DERIVATIVE_IMAGE_FIELDS.items():
+            for field_name in field_names:
+                names.update(
+                    model.objects.exclude(**{f'{field_name}__isnull': True})
+                    .exclude(**{field_name: ''})
+                    .values_list(field_name, flat=True)
+                    .distinct()
+                )
+        return names
+
+    def handle(self, *args, **options):
+        names = self.referenced_images()
+        created = failed = 0
+        for name in sorted(names):
+            try:
+                created += generate_derivatives(name)
+            except Exception as exc:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'{name}: {exc}'))
+
+        pruned = 0
+        if options['prune']:
+            stale = set(ImageDerivative.objects.values_list('source', flat=True).distinct()) - names
+            for name in stale:
+                delete_derivatives(name)
+            pruned = len(stale)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(names)} images checked: {created} derivatives created, {failed} failed, '
+            f'{pruned} stale image(s) pruned.'
+        ))
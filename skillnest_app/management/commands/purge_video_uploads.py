@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from skillnest_app.uploads import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete chunked video uploads that were abandoned or never attached to a lesson'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=48,
+                            help='Remove uploads started more than this many hours ago')
+
+    def handle(self, *args, **options):
+        removed = purge_stale_uploads(timezone.now() - timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f'{removed} stale upload(s) removed.'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from skillnest_app.search import get_search_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents and index of every course'
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'{indexed} course(s) indexed ({get_search_backend().name} backend).'
+        ))
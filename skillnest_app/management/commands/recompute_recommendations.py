@@ -0,0 +1,114 @@
+import os
+from datetime import datetime, time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from skillnest_app.batch_scoring import refresh_all_recommendations
+from skillnest_app.models import JobRecommendation, RecommendationCheckpoint, StudentSkill, UserProfile
+from skillnest_app.recommendations import RECOMMENDATION_LIMIT
+
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise CommandError('--shard must look like i/n, e.g. 0/4')
+    if count < 1 or not 0 <= index < count:
+        raise CommandError('--shard i/n needs 0 <= i < n')
+    return index, count
+
+
+def parse_since(value):
+    since = parse_datetime(value)
+    if since is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError('--since must be an ISO date or datetime')
+        since = datetime.combine(day, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored job recommendations in sharded, resumable batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=RECOMMENDATION_LIMIT,
+                            help='Recommendations to keep per student')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Students scored per sparse matrix product')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Scoring processes (1 scores in this process)')
+        parser.add_argument('--shard', default='0/1',
+                            help='Process only students with user_id %% n == i, given as i/n')
+        parser.add_argument('--since',
+                            help='Only students whose skills changed since this ISO date/datetime')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore an unfinished checkpoint and start over')
+
+    def select_users(self, shard, since, after):
+        index, count = shard
+        if since is None:
+            # Students with skills, plus anyone still holding stale rows
+            user_ids = set(StudentSkill.objects.values_list('user_id', flat=True).distinct())
+            user_ids |= set(JobRecommendation.objects.values_list('user_id', flat=True).distinct())
+        else:
+            # New skills since `since`, plus students flagged stale by a skill removal
+            user_ids = set(
+                StudentSkill.objects.filter(acquired_date__gte=since).values_list('user_id', flat=True).distinct()
+            )
+            user_ids |= set(
+                UserProfile.objects.filter(
+                    Q(recommendations_version__isnull=True) | ~Q(recommendations_version=F('skills_version'))
+                ).values_list('user_id', flat=True)
+            )
+        return np.array(
+            sorted(user_id for user_id in user_ids if user_id % count == index and user_id > after),
+            dtype=np.int64,
+        )
+
+    def handle(self, *args, **options):
+        shard = parse_shard(options['shard'])
+        since = parse_since(options['since']) if options['since'] else None
+        run_key = f"shard={options['shard']} since={since.isoformat() if since else '-'} limit={options['limit']}"
+
+        checkpoint, created = RecommendationCheckpoint.objects.get_or_create(
+            run_key=run_key, defaults={'started_at': timezone.now()}
+        )
+        if not created and (options['restart'] or checkpoint.completed_at is not None):
+            checkpoint.last_user_id = 0
+            checkpoint.users_done = 0
+            checkpoint.started_at = timezone.now()
+            checkpoint.completed_at = None
+            checkpoint.save()
+        elif not created:
+            self.stdout.write(f'Resuming {run_key} after user {checkpoint.last_user_id}')
+
+        user_ids = self.select_users(shard, since, checkpoint.last_user_id)
+        self.stdout.write(f"Scoring {len(user_ids)} students with {options['workers']} worker(s)")
+
+        def save_checkpoint(chunk_users, counts):
+            # Chunks arrive in user_id order, so everything up to here is done
+            RecommendationCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                last_user_id=chunk_users[-1],
+                users_done=F('users_done') + len(chunk_users),
+            )
+
+        totals = refresh_all_recommendations(
+            limit=options['limit'],
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            user_ids=user_ids,
+            on_chunk=save_checkpoint,
+        )
+
+        RecommendationCheckpoint.objects.filter(pk=checkpoint.pk).update(completed_at=timezone.now())
+        self.stdout.write(self.style.SUCCESS(
+            f"Job recommendations: {totals['inserted']} inserted, "
+            f"{totals['updated']} updated, {totals['deleted']} deleted."
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from skillnest_app.stats import reconcile_platform_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount the admin dashboard statistics and correct any drift in the stored counters'
+
+    def handle(self, *args, **options):
+        drift = reconcile_platform_stats()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Platform stats were accurate.'))
+            return
+        for name, difference in sorted(drift.items()):
+            self.stdout.write(self.style.WARNING(f'{name}: off by {difference:+d}'))
+        self.stdout.write(self.style.SUCCESS(f'{len(drift)} counter(s) corrected.'))
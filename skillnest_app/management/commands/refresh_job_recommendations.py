@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from skillnest_app.models import Job
+from skillnest_app.recommendations import next_queued_job, process_queued_job, queue_job_refresh
+
+
+class Command(BaseCommand):
+    help = 'Worker that rescores the stored recommendations of queued job changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Process what is queued, then exit instead of polling')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds to wait between polls when nothing is queued')
+        parser.add_argument('--job', type=int,
+                            help='Queue this job before starting')
+
+    def handle(self, *args, **options):
+        if options['job'] is not None:
+            if not Job.objects.filter(pk=options['job']).exists():
+                raise CommandError(f"Job {options['job']} does not exist")
+            queue_job_refresh([options['job']])
+
+        processed = 0
+        while True:
+            queued = next_queued_job()
+            if queued is None:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            job_id, queued_at = queued
+            started = time.monotonic()
+            process_queued_job(job_id, queued_at)
+            self.stdout.write(f'Job {job_id} rescored in {time.monotonic() - started:.1f}s')
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'{processed} queued job(s) processed.'))
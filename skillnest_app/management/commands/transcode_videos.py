@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from skillnest_app.models import Lesson
+from skillnest_app.transcoding import claim_next_lesson, transcode_lesson
+
+
+class Command(BaseCommand):
+    help = 'Worker that transcodes uploaded lesson videos into HLS renditions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Process what is pending, then exit instead of polling')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds to wait between polls when nothing is pending')
+        parser.add_argument('--lesson', type=int,
+                            help='Queue this lesson again (e.g. after a failure) before starting')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help="Queue every 'failed' lesson again before starting")
+        parser.add_argument('--requeue-processing', action='store_true',
+                            help="Queue lessons left 'processing' by a worker that died; "
+                                 'only safe while no other worker is running')
+
+    def handle(self, *args, **options):
+        if options['lesson'] is not None:
+            lesson = Lesson.objects.filter(pk=options['lesson']).first()
+            if lesson is None or not lesson.video_file:
+                raise CommandError(f"Lesson {options['lesson']} does not exist or has no uploaded video")
+            Lesson.objects.filter(pk=lesson.pk).update(video_status='pending', video_error='')
+        if options['retry_failed']:
+            Lesson.objects.filter(video_status='failed').update(video_status='pending', video_error='')
+        if options['requeue_processing']:
+            Lesson.objects.filter(video_status='processing').update(video_status='pending')
+
+        processed = 0
+        while True:
+            lesson_id = claim_next_lesson()
+            if lesson_id is None:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            self.stdout.write(f'Transcoding lesson {lesson_id}...')
+            started = time.monotonic()
+            if transcode_lesson(lesson_id):
+                self.stdout.write(self.style.SUCCESS(
+                    f'Lesson {lesson_id} ready in {time.monotonic() - started:.1f}s'
+                ))
+            else:
+                error = Lesson.objects.filter(pk=lesson_id).values_list('video_error', flat=True).first()
+                self.stdout.write(self.style.WARNING(f'Lesson {lesson_id} not transcoded: {error or "superseded or deleted"}'))
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'{processed} lesson video(s) processed.'))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0010_contactmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='recommendations_version',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='skills_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
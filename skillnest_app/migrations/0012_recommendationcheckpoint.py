@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0011_userprofile_skills_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_key', models.CharField(max_length=200, unique=True)),
+                ('last_user_id', models.BigIntegerField(default=0)),
+                ('users_done', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0012_recommendationcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentskill',
+            index=models.Index(fields=['skill', 'user'], name='studentskill_skill_user_idx'),
+        ),
+    ]
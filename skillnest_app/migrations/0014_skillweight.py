@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def count_skill_frequencies(apps, schema_editor):
+    Skill = apps.get_model('skillnest_app', 'Skill')
+    Job = apps.get_model('skillnest_app', 'Job')
+    StudentSkill = apps.get_model('skillnest_app', 'StudentSkill')
+    SkillWeight = apps.get_model('skillnest_app', 'SkillWeight')
+
+    job_counts = dict(
+        Job.skills_required.through.objects.filter(job__is_active=True)
+        .values('skill_id').annotate(count=Count('id')).values_list('skill_id', 'count')
+    )
+    student_counts = dict(
+        StudentSkill.objects.values('skill_id').annotate(count=Count('id')).values_list('skill_id', 'count')
+    )
+    SkillWeight.objects.bulk_create(
+        [
+            SkillWeight(
+                skill_id=skill_id,
+                job_count=job_counts.get(skill_id, 0),
+                student_count=student_counts.get(skill_id, 0),
+            )
+            for skill_id in Skill.objects.values_list('id', flat=True)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0013_studentskill_skill_user_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillWeight',
+            fields=[
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='weight', serialize=False, to='skillnest_app.skill')),
+                ('job_count', models.PositiveIntegerField(default=0)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(count_skill_frequencies, migrations.RunPython.noop),
+    ]
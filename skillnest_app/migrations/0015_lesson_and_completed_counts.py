@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    Course = apps.get_model('skillnest_app', 'Course')
+    Lesson = apps.get_model('skillnest_app', 'Lesson')
+    Enrollment = apps.get_model('skillnest_app', 'Enrollment')
+    Completion = Enrollment.completed_lessons.through
+
+    Course.objects.update(lesson_count=Coalesce(Subquery(
+        Lesson.objects.filter(course_id=OuterRef('pk'))
+        .values('course_id').annotate(count=Count('id')).values('count')
+    ), Value(0)))
+    Enrollment.objects.update(completed_count=Coalesce(Subquery(
+        Completion.objects.filter(enrollment_id=OuterRef('pk'))
+        .values('enrollment_id').annotate(count=Count('id')).values('count')
+    ), Value(0)))
+    for course_id, lesson_count in Course.objects.values_list('id', 'lesson_count').iterator():
+        progress = models.F('completed_count') * 100 / lesson_count if lesson_count else Value(100)
+        Enrollment.objects.filter(course_id=course_id).update(progress_percent=progress)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0014_skillweight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations, models
+
+
+def assign_slots_and_bitmaps(apps, schema_editor):
+    Lesson = apps.get_model('skillnest_app', 'Lesson')
+    Enrollment = apps.get_model('skillnest_app', 'Enrollment')
+    Completion = Enrollment.completed_lessons.through
+
+    # Slots follow the current course order
+    lessons = []
+    slots = {}
+    next_slot = {}
+    for lesson in Lesson.objects.order_by('course_id', 'order', 'id').only('id', 'course_id'):
+        lesson.slot = next_slot.get(lesson.course_id, 0)
+        next_slot[lesson.course_id] = lesson.slot + 1
+        slots[lesson.id] = lesson.slot
+        lessons.append(lesson)
+    Lesson.objects.bulk_update(lessons, ['slot'], batch_size=1000)
+
+    bitmaps = {}
+    for enrollment_id, lesson_id in Completion.objects.values_list('enrollment_id', 'lesson_id').iterator():
+        bitmaps[enrollment_id] = bitmaps.get(enrollment_id, 0) | 1 << slots[lesson_id]
+    enrollments = [
+        Enrollment(id=enrollment_id, completed_bitmap=bits.to_bytes((bits.bit_length() + 7) // 8, 'little'))
+        for enrollment_id, bits in bitmaps.items()
+    ]
+    Enrollment.objects.bulk_update(enrollments, ['completed_bitmap'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0015_lesson_and_completed_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='slot',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_bitmap',
+            field=models.BinaryField(default=b'', editable=False),
+        ),
+        migrations.RunPython(assign_slots_and_bitmaps, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='lesson',
+            name='slot',
+            field=models.PositiveIntegerField(editable=False),
+        ),
+        migrations.AddConstraint(
+            model_name='lesson',
+            constraint=models.UniqueConstraint(fields=('course', 'slot'), name='lesson_course_slot_unique'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:50
+
+from django.db import migrations, models
+
+
+def queue_existing_uploads(apps, schema_editor):
+    # Lessons uploaded before the pipeline existed get transcoded by the worker
+    Lesson = apps.get_model('skillnest_app', 'Lesson')
+    Lesson.objects.exclude(video_file__isnull=True).exclude(video_file='').update(video_status='pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0016_lesson_slot_enrollment_completed_bitmap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='hls_playlist',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_duration_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_poster',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_renditions',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_status',
+            field=models.CharField(choices=[('none', 'No Upload'), ('pending', 'Waiting to Process'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Processing Failed')], default='none', max_length=20),
+        ),
+        migrations.RunPython(queue_existing_uploads, migrations.RunPython.noop),
+    ]
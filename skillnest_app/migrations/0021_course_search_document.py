@@ -0,0 +1,112 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+DOCUMENT_TABLE = 'skillnest_app_coursesearchdocument'
+FTS_TABLE = 'skillnest_course_fts'
+COLUMNS = 'title, description, skills, lessons'
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        {COLUMNS},
+        content='{DOCUMENT_TABLE}', content_rowid='course_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS})
+        VALUES (new.course_id, new.title, new.description, new.skills, new.lessons);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS})
+        VALUES ('delete', old.course_id, old.title, old.description, old.skills, old.lessons);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS})
+        VALUES ('delete', old.course_id, old.title, old.description, old.skills, old.lessons);
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS})
+        VALUES (new.course_id, new.title, new.description, new.skills, new.lessons);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_FORWARD = [
+    f"""CREATE INDEX coursesearch_vector_gin ON {DOCUMENT_TABLE} USING GIN ((
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(skills, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(lessons, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'D')
+    ))""",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS coursesearch_vector_gin",
+]
+
+
+def index_existing_courses(apps, schema_editor):
+    Course = apps.get_model('skillnest_app', 'Course')
+    CourseSearchDocument = apps.get_model('skillnest_app', 'CourseSearchDocument')
+    documents = [
+        CourseSearchDocument(
+            course=course,
+            title=course.title,
+            description=course.description,
+            skills=' '.join(sorted(skill.skill_name for skill in course.skills.all())),
+            lessons='\n'.join(lesson.title for lesson in sorted(course.lessons.all(), key=lambda l: (l.order, l.id))),
+        )
+        for course in Course.objects.prefetch_related('skills', 'lessons')
+    ]
+    CourseSearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # search.py falls back to substring matching
+                return
+        statements = SQLITE_FORWARD
+    elif vendor == 'postgresql':
+        statements = POSTGRES_FORWARD
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0020_course_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSearchDocument',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='skillnest_app.course')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, default='')),
+                ('skills', models.TextField(blank=True, default='')),
+                ('lessons', models.TextField(blank=True, default='')),
+            ],
+        ),
+        migrations.RunPython(index_existing_courses, migrations.RunPython.noop),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
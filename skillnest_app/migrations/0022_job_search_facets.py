@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:08
+
+import re
+
+from django.db import migrations, models
+
+
+def fill_location_keys(apps, schema_editor):
+    # Same normalization as job_search.normalize_location at the time of writing
+    Job = apps.get_model('skillnest_app', 'Job')
+    jobs = list(Job.objects.only('id', 'location'))
+    for job in jobs:
+        job.location_key = re.sub(r'\s+', ' ', (job.location or '').split(',')[0]).strip().casefold()
+    Job.objects.bulk_update(jobs, ['location_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0021_course_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='location_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_location_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'job_type', 'last_date'], name='job_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'location_key', 'last_date'], name='job_active_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'salary_min', 'salary_max'], name='job_active_salary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', '-posted_date', '-id'], name='job_active_posted_idx'),
+        ),
+    ]
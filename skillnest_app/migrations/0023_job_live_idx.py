@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0022_job_search_facets'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['last_date', 'posted_date'], name='job_live_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:13
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def take_first_snapshot(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    UserProfile = apps.get_model('skillnest_app', 'UserProfile')
+    Course = apps.get_model('skillnest_app', 'Course')
+    Certificate = apps.get_model('skillnest_app', 'Certificate')
+    Job = apps.get_model('skillnest_app', 'Job')
+    Enrollment = apps.get_model('skillnest_app', 'Enrollment')
+    ContactMessage = apps.get_model('skillnest_app', 'ContactMessage')
+    PlatformStats = apps.get_model('skillnest_app', 'PlatformStats')
+    PlatformStats.objects.create(
+        pk=1,
+        total_users=User.objects.count(),
+        total_students=UserProfile.objects.filter(role='student').count(),
+        total_teachers=UserProfile.objects.filter(role='teacher').count(),
+        total_courses=Course.objects.count(),
+        total_certificates=Certificate.objects.count(),
+        total_jobs=Job.objects.count(),
+        active_jobs=Job.objects.filter(is_active=True).count(),
+        total_enrollments=Enrollment.objects.count(),
+        active_enrollments=Enrollment.objects.filter(status='in_progress').count(),
+        pending_contacts=ContactMessage.objects.filter(is_resolved=False).count(),
+        reconciled_at=timezone.now(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0023_job_live_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_users', models.IntegerField(default=0)),
+                ('total_students', models.IntegerField(default=0)),
+                ('total_teachers', models.IntegerField(default=0)),
+                ('total_courses', models.IntegerField(default=0)),
+                ('total_certificates', models.IntegerField(default=0)),
+                ('total_jobs', models.IntegerField(default=0)),
+                ('active_jobs', models.IntegerField(default=0)),
+                ('total_enrollments', models.IntegerField(default=0)),
+                ('active_enrollments', models.IntegerField(default=0)),
+                ('pending_contacts', models.IntegerField(default=0)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(take_first_snapshot, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0025_cache_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedJobRefresh',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='queued_refresh', serialize=False, to='skillnest_app.job')),
+                ('queued_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:44
+
+from django.db import migrations, models
+
+
+def start_after_last_slot(apps, schema_editor):
+    Course = apps.get_model('skillnest_app', 'Course')
+    Lesson = apps.get_model('skillnest_app', 'Lesson')
+    last_slots = (
+        Lesson.objects.values('course_id').annotate(last=models.Max('slot')).values_list('course_id', 'last')
+    )
+    for course_id, last_slot in last_slots:
+        Course.objects.filter(pk=course_id).update(next_lesson_slot=last_slot + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0026_queued_job_refresh'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='next_lesson_slot',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(start_after_last_slot, migrations.RunPython.noop),
+    ]
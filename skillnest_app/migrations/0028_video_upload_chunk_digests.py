@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skillnest_app', '0027_course_next_lesson_slot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoupload',
+            name='chunk_digests',
+            field=models.BinaryField(default=b''),
+        ),
+    ]
@@ -1,8 +1,22 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.signals import request_started
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver
 
+from .cache_versions import forget_cache_versions
+from .job_index import job_skill_index
+from .job_search import normalize_location, invalidate_job_search
+from .lesson_navigation import invalidate_lesson_navigation
+from .transcoding import delete_lesson_renditions
+from .images import ensure_derivatives
+from .stats import adjust_platform_stats
+from .home_cache import invalidate_home
+from .search import index_course
+from .skill_vectors import to_bytes, from_bytes
+
 # ==================== USER PROFILE ====================
 class UserProfile(models.Model):
     """Extended user profile with role information"""
@@ -25,11 +39,27 @@ class UserProfile(models.Model):
     linkedin_url = models.URLField(blank=True, null=True)
     website_url = models.URLField(blank=True, null=True)
     
+    # Bumped on every StudentSkill change; stored job recommendations are
+    # fresh while recommendations_version matches it
+    skills_version = models.PositiveIntegerField(default=0)
+    recommendations_version = models.PositiveIntegerField(blank=True, null=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.username} ({self.get_role_display()})"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_role = self.role
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored role so post_save can move the role counters
+        instance._loaded_role = instance.__dict__.get('role')
+        return instance
 
 
 # Create UserProfile when User is created
@@ -54,6 +84,17 @@ class Skill(models.Model):
         return self.skill_name
 
 
+class SkillWeight(models.Model):
+    """Cached frequencies of a skill, used for inverse-frequency match scoring (see scoring.py)"""
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, primary_key=True, related_name='weight')
+    job_count = models.PositiveIntegerField(default=0)  # active jobs requiring it
+    student_count = models.PositiveIntegerField(default=0)  # students holding it
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.skill.skill_name} ({self.job_count} jobs, {self.student_count} students)"
+
+
 # ==================== COURSE ====================
 class Course(models.Model):
     """Courses offered on SkillNest"""
@@ -81,15 +122,31 @@ class Course(models.Model):
     cover_image = models.ImageField(upload_to='course_covers/', blank=True, null=True)
     skills = models.ManyToManyField(Skill, related_name='courses')
     duration_hours = models.IntegerField(default=10)
+    lesson_count = models.PositiveIntegerField(default=0)  # kept current by Lesson signals
+    # Slot the next new lesson gets; only Lesson.save moves it
+    next_lesson_slot = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the course list (see pagination.py)
+            models.Index(fields=['-created_at', '-id'], name='course_created_id_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        # A course loaded before a lesson was added must not rewind the slot counter
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'next_lesson_slot'
+            ]
+        super().save(*args, **kwargs)
+    
     def get_enrolled_count(self):
         return self.enrollments.filter(status='in_progress').count()
 
@@ -97,6 +154,18 @@ class Course(models.Model):
 # ==================== COURSE LESSON ====================
 class Lesson(models.Model):
     """Individual lessons within a course"""
+    VIDEO_STATUS_CHOICES = [
+        ('none', 'No Upload'),
+        ('pending', 'Waiting to Process'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Processing Failed'),
+    ]
+    VIDEO_RENDITION_FIELDS = (
+        'video_status', 'video_error', 'hls_playlist', 'video_poster',
+        'video_renditions', 'video_duration_seconds',
+    )
+    
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='lessons')
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
@@ -105,13 +174,120 @@ class Lesson(models.Model):
     video_file = models.FileField(upload_to='lesson_videos/', blank=True, null=True)
     content = models.TextField(blank=True, null=True)
     duration_minutes = models.IntegerField(default=10)
+    # HLS renditions of video_file, written by `manage.py transcode_videos`
+    video_status = models.CharField(max_length=20, choices=VIDEO_STATUS_CHOICES, default='none')
+    video_error = models.TextField(blank=True, default='')
+    hls_playlist = models.CharField(max_length=255, blank=True, default='')
+    video_poster = models.CharField(max_length=255, blank=True, default='')
+    video_renditions = models.JSONField(default=list, blank=True)
+    video_duration_seconds = models.FloatField(null=True, blank=True)
+    # Bit position in Enrollment.completed_bitmap; assigned once, never reused
+    slot = models.PositiveIntegerField(editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['order']
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'slot'], name='lesson_course_slot_unique'),
+        ]
     
     def __str__(self):
         return f"{self.course.title} - {self.title}"
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if (update_fields is None or 'video_file' in update_fields) and self._reset_video_renditions():
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.VIDEO_RENDITION_FIELDS)
+        if self.slot is None:
+            try:
+                with transaction.atomic():
+                    # The increment locks the course row until the lesson is saved,
+                    # so concurrent adds take turns and a deleted lesson's slot stays retired
+                    Course.objects.filter(pk=self.course_id).update(next_lesson_slot=models.F('next_lesson_slot') + 1)
+                    self.slot = Course.objects.filter(pk=self.course_id).values_list('next_lesson_slot', flat=True).get() - 1
+                    super().save(*args, **kwargs)
+            except Exception:
+                # The counter was rolled back with the insert; take a new slot next time
+                self.slot = None
+                raise
+        else:
+            super().save(*args, **kwargs)
+        self._loaded_video_file = self.video_file.name
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored upload so save() can tell when it is replaced
+        if 'video_file' in field_names:
+            instance._loaded_video_file = instance.__dict__.get('video_file')
+        return instance
+    
+    def _reset_video_renditions(self):
+        """
+        Queue a new or replaced upload for transcoding (the worker picks up
+        'pending') and drop the renditions of the previous one.
+        
+        Returns:
+            bool: True if the rendition fields were changed
+        """
+        loaded = None if self._state.adding else getattr(self, '_loaded_video_file', self.video_file.name)
+        if self.video_file and (not self.video_file._committed or self.video_file.name != loaded):
+            self.video_status = 'pending'
+        elif not self.video_file and self.video_status != 'none':
+            self.video_status = 'none'
+        else:
+            return False
+        self.video_error = ''
+        self.hls_playlist = ''
+        self.video_poster = ''
+        self.video_renditions = []
+        self.video_duration_seconds = None
+        return True
+
+
+# ==================== VIDEO UPLOADS ====================
+class VideoUpload(models.Model):
+    """A chunked, resumable lesson video upload in progress (see uploads.py)"""
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+    
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='video_uploads')
+    filename = models.CharField(max_length=255)
+    # Destination file in default storage, created at full size on start
+    storage_name = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    # Bit n is set once chunk n has been written and verified
+    received_chunks = models.BinaryField(default=b'')
+    # SHA-256 of chunk n at bytes 32n to 32n + 32, as verified when it was written
+    chunk_digests = models.BinaryField(default=b'')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.owner.username} - {self.filename} ({self.status})"
+    
+    @property
+    def chunk_count(self):
+        return max(1, -(-self.size // self.chunk_size))
+    
+    @property
+    def received_bits(self):
+        return from_bytes(self.received_chunks)
+    
+    @property
+    def received_count(self):
+        return bin(self.received_bits).count('1')
+    
+    def missing_chunks(self):
+        """Indexes of the chunks still to be sent, in order"""
+        bits = self.received_bits
+        return [index for index in range(self.chunk_count) if not bits >> index & 1]
 
 
 # ==================== ENROLLMENT ====================
@@ -129,6 +305,9 @@ class Enrollment(models.Model):
     progress_percent = models.IntegerField(default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
     completed_lessons = models.ManyToManyField(Lesson, blank=True, related_name='completed_by')
+    completed_count = models.PositiveIntegerField(default=0)  # size of completed_lessons
+    # Bit n is set when the lesson with slot n is complete (mirrors completed_lessons)
+    completed_bitmap = models.BinaryField(default=b'', editable=False)
     completed_date = models.DateTimeField(blank=True, null=True)
     
     class Meta:
@@ -138,15 +317,195 @@ class Enrollment(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.course.title}"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so post_save can move the active counter
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
+    @property
+    def remaining_count(self):
+        return max(self.course.lesson_count - self.completed_count, 0)
+    
+    # ---------- completed lesson bitmap ----------
+    @property
+    def completed_bits(self):
+        return from_bytes(self.completed_bitmap)
+    
+    def has_completed(self, lesson):
+        """True when `lesson` is complete; no query needed"""
+        return bool(self.completed_bits >> lesson.slot & 1)
+    
+    def completed_bitmap_count(self):
+        """Number of completed lessons according to the bitmap"""
+        return self.completed_bits.bit_count()
+    
+    def next_incomplete_lesson(self, lessons):
+        """First lesson in `lessons` (in course order) not completed yet, or None"""
+        bits = self.completed_bits
+        return next((lesson for lesson in lessons if not bits >> lesson.slot & 1), None)
+    
+    def mark_completed_in_bitmap(self, lesson):
+        """Set `lesson`'s bit in memory; the caller saves completed_bitmap"""
+        self.completed_bitmap = to_bytes(self.completed_bits | 1 << lesson.slot)
+    
     def update_progress(self):
-        """Update progress percentage based on completed lessons"""
+        """
+        Recount completed lessons, bitmap and progress from scratch.
+        
+        Lesson completion keeps the counters current incrementally (see
+        services.complete_lesson); this is only needed to repair them.
+        """
         total_lessons = self.course.lessons.count()
-        if total_lessons == 0:
-            self.progress_percent = 100
-        else:
-            completed = self.completed_lessons.count()
-            self.progress_percent = (completed / total_lessons) * 100
-        self.save()
+        bits = 0
+        for slot in self.completed_lessons.values_list('slot', flat=True):
+            bits |= 1 << slot
+        self.completed_bitmap = to_bytes(bits)
+        self.completed_count = bits.bit_count()
+        self.progress_percent = progress_percent(self.completed_count, total_lessons)
+        self.save(update_fields=['completed_bitmap', 'completed_count', 'progress_percent'])
+
+
+def progress_percent(completed_count, lesson_count):
+    """Whole-number course progress; a course without lessons counts as done"""
+    if not lesson_count:
+        return 100
+    return completed_count * 100 // lesson_count
+
+
+def recompute_course_progress(course_id):
+    """
+    Resync a course's lesson_count and recompute progress for all of its
+    enrollments in a single UPDATE.
+    """
+    lesson_count = Lesson.objects.filter(course_id=course_id).count()
+    Course.objects.filter(pk=course_id).update(lesson_count=lesson_count)
+    if lesson_count:
+        progress = models.F('completed_count') * 100 / lesson_count
+    else:
+        progress = models.Value(100)
+    Enrollment.objects.filter(course_id=course_id).update(progress_percent=progress)
+
+
+# Keep Course.lesson_count, Enrollment.completed_count and progress current
+@receiver(post_save, sender=Lesson)
+def update_progress_on_lesson_added(sender, instance, created, **kwargs):
+    if created:
+        recompute_course_progress(instance.course_id)
+
+
+@receiver(pre_delete, sender=Lesson)
+def update_completed_count_on_lesson_delete(sender, instance, **kwargs):
+    # The completion rows go with the lesson; count them out first
+    mask = ~(1 << instance.slot)
+    enrollments = list(Enrollment.objects.filter(completed_lessons=instance).only('id', 'completed_bitmap'))
+    for enrollment in enrollments:
+        enrollment.completed_bitmap = to_bytes(enrollment.completed_bits & mask)
+    Enrollment.objects.bulk_update(enrollments, ['completed_bitmap'], batch_size=500)
+    Enrollment.objects.filter(completed_lessons=instance).update(
+        completed_count=models.F('completed_count') - 1
+    )
+
+
+@receiver(post_delete, sender=Lesson)
+def update_progress_on_lesson_removed(sender, instance, **kwargs):
+    recompute_course_progress(instance.course_id)
+
+
+# Drop the cached lesson navigation of the lesson's course
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def invalidate_navigation_on_lesson_change(sender, instance, **kwargs):
+    course_id = instance.course_id
+    transaction.on_commit(lambda: invalidate_lesson_navigation(course_id))
+
+
+@receiver(post_delete, sender=Lesson)
+def delete_renditions_on_lesson_delete(sender, instance, **kwargs):
+    lesson_id = instance.pk
+    transaction.on_commit(lambda: delete_lesson_renditions(lesson_id))
+
+
+@receiver(m2m_changed, sender=Enrollment.completed_lessons.through)
+def update_completed_count_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # Edits through the M2M API (e.g. the admin); complete_lesson updates the counter itself
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        enrollments = [instance]
+    elif action == 'post_clear':
+        # lesson.completed_by.clear() does not report which enrollments changed
+        enrollments = Enrollment.objects.filter(course_id=instance.course_id)
+    else:
+        enrollments = Enrollment.objects.filter(pk__in=pk_set)
+    for enrollment in enrollments:
+        enrollment.update_progress()
+
+
+# ==================== COURSE SEARCH ====================
+class CourseSearchDocument(models.Model):
+    """Searchable text of a course, indexed by the database's full-text engine (see search.py)"""
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, default='')
+    skills = models.TextField(blank=True, default='')  # skill names
+    lessons = models.TextField(blank=True, default='')  # lesson titles, one per line
+    
+    def __str__(self):
+        return self.title
+
+
+def _reindex_courses_on_commit(course_ids):
+    course_ids = set(course_ids)
+    transaction.on_commit(lambda: [index_course(course_id) for course_id in course_ids])
+
+
+# Keep the search documents in step with courses, their skills and lessons
+@receiver(post_save, sender=Course)
+def sync_search_on_course_save(sender, instance, **kwargs):
+    _reindex_courses_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=Course.skills.through)
+def sync_search_on_course_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        _reindex_courses_on_commit([instance.pk])
+    elif pk_set:
+        _reindex_courses_on_commit(pk_set)
+    else:
+        # skill.courses.clear() does not report which courses changed
+        _reindex_courses_on_commit(getattr(instance, '_search_course_ids', []))
+
+
+@receiver(m2m_changed, sender=Course.skills.through)
+def remember_courses_before_skill_clear(sender, instance, action, reverse, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._search_course_ids = list(instance.courses.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def sync_search_on_lesson_change(sender, instance, **kwargs):
+    _reindex_courses_on_commit([instance.course_id])
+
+
+@receiver(post_save, sender=Skill)
+def sync_search_on_skill_rename(sender, instance, created, **kwargs):
+    if not created:
+        _reindex_courses_on_commit(instance.courses.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Skill)
+def sync_search_on_skill_delete(sender, instance, **kwargs):
+    # Cascaded through-table deletes do not send m2m_changed
+    _reindex_courses_on_commit(instance.courses.values_list('pk', flat=True))
 
 
 # ==================== STUDENT SKILL ====================
@@ -165,11 +524,44 @@ class StudentSkill(models.Model):
     
     class Meta:
         unique_together = ('user', 'skill')
+        indexes = [
+            # skill -> students posting lists for ranking job candidates
+            models.Index(fields=['skill', 'user'], name='studentskill_skill_user_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.skill.skill_name}"
 
 
+def bump_skills_version(user_id):
+    """Mark a student's stored job recommendations as stale"""
+    UserProfile.objects.filter(user_id=user_id).update(skills_version=models.F('skills_version') + 1)
+
+
+# Rescore only the jobs affected by a student's skill change
+@receiver(post_save, sender=StudentSkill)
+def refresh_recommendations_on_skill_added(sender, instance, created, **kwargs):
+    from .scoring import get_match_scoring
+    user_id, skill_id = instance.user_id, instance.skill_id
+    if created:
+        from .recommendations import refresh_for_student_skill
+        bump_skills_version(user_id)
+        transaction.on_commit(lambda: refresh_for_student_skill(user_id, skill_id))
+    elif get_match_scoring().uses_proficiency:
+        # A proficiency change moves weighted scores either way; rebuild the list
+        from .recommendations import refresh_for_user
+        bump_skills_version(user_id)
+        transaction.on_commit(lambda: refresh_for_user(user_id))
+
+
+@receiver(post_delete, sender=StudentSkill)
+def refresh_recommendations_on_skill_removed(sender, instance, **kwargs):
+    from .recommendations import refresh_for_user
+    bump_skills_version(instance.user_id)
+    user_id = instance.user_id
+    transaction.on_commit(lambda: refresh_for_user(user_id))
+
+
 # ==================== CERTIFICATE ====================
 class Certificate(models.Model):
     """Certificate awarded upon course completion"""
@@ -192,6 +584,8 @@ class Job(models.Model):
     job_title = models.CharField(max_length=200)
     company_name = models.CharField(max_length=200)
     location = models.CharField(max_length=200)
+    # normalize_location(location), kept by save() for the location facet
+    location_key = models.CharField(max_length=200, blank=True, default='', editable=False)
     description = models.TextField()
     salary_min = models.IntegerField(blank=True, null=True)
     salary_max = models.IntegerField(blank=True, null=True)
@@ -205,9 +599,144 @@ class Job(models.Model):
     
     class Meta:
         ordering = ['-posted_date']
+        indexes = [
+            # Facet filters and counts of the job search (see job_search.py)
+            models.Index(fields=['is_active', 'job_type', 'last_date'], name='job_active_type_idx'),
+            models.Index(fields=['is_active', 'location_key', 'last_date'], name='job_active_location_idx'),
+            models.Index(fields=['is_active', 'salary_min', 'salary_max'], name='job_active_salary_idx'),
+            models.Index(fields=['is_active', '-posted_date', '-id'], name='job_active_posted_idx'),
+            # Live postings only: what every "active jobs" read path asks for (see job_expiry.py)
+            models.Index(
+                fields=['last_date', 'posted_date'], condition=models.Q(is_active=True), name='job_live_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.job_title} at {self.company_name}"
+    
+    def save(self, *args, **kwargs):
+        self.location_key = normalize_location(self.location)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'location' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'location_key'}
+        super().save(*args, **kwargs)
+        # post_save receivers have seen the change; later saves compare against it
+        self._loaded_is_active = self.is_active
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so post_save can detect activation changes
+        instance._loaded_is_active = instance.__dict__.get('is_active')
+        return instance
+
+
+# Keep the skill -> job index in sync with Job changes
+@receiver(post_save, sender=Job)
+def sync_job_index_on_save(sender, instance, created, **kwargs):
+    # New jobs have no skills until m2m_changed fires
+    if not created:
+        transaction.on_commit(lambda: job_skill_index.refresh_job(instance.pk))
+
+
+@receiver(post_delete, sender=Job)
+def sync_job_index_on_delete(sender, instance, **kwargs):
+    job_id = instance.pk
+    transaction.on_commit(lambda: job_skill_index.remove_job(job_id))
+
+
+@receiver(m2m_changed, sender=Job.skills_required.through)
+def sync_job_index_on_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        transaction.on_commit(lambda: job_skill_index.refresh_job(instance.pk))
+    elif pk_set:
+        job_ids = list(pk_set)
+        transaction.on_commit(lambda: [job_skill_index.refresh_job(job_id) for job_id in job_ids])
+    else:
+        # skill.jobs_requiring.clear() does not report which jobs changed
+        transaction.on_commit(job_skill_index.invalidate)
+
+
+@receiver(post_delete, sender=Skill)
+def sync_job_index_on_skill_delete(sender, instance, **kwargs):
+    # Cascaded through-table deletes do not send m2m_changed
+    transaction.on_commit(job_skill_index.invalidate)
+
+
+# Cached job search results and facet counts go stale with any posting or skill change
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_job_search_on_change(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_job_search)
+
+
+@receiver(m2m_changed, sender=Job.skills_required.through)
+def invalidate_job_search_on_skills_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(invalidate_job_search)
+
+
+# Queue the affected students' rescoring for the `refresh_job_recommendations`
+# worker; a job can be held by every student, too many to rescore in the request
+@receiver(post_save, sender=Job)
+def refresh_recommendations_on_job_save(sender, instance, created, **kwargs):
+    loaded_is_active = getattr(instance, '_loaded_is_active', None)
+    if created or loaded_is_active is None or loaded_is_active == instance.is_active:
+        return
+    from .recommendations import queue_job_refresh
+    queue_job_refresh([instance.pk])
+    # (De)activation also changes how many active jobs require each skill
+    _refresh_skill_weights_on_commit(instance.skills_required.values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Job.skills_required.through)
+def refresh_recommendations_on_job_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    from .recommendations import queue_job_refresh
+    queue_job_refresh([instance.pk] if not reverse else pk_set or ())
+
+
+# Keep the SkillWeight frequencies of affected skills current while they are read
+def _refresh_skill_weights_on_commit(skill_ids):
+    from .scoring import refresh_skill_weights, skill_weights_in_use
+    if not skill_weights_in_use():
+        return
+    skill_ids = list(skill_ids)
+    if skill_ids:
+        transaction.on_commit(lambda: refresh_skill_weights(skill_ids))
+
+
+@receiver(post_save, sender=StudentSkill)
+def refresh_skill_weight_on_skill_added(sender, instance, created, **kwargs):
+    if created:
+        _refresh_skill_weights_on_commit([instance.skill_id])
+
+
+@receiver(post_delete, sender=StudentSkill)
+def refresh_skill_weight_on_skill_removed(sender, instance, **kwargs):
+    _refresh_skill_weights_on_commit([instance.skill_id])
+
+
+@receiver(pre_delete, sender=Job)
+def refresh_skill_weights_on_job_delete(sender, instance, **kwargs):
+    # The through rows are gone by post_delete, so collect the skills now
+    _refresh_skill_weights_on_commit(instance.skills_required.values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Job.skills_required.through)
+def refresh_skill_weights_on_job_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            _refresh_skill_weights_on_commit([instance.pk])
+    elif action == 'pre_clear':
+        _refresh_skill_weights_on_commit(instance.skills_required.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        _refresh_skill_weights_on_commit(pk_set or ())
 
 
 # ==================== JOB RECOMMENDATION ====================
@@ -228,6 +757,31 @@ class JobRecommendation(models.Model):
         return f"{self.user.username} - {self.job.job_title} ({self.match_score:.0%})"
 
 
+# ==================== RECOMMENDATION CHECKPOINT ====================
+class RecommendationCheckpoint(models.Model):
+    """Progress of a `recompute_recommendations` run, so it can resume after a crash"""
+    run_key = models.CharField(max_length=200, unique=True)
+    last_user_id = models.BigIntegerField(default=0)
+    users_done = models.IntegerField(default=0)
+    started_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    
+    def __str__(self):
+        return f"{self.run_key} (last user {self.last_user_id})"
+
+
+# ==================== JOB REFRESH QUEUE ====================
+class QueuedJobRefresh(models.Model):
+    """A job whose stored recommendations wait for the `refresh_job_recommendations` worker"""
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='queued_refresh')
+    # Moved forward when the job changes again before the worker gets to it
+    queued_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.job} (queued {self.queued_at})"
+
+
 # ==================== CAREER PATH ====================
 class CareerPath(models.Model):
     """Predefined career paths with required skills"""
@@ -415,9 +969,189 @@ class ContactMessage(models.Model):
     def __str__(self):
         return f"{self.name} - {self.subject or 'No Subject'}"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_is_resolved = self.is_resolved
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so post_save can move the pending counter
+        instance._loaded_is_resolved = instance.__dict__.get('is_resolved')
+        return instance
+    
     def mark_resolved(self):
         """Mark this message as resolved"""
         from django.utils import timezone
         self.is_resolved = True
         self.resolved_at = timezone.now()
         self.save()
+
+
+# ==================== PLATFORM STATS ====================
+class PlatformStats(models.Model):
+    """Materialized platform-wide counters for the admin dashboard; a single row (see stats.py)"""
+    total_users = models.IntegerField(default=0)
+    total_students = models.IntegerField(default=0)
+    total_teachers = models.IntegerField(default=0)
+    total_courses = models.IntegerField(default=0)
+    total_certificates = models.IntegerField(default=0)
+    total_jobs = models.IntegerField(default=0)
+    active_jobs = models.IntegerField(default=0)
+    total_enrollments = models.IntegerField(default=0)
+    active_enrollments = models.IntegerField(default=0)
+    pending_contacts = models.IntegerField(default=0)
+    reconciled_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name_plural = 'platform stats'
+    
+    def __str__(self):
+        return f"Platform stats (reconciled {self.reconciled_at})"
+
+
+# Counters a tracked field value contributes to, per model
+ROLE_COUNTERS = {'student': 'total_students', 'teacher': 'total_teachers'}
+STATS_TRACKED_FIELDS = {
+    UserProfile: ('role', lambda role: [ROLE_COUNTERS[role]] if role in ROLE_COUNTERS else []),
+    Job: ('is_active', lambda is_active: ['active_jobs'] if is_active else []),
+    Enrollment: ('status', lambda status: ['active_enrollments'] if status == 'in_progress' else []),
+    ContactMessage: ('is_resolved', lambda is_resolved: [] if is_resolved else ['pending_contacts']),
+}
+# Row counters, per model
+STATS_TOTALS = {
+    User: 'total_users',
+    Course: 'total_courses',
+    Certificate: 'total_certificates',
+    Job: 'total_jobs',
+    Enrollment: 'total_enrollments',
+}
+
+
+# Move the counters in the same transaction as the change (F() increments)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Certificate)
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=ContactMessage)
+def count_platform_stats_on_save(sender, instance, created, **kwargs):
+    tracked = STATS_TRACKED_FIELDS.get(sender)
+    deltas = {}
+    if created:
+        if sender in STATS_TOTALS:
+            deltas[STATS_TOTALS[sender]] = 1
+        if tracked:
+            field_name, counters_of = tracked
+            for name in counters_of(getattr(instance, field_name)):
+                deltas[name] = 1
+    elif tracked:
+        field_name, counters_of = tracked
+        loaded_attr = f'_loaded_{field_name}'
+        if not hasattr(instance, loaded_attr):
+            return
+        previous, current = getattr(instance, loaded_attr), getattr(instance, field_name)
+        if previous == current:
+            return
+        for name in counters_of(previous):
+            deltas[name] = deltas.get(name, 0) - 1
+        for name in counters_of(current):
+            deltas[name] = deltas.get(name, 0) + 1
+    adjust_platform_stats(**deltas)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Certificate)
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=ContactMessage)
+def count_platform_stats_on_delete(sender, instance, **kwargs):
+    tracked = STATS_TRACKED_FIELDS.get(sender)
+    deltas = {}
+    if sender in STATS_TOTALS:
+        deltas[STATS_TOTALS[sender]] = -1
+    if tracked:
+        field_name, counters_of = tracked
+        for name in counters_of(getattr(instance, field_name)):
+            deltas[name] = -1
+    adjust_platform_stats(**deltas)
+
+
+# Home page counters and course cards are cached per data version (see home_cache.py)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_home_on_change(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_home)
+
+
+# ==================== IMAGE DERIVATIVES ====================
+class ImageDerivative(models.Model):
+    """A resized WebP/JPEG copy of an uploaded image (see images.py)"""
+    FORMAT_CHOICES = [
+        ('webp', 'WebP'),
+        ('jpeg', 'JPEG'),
+    ]
+    
+    # Storage name of the original, e.g. 'profile_pics/me.png'
+    source = models.CharField(max_length=255)
+    # Width step this derivative was made for; width/height are the real size
+    target_width = models.PositiveIntegerField()
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    name = models.CharField(max_length=255)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'target_width', 'format'], name='imagederivative_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.source} @ {self.width}x{self.height} {self.format}"
+
+
+# Image fields that get derivatives, per model
+DERIVATIVE_IMAGE_FIELDS = {
+    UserProfile: ('profile_picture',),
+    Course: ('cover_image',),
+    PortfolioProject: ('image',),
+    AchievementBadge: ('icon',),
+}
+
+
+# Generate thumbnails of new uploads off the request, once they are committed
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=PortfolioProject)
+@receiver(post_save, sender=AchievementBadge)
+def queue_image_derivatives(sender, instance, **kwargs):
+    for field_name in DERIVATIVE_IMAGE_FIELDS[sender]:
+        name = getattr(instance, field_name).name
+        if name:
+            transaction.on_commit(lambda name=name: ensure_derivatives(name))
+
+
+# ==================== CACHE VERSIONS ====================
+class CacheVersion(models.Model):
+    """Version of the data behind a per-process index or cached result, shared by every process (see cache_versions.py)"""
+    name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+# Each request checks the versions once, then works from the memo
+@receiver(request_started)
+def forget_cache_versions_on_request(sender, **kwargs):
+    forget_cache_versions()
@@ -0,0 +1,113 @@
+"""
+Keyset Pagination
+Pages through a queryset by remembering the sort key of the last row shown
+instead of an OFFSET, so every page is one indexed range scan of
+per_page + 1 rows, however deep the reader goes, and rows added meanwhile
+do not shift the pages.
+
+Cursors are opaque URL-safe strings holding the key values of the edge row;
+`after` moves forward, `before` moves back.
+"""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of rows plus the cursors of its neighbours"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def encode_cursor(values):
+    raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, fields):
+    """Key values of a cursor, or None if it is malformed"""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(fields):
+            return None
+        return [model._meta.get_field(field).to_python(value) for field, value in zip(fields, raw)]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def _beyond(fields, values, lookup):
+    """Rows strictly past `values` in lexicographic (fields) order"""
+    condition = Q()
+    for index, field in enumerate(fields):
+        step = Q(**{f'{field}__{lookup}': values[index]})
+        for previous_field, previous_value in zip(fields[:index], values[:index]):
+            step &= Q(**{previous_field: previous_value})
+        condition |= step
+    return condition
+
+
+def keyset_paginate(queryset, fields, per_page, after=None, before=None):
+    """
+    Return one page of `queryset` ordered by `fields`, newest first.
+
+    Args:
+        queryset: QuerySet to page through (filters already applied)
+        fields: Key fields, most significant first, ending in a unique one
+                (e.g. ('created_at', 'id')); all sorted descending
+        per_page: Rows per page
+        after: Cursor of the last row of the previous page
+        before: Cursor of the first row of the next page (going back)
+
+    Returns:
+        KeysetPage
+    """
+    fields = tuple(fields)
+    descending = [f'-{field}' for field in fields]
+    ascending = list(fields)
+
+    before_values = decode_cursor(before, queryset.model, fields) if before else None
+    after_values = decode_cursor(after, queryset.model, fields) if after and before_values is None else None
+
+    if before_values is not None:
+        rows = list(
+            queryset.filter(_beyond(fields, before_values, 'gt')).order_by(*ascending)[:per_page + 1]
+        )
+        more_before = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        more_after = True
+    else:
+        if after_values is not None:
+            queryset = queryset.filter(_beyond(fields, after_values, 'lt'))
+        rows = list(queryset.order_by(*descending)[:per_page + 1])
+        more_after = len(rows) > per_page
+        rows = rows[:per_page]
+        more_before = after_values is not None
+
+    def cursor_of(row):
+        return encode_cursor([getattr(row, field) for field in fields])
+
+    return KeysetPage(
+        rows,
+        next_cursor=cursor_of(rows[-1]) if rows and more_after else None,
+        previous_cursor=cursor_of(rows[0]) if rows and more_before else None,
+    )
@@ -4,8 +4,31 @@ Simple rule-based algorithm to match student skills with job requirements.
 This is the "AI-powered" recommendation logic.
 """
 
-from .models import Job, StudentSkill, JobRecommendation, Skill
-from django.db.models import Count, Prefetch
+import heapq
+
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from .models import Job, StudentSkill, JobRecommendation, QueuedJobRefresh, Skill, UserProfile
+from .job_index import job_skill_index
+from .scoring import get_match_scoring, PROFICIENCY_WEIGHTS
+from django.db import transaction
+from django.db.models import Count, F, Q, Window, Case, When, Value, Sum, FloatField
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+# Stored recommendations per student, and the score a job must exceed to be kept
+RECOMMENDATION_LIMIT = 50
+MIN_MATCH_SCORE = 0.0
+
+# Rows (or users, when replacing whole lists) per bulk write transaction
+PERSIST_CHUNK_SIZE = 500
+
+# Ranked students per page of a job's candidate list
+CANDIDATES_PER_PAGE = 25
+
+# Jobs per page of the public job listing
+JOBS_PER_PAGE = 20
+JOB_SORTS = ('newest', 'match')
 
 
 def calculate_match_score(user_skill_ids, job_skill_ids):
@@ -21,8 +44,8 @@ def calculate_match_score(user_skill_ids, job_skill_ids):
     Returns:
         Tuple: (match_score: float, matched_count: int, required_count: int)
     """
-    user_skills_set = set(user_skill_ids)
-    job_skills_set = set(job_skill_ids)
+    user_skills_set = user_skill_ids if isinstance(user_skill_ids, (set, frozenset)) else set(user_skill_ids)
+    job_skills_set = job_skill_ids if isinstance(job_skill_ids, (set, frozenset)) else set(job_skill_ids)
     
     if not job_skills_set:
         return 0.0, 0, 0
@@ -35,67 +58,111 @@ def calculate_match_score(user_skill_ids, job_skill_ids):
     return match_score, matched_skills, total_required
 
 
+def load_user_skills(user_id):
+    """Return a student's skills as a skill_id -> proficiency_level dict"""
+    return dict(StudentSkill.objects.filter(user_id=user_id).values_list('skill_id', 'proficiency_level'))
+
+
 def get_job_recommendations(user, user_skill_ids, limit=10):
     """
     Get recommended jobs for a user based on their skills.
     
     Algorithm:
-    1. Get all active jobs
-    2. For each job, calculate match score
-    3. Filter jobs with match score > 0 (at least one skill matches)
-    4. Sort by match score descending
-    5. Return top recommendations with detailed info
+    1. Collect candidate jobs from the skill -> job index (only active jobs
+       sharing at least one skill with the user)
+    2. Keep the best `limit` candidates in a bounded heap, ranked by match
+       score, then by posted date (newer first); matched counts come from
+       the indexed skill bitsets (AND + popcount) and the score from the
+       configured scoring strategy (see scoring.py)
+    3. Load Job rows and missing skills for the winners only
     
     Args:
         user: User object
-        user_skill_ids: List of skill IDs the user has
+        user_skill_ids: List of skill IDs the user has, or a skill_id ->
+                        proficiency_level dict (see load_user_skills) so
+                        weighted scoring can use proficiency
         limit: Maximum number of recommendations to return
     
     Returns:
         List of job objects with match_score, matched_skills_count, etc.
     """
+    user_skills = user_skill_ids if isinstance(user_skill_ids, dict) else dict.fromkeys(user_skill_ids)
+    user_skills_set = set(user_skills)
+    scored = _top_k_jobs(user_skills, limit, get_match_scoring())
     
-    # Get all active jobs
-    active_jobs = Job.objects.filter(is_active=True).prefetch_related('skills_required')
+    # Two queries for the whole page instead of one per job
+    jobs_by_id = Job.objects.in_bulk([row[2] for row in scored])
+    missing_ids = set()
+    for _, _, job_id, _, _ in scored:
+        missing_ids |= job_skill_index.skills_for(job_id) - user_skills_set
+    skills_by_id = Skill.objects.in_bulk(missing_ids) if missing_ids else {}
     
     recommendations = []
+    for match_score, _, job_id, matched_count, required_count in scored:
+        job = jobs_by_id.get(job_id)
+        if job is None:
+            continue
+        missing_skills = [
+            skills_by_id[skill_id]
+            for skill_id in job_skill_index.skills_for(job_id) - user_skills_set
+            if skill_id in skills_by_id
+        ]
+        missing_skills.sort(key=lambda skill: skill.skill_name)
+        recommendations.append({
+            'job': job,
+            'match_score': match_score,
+            'match_percent': int(match_score * 100),
+            'matched_skills_count': matched_count,
+            'total_required_skills': required_count,
+            'missing_skills_count': required_count - matched_count,
+            'missing_skills': missing_skills,
+        })
     
-    for job in active_jobs:
-        job_skill_ids = list(job.skills_required.values_list('id', flat=True))
-        
-        match_score, matched_count, required_count = calculate_match_score(
-            user_skill_ids, job_skill_ids
-        )
-        
-        # Only include jobs with at least one matching skill (>0% match)
-        if match_score > 0:
-            # Create a recommendation object with detailed info
-            rec_data = {
-                'job': job,
-                'match_score': match_score,
-                'match_percent': int(match_score * 100),
-                'matched_skills_count': matched_count,
-                'total_required_skills': required_count,
-                'missing_skills_count': required_count - matched_count,
-            }
-            
-            # Get the missing skills for display
-            user_skills_set = set(user_skill_ids)
-            job_skills_set = set(job_skill_ids)
-            missing_skill_ids = job_skills_set - user_skills_set
-            
-            if missing_skill_ids:
-                rec_data['missing_skills'] = Skill.objects.filter(id__in=missing_skill_ids)
-            else:
-                rec_data['missing_skills'] = []
-            
-            recommendations.append(rec_data)
-    
-    # Sort by match score (descending), then by posted date (newer first)
-    recommendations.sort(key=lambda x: (-x['match_score'], -x['job'].posted_date.timestamp()))
-    
-    # Return top recommendations
-    return recommendations[:limit]
+    return recommendations
+
+
+def _top_k_jobs(user_skills, limit, scoring):
+    """
+    Select the `limit` best candidate jobs with a bounded min-heap.
+    
+    Under ratio scoring a job requiring r skills can score at most
+    min(n, r) / r for a user with n indexed skills, so candidates are
+    visited by ascending r (the bound only falls as r grows) and the scan
+    stops once that bound drops below the current k-th score. Weighted
+    scoring has no such bound and scores every candidate.
+    
+    Returns:
+        List of (match_score, posted, job_id, matched_count, required_count),
+        best first
+    """
+    if limit <= 0:
+        return []
+    user_bits = job_skill_index.user_vector(user_skills)
+    user_count = user_bits.bit_count()
+    
+    by_required = {}
+    for job_id in job_skill_index.candidates(user_skills):
+        job_bits = job_skill_index.vector_for(job_id)
+        by_required.setdefault(job_bits.bit_count(), []).append((job_id, job_bits))
+    
+    heap = []
+    for required_count in sorted(by_required):
+        bound = scoring.upper_bound(user_count, required_count)
+        if len(heap) == limit and bound < heap[0][0]:
+            break
+        for job_id, job_bits in by_required[required_count]:
+            match_score, matched_count, _ = scoring.score(
+                user_skills, job_skill_index.skills_for(job_id), (user_bits & job_bits).bit_count()
+            )
+            if match_score <= MIN_MATCH_SCORE:
+                continue
+            entry = (match_score, job_skill_index.posted(job_id), job_id, matched_count, required_count)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+    
+    return sorted(heap, reverse=True)
 
 
 def generate_recommendations_for_user(user):
@@ -106,30 +173,441 @@ def generate_recommendations_for_user(user):
     Args:
         user: User object
     """
-    # Get user's current skills
-    user_skill_ids = list(StudentSkill.objects.filter(user=user).values_list('skill_id', flat=True))
+    skills_version = _skills_version(user.pk)
     
-    if not user_skill_ids:
-        return []
+    # Get user's current skills
+    user_skills = load_user_skills(user.pk)
     
     # Get recommendations
-    recs = get_job_recommendations(user, user_skill_ids, limit=50)
+    recs = get_job_recommendations(user, user_skills, limit=RECOMMENDATION_LIMIT) if user_skills else []
+    
+    # Store in database for quick retrieval, replacing the user's old list
+    persist_recommendations(
+        [
+            (user.pk, rec['job'].pk, rec['match_score'], rec['matched_skills_count'], rec['total_required_skills'])
+            for rec in recs
+        ],
+        replace_users=[user.pk],
+    )
+    _stamp_recommendations(user.pk, skills_version)
     
-    # Store in database for quick retrieval
-    stored_recs = []
-    for rec in recs:
-        job_rec, created = JobRecommendation.objects.update_or_create(
+    return [
+        JobRecommendation(
             user=user,
             job=rec['job'],
-            defaults={
-                'match_score': rec['match_score'],
-                'matched_skills_count': rec['matched_skills_count'],
-                'total_required_skills': rec['total_required_skills'],
-            }
+            match_score=rec['match_score'],
+            matched_skills_count=rec['matched_skills_count'],
+            total_required_skills=rec['total_required_skills'],
         )
-        stored_recs.append(job_rec)
+        for rec in recs
+    ]
+
+
+def _skills_version(user_id):
+    return UserProfile.objects.filter(user_id=user_id).values_list('skills_version', flat=True).first()
+
+
+def _stamp_recommendations(user_id, skills_version):
+    """Record which skill set the stored recommendations were computed from"""
+    UserProfile.objects.filter(user_id=user_id).update(recommendations_version=skills_version)
+
+
+def recommendations_are_fresh(profile):
+    """True when stored JobRecommendation rows reflect the user's current skills"""
+    return profile.recommendations_version == profile.skills_version
+
+
+# ==================== BULK PERSISTENCE ====================
+def persist_recommendations(rows, replace_users=(), chunk_size=PERSIST_CHUNK_SIZE):
+    """
+    Bulk upsert JobRecommendation rows.
+    
+    Each chunk runs in one transaction: a SELECT of the affected stored
+    rows, an INSERT ... ON CONFLICT (user, job) DO UPDATE, and a DELETE of
+    stale rows. Works on SQLite (3.24+) and PostgreSQL.
+    
+    Args:
+        rows: Iterable of (user_id, job_id, match_score, matched_count,
+              required_count). Rows at or below MIN_MATCH_SCORE are deleted
+              instead of stored.
+        replace_users: User ids whose stored lists are replaced outright;
+                       their rows missing from `rows` are pruned.
+        chunk_size: Users (or rows, when nothing is replaced) per chunk
+    
+    Returns:
+        Dict with inserted, updated and deleted row counts
+    """
+    replace_users = set(replace_users)
+    by_user = {user_id: [] for user_id in replace_users}
+    loose = []
+    for row in rows:
+        if row[0] in replace_users:
+            by_user[row[0]].append(row)
+        else:
+            loose.append(row)
+    
+    chunks = []
+    user_ids = sorted(by_user)
+    for start in range(0, len(user_ids), chunk_size):
+        chunk_users = user_ids[start:start + chunk_size]
+        chunks.append((chunk_users, [row for user_id in chunk_users for row in by_user[user_id]]))
+    for start in range(0, len(loose), chunk_size):
+        chunks.append(([], loose[start:start + chunk_size]))
+    
+    totals = {'inserted': 0, 'updated': 0, 'deleted': 0}
+    for chunk_users, chunk_rows in chunks:
+        counts = _persist_chunk(chunk_users, chunk_rows)
+        for key in totals:
+            totals[key] += counts[key]
+    return totals
+
+
+def _persist_chunk(replace_users, rows):
+    keep = {}
+    drop = set()
+    for user_id, job_id, match_score, matched_count, required_count in rows:
+        if match_score > MIN_MATCH_SCORE:
+            keep[(user_id, job_id)] = (match_score, matched_count, required_count)
+        else:
+            drop.add((user_id, job_id))
+    
+    with transaction.atomic():
+        # Existing rows: everything stored for replaced users, plus the
+        # specific pairs being written or dropped
+        pairs = set(keep) | drop
+        lookup = Q(user_id__in=replace_users) if replace_users else Q(pk__in=[])
+        if pairs:
+            lookup |= Q(user_id__in={user_id for user_id, _ in pairs}, job_id__in={job_id for _, job_id in pairs})
+        existing = {
+            (user_id, job_id): pk
+            for pk, user_id, job_id in JobRecommendation.objects.filter(lookup).values_list('id', 'user_id', 'job_id')
+        }
+        
+        stale = [
+            pk for (user_id, job_id), pk in existing.items()
+            if (user_id, job_id) in drop or (user_id in replace_users and (user_id, job_id) not in keep)
+        ]
+        deleted = JobRecommendation.objects.filter(id__in=stale).delete()[0] if stale else 0
+        
+        if keep:
+            JobRecommendation.objects.bulk_create(
+                [
+                    JobRecommendation(
+                        user_id=user_id,
+                        job_id=job_id,
+                        match_score=match_score,
+                        matched_skills_count=matched_count,
+                        total_required_skills=required_count,
+                    )
+                    for (user_id, job_id), (match_score, matched_count, required_count) in keep.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['user', 'job'],
+                update_fields=['match_score', 'matched_skills_count', 'total_required_skills'],
+            )
+    
+    updated = sum(1 for pair in keep if pair in existing)
+    return {'inserted': len(keep) - updated, 'updated': updated, 'deleted': deleted}
+
+
+# ==================== INCREMENTAL REFRESH ====================
+# Stored recommendations are kept current by model signals (see models.py):
+# a change only rescores the (user, job) pairs it can affect. A student's
+# skill change is rescored right after it commits; a job change can reach
+# every student holding one of its skills, so it is queued (QueuedJobRefresh)
+# for the `refresh_job_recommendations` worker. A full recomputation
+# (`manage.py recompute_recommendations`) is only needed after bulk data
+# loads that bypass signals.
+
+def _chunks(items, size=PERSIST_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _trim_to_limit(user_ids, limit=RECOMMENDATION_LIMIT):
+    """Delete stored recommendations ranked below `limit` for each user"""
+    for chunk in _chunks(user_ids):
+        ranked = JobRecommendation.objects.filter(user_id__in=chunk).annotate(
+            rank=Window(
+                expression=RowNumber(),
+                partition_by=F('user_id'),
+                order_by=[F('match_score').desc(), F('job__posted_date').desc()],
+            )
+        ).filter(rank__gt=limit)
+        overflow = list(ranked.values_list('id', flat=True))
+        if overflow:
+            JobRecommendation.objects.filter(id__in=overflow).delete()
+
+
+def refresh_for_student_skill(user_id, skill_id):
+    """
+    A student gained a skill: rescore only the jobs that require it.
+    """
+    refresh_for_student_skills(user_id, [skill_id])
+
+
+def refresh_for_student_skills(user_id, skill_ids):
+    """
+    A student gained several skills at once (e.g. completing a course):
+    rescore only the jobs requiring at least one of them.
+    """
+    skills_version = _skills_version(user_id)
+    job_ids = job_skill_index.candidates(skill_ids)
+    if job_ids:
+        scores = job_skill_index.score_jobs(load_user_skills(user_id), job_ids, scoring=get_match_scoring())
+        persist_recommendations(
+            (user_id, job_id, match_score, matched_count, required_count)
+            for job_id, (match_score, matched_count, required_count) in scores.items()
+        )
+        _trim_to_limit([user_id])
+    _stamp_recommendations(user_id, skills_version)
+
+
+def refresh_for_user(user_id):
+    """
+    A student lost a skill: jobs that were cut by the limit may now rank,
+    so rebuild this user's list (index-backed, no job scan).
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    generate_recommendations_for_user(user)
+
+
+def queue_job_refresh(job_ids):
+    """
+    Queue jobs for the `refresh_job_recommendations` worker.
+    
+    Runs in the caller's transaction, so a rolled-back change queues
+    nothing; queueing a job that is already waiting moves its timestamp.
+    """
+    now = timezone.now()
+    QueuedJobRefresh.objects.bulk_create(
+        [QueuedJobRefresh(job_id=job_id, queued_at=now) for job_id in set(job_ids)],
+        update_conflicts=True,
+        unique_fields=['job'],
+        update_fields=['queued_at'],
+    )
+
+
+def next_queued_job():
+    """The oldest queued job refresh as (job_id, queued_at), or None"""
+    return QueuedJobRefresh.objects.order_by('queued_at', 'job_id').values_list('job_id', 'queued_at').first()
+
+
+def process_queued_job(job_id, queued_at):
+    """Rescore a queued job and take it off the queue unless it was queued again meanwhile"""
+    refresh_for_job(job_id)
+    QueuedJobRefresh.objects.filter(job_id=job_id, queued_at=queued_at).delete()
+
+
+def refresh_for_job(job_id):
+    """
+    A job's skills changed or it was (de)activated: rescore only the
+    students holding at least one of its skills (run by the worker, see
+    queue_job_refresh).
+    """
+    previous = dict(
+        JobRecommendation.objects.filter(job_id=job_id).values_list('user_id', 'match_score')
+    )
+    
+    job = Job.objects.filter(pk=job_id).first()
+    scoring = get_match_scoring()
+    if job is None or not job.is_active or job.last_date < timezone.now():
+        rows = []
+    elif scoring.uses_proficiency:
+        required_skill_ids = frozenset(job.skills_required.values_list('id', flat=True))
+        held = {}
+        for user_id, skill_id, proficiency_level in StudentSkill.objects.filter(
+            skill_id__in=list(required_skill_ids)
+        ).values_list('user_id', 'skill_id', 'proficiency_level'):
+            held.setdefault(user_id, {})[skill_id] = proficiency_level
+        rows = [
+            (user_id, job_id, *scoring.score(user_skills, required_skill_ids))
+            for user_id, user_skills in held.items()
+        ]
+    else:
+        required_skill_ids = list(job.skills_required.values_list('id', flat=True))
+        required_count = len(required_skill_ids)
+        matches = (
+            StudentSkill.objects.filter(skill_id__in=required_skill_ids)
+            .values('user_id')
+            .annotate(matched=Count('id'))
+            .values_list('user_id', 'matched')
+        ) if required_count else []
+        rows = [
+            (user_id, job_id, matched / required_count, matched, required_count)
+            for user_id, matched in matches
+        ]
+    
+    # Students whose full list loses ground on this job may now have room
+    # for a job that was previously cut by the limit
+    new_scores = {row[0]: row[2] for row in rows}
+    dropped = [user_id for user_id, score in previous.items() if new_scores.get(user_id, 0.0) < score]
+    refill = []
+    for chunk in _chunks(dropped):
+        refill += (
+            JobRecommendation.objects.filter(user_id__in=chunk)
+            .values('user_id')
+            .annotate(stored=Count('id'))
+            .filter(stored__gte=RECOMMENDATION_LIMIT)
+            .values_list('user_id', flat=True)
+        )
+    
+    rows += [
+        (user_id, job_id, 0.0, 0, 0)
+        for user_id in previous if user_id not in new_scores
+    ]
+    persist_recommendations(rows)
+    _trim_to_limit(list(new_scores))
+    for user_id in refill:
+        refresh_for_user(user_id)
+
+
+# ==================== JOB CANDIDATES ====================
+def get_job_candidates(job, page_number=1, per_page=CANDIDATES_PER_PAGE):
+    """
+    Rank the students who best fit a job posting.
+    
+    Only students holding at least one required skill are scored. The
+    count of matched skills per student (or, under weighted scoring, the
+    sum of skill weight x proficiency) is aggregated straight from the
+    (skill, user) index on StudentSkill, so the ranking never loads or
+    loops over users; only the requested page is materialized.
+    
+    Args:
+        job: Job object
+        page_number: 1-based page of the ranked list
+        per_page: Students per page
+    
+    Returns:
+        Dict with page (Page of ranked rows), candidates (list of dicts with
+        user, match_score, match_percent, matched_skills, missing_skills)
+        and total_required_skills
+    """
+    required_skills = {skill.id: skill for skill in job.skills_required.all()}
+    required_count = len(required_skills)
+    scoring = get_match_scoring()
+    
+    ranked = (
+        StudentSkill.objects.filter(skill_id__in=list(required_skills))
+        .values('user_id')
+        .annotate(matched=Count('id'))
+        .order_by('-matched', 'user_id')
+    ) if required_count else StudentSkill.objects.none()
+    if required_count and scoring.uses_proficiency:
+        total_weight = sum(scoring.skill_weight(skill_id) for skill_id in required_skills)
+        ranked = ranked.annotate(
+            gained=Sum(
+                Case(
+                    *[When(skill_id=skill_id, then=Value(scoring.skill_weight(skill_id))) for skill_id in required_skills],
+                    output_field=FloatField(),
+                ) * Case(
+                    *[When(proficiency_level=level, then=Value(weight)) for level, weight in PROFICIENCY_WEIGHTS.items()],
+                    default=Value(scoring.proficiency_weight(None)),
+                    output_field=FloatField(),
+                )
+            )
+        ).order_by('-gained', '-matched', 'user_id')
+    page = Paginator(ranked, per_page).get_page(page_number)
+    
+    rows = list(page.object_list)
+    user_ids = [row['user_id'] for row in rows]
+    users = User.objects.select_related('profile').in_bulk(user_ids)
+    held = {}
+    for user_id, skill_id, proficiency_level in StudentSkill.objects.filter(
+        user_id__in=user_ids, skill_id__in=list(required_skills)
+    ).values_list('user_id', 'skill_id', 'proficiency_level'):
+        held.setdefault(user_id, {})[skill_id] = proficiency_level
+    
+    candidates = []
+    for row in rows:
+        user = users.get(row['user_id'])
+        if user is None:
+            continue
+        user_skills = held.get(user.id, {})
+        if 'gained' in row:
+            match_score = row['gained'] / total_weight
+        else:
+            match_score = row['matched'] / required_count
+        candidates.append({
+            'user': user,
+            'match_score': match_score,
+            'match_percent': int(match_score * 100),
+            'matched_skills_count': row['matched'],
+            'matched_skills': sorted(
+                (
+                    {'skill': required_skills[skill_id], 'proficiency_level': level}
+                    for skill_id, level in user_skills.items()
+                ),
+                key=lambda item: item['skill'].skill_name,
+            ),
+            'missing_skills': sorted(
+                (skill for skill_id, skill in required_skills.items() if skill_id not in user_skills),
+                key=lambda skill: skill.skill_name,
+            ),
+        })
+    
+    return {
+        'page': page,
+        'candidates': candidates,
+        'total_required_skills': required_count,
+    }
+
+
+# ==================== JOB LISTING ====================
+def annotate_match_percent(jobs, user_skills, scoring=None):
+    """
+    Attach match_percent to each job, scored in one batch against the job skill index.
+    
+    Args:
+        jobs: Job objects (active ones; others score 0)
+        user_skills: Mapping of skill_id -> proficiency_level (see load_user_skills)
+        scoring: Strategy from scoring.py, the configured one by default
+    """
+    scores = job_skill_index.score_jobs(
+        user_skills, [job.id for job in jobs], scoring=scoring or get_match_scoring()
+    )
+    for job in jobs:
+        job.match_percent = scores[job.id][0] * 100
+    return jobs
+
+
+def get_job_listing(job_ids, user=None, sort='newest', page_number=1, per_page=JOBS_PER_PAGE):
+    """
+    One page of a job listing, newest first or best match first.
+    
+    Sorting by match scores every job id of the listing in one batch over
+    the in-memory skill bitsets; either way only the requested page of jobs
+    is loaded, with their required skills prefetched and, for a signed-in
+    user, a match_percent.
+    
+    Args:
+        job_ids: Ids of the listed jobs, newest first (see job_search.py)
+        user: Signed-in user to score against, or None
+        sort: 'newest' or 'match' (ignored without a user)
+        page_number: 1-based page
+        per_page: Jobs per page
+    
+    Returns:
+        Page whose object_list is a list of Job objects
+    """
+    job_ids = list(job_ids)
+    user_skills = load_user_skills(user.pk) if user is not None else None
+    scoring = get_match_scoring()
+    
+    if user_skills is not None and sort == 'match':
+        scores = job_skill_index.score_jobs(user_skills, job_ids, scoring=scoring)
+        # Stable sort: equal scores stay newest first
+        job_ids.sort(key=lambda job_id: scores[job_id][0], reverse=True)
+    page = Paginator(job_ids, per_page).get_page(page_number)
+    by_id = Job.objects.prefetch_related('skills_required').in_bulk(list(page.object_list))
+    page.object_list = [by_id[job_id] for job_id in page.object_list if job_id in by_id]
     
-    return stored_recs
+    if user_skills is not None:
+        annotate_match_percent(page.object_list, user_skills, scoring)
+    return page
 
 
 def get_skill_gap_analysis(user, career_path):
@@ -0,0 +1,254 @@
+"""
+Match Scoring Strategies
+How a student's skills are scored against a job's required skills.
+
+- ratio:    matched required skills / required skills (every skill counts
+            the same; the original behaviour)
+- weighted: each required skill is weighted by how rare it is across
+            active jobs and across students (inverse frequency), and each
+            matched skill by the student's proficiency level
+
+The strategy is chosen with the SKILLNEST_MATCH_SCORING setting. Stored
+recommendations are computed with the active strategy, so run
+`manage.py recompute_recommendations` after switching.
+
+Skill frequencies live in the SkillWeight table. Model signals (see
+models.py) recount the affected skills only while the configured strategy
+reads weights; `recompute_recommendations` recounts every skill before
+scoring, so switching strategies starts from current counts. Each process
+keeps the derived weights in memory and reloads them when a recount bumps
+the weights version (see cache_versions.py), and at least every
+WEIGHTS_MAX_AGE seconds since the job and student totals move without one.
+"""
+
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .cache_versions import bump_cache_version, get_cache_version
+
+# Multiplier applied to a matched skill in weighted mode
+PROFICIENCY_LEVELS = ('beginner', 'intermediate', 'advanced')
+PROFICIENCY_WEIGHTS = {
+    'beginner': 0.6,
+    'intermediate': 0.8,
+    'advanced': 1.0,
+}
+
+WEIGHTS_VERSION = 'skill_weights'
+# Seconds a process serves its in-memory weights before reloading them anyway
+WEIGHTS_MAX_AGE = 300
+
+
+def inverse_frequency(count, total):
+    """Smoothed IDF: 1.0 for a skill everyone has, growing as it gets rarer"""
+    return math.log((1 + total) / (1 + count)) + 1.0
+
+
+class SkillWeights:
+    """In-memory skill_id -> weight map derived from the SkillWeight table"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._version = None
+        self._weights = {}
+        self._job_totals = {}  # frozenset of skill ids -> summed weight
+        self._default = 1.0
+
+    def _is_current(self, version):
+        return (
+            self._loaded_at is not None and version == self._version
+            and time.monotonic() - self._loaded_at < WEIGHTS_MAX_AGE
+        )
+
+    def _ensure_loaded(self):
+        version = get_cache_version(WEIGHTS_VERSION)
+        if self._is_current(version):
+            return
+        with self._lock:
+            if not self._is_current(version):
+                self._reload(version)
+
+    def _reload(self, version):
+        from .job_search import live_jobs_q
+        from .models import Job, SkillWeight, UserProfile
+
+        total_jobs = Job.objects.filter(live_jobs_q()).count()
+        total_students = UserProfile.objects.filter(role='student').count()
+        self._weights = {
+            skill_id: math.sqrt(
+                inverse_frequency(job_count, total_jobs) * inverse_frequency(student_count, total_students)
+            )
+            for skill_id, job_count, student_count in SkillWeight.objects.values_list(
+                'skill_id', 'job_count', 'student_count'
+            )
+        }
+        # Skills without a row yet are required and held by nobody
+        self._default = math.sqrt(inverse_frequency(0, total_jobs) * inverse_frequency(0, total_students))
+        self._job_totals = {}
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    def weight(self, skill_id):
+        self._ensure_loaded()
+        return self._weights.get(skill_id, self._default)
+
+    def total(self, skill_ids):
+        """Summed weight of a job's required skills (memoized per skill set)"""
+        self._ensure_loaded()
+        skill_ids = frozenset(skill_ids)
+        total = self._job_totals.get(skill_ids)
+        if total is None:
+            total = sum(self._weights.get(skill_id, self._default) for skill_id in skill_ids)
+            self._job_totals[skill_ids] = total
+        return total
+
+    def invalidate(self):
+        """Reload on the next lookup in this process"""
+        self._loaded_at = None
+
+
+skill_weights = SkillWeights()
+
+
+def skill_weights_in_use():
+    """True when the configured strategy reads SkillWeight (ratio scoring never does)"""
+    return get_match_scoring().uses_skill_weights
+
+
+def refresh_skill_weights(skill_ids=None):
+    """
+    Recount the job and student frequencies of `skill_ids` (default: every
+    skill) into the SkillWeight table.
+    """
+    from django.db.models import Count
+    from .job_search import live_jobs_q
+    from .models import Job, Skill, SkillWeight, StudentSkill
+
+    if skill_ids is None:
+        skill_ids = list(Skill.objects.values_list('id', flat=True))
+    else:
+        skill_ids = list(set(skill_ids))
+        # Skills deleted since the change was queued have no row to keep
+        skill_ids = list(Skill.objects.filter(id__in=skill_ids).values_list('id', flat=True))
+    if not skill_ids:
+        return
+
+    job_counts = dict(
+        Job.skills_required.through.objects.filter(live_jobs_q(prefix='job__'), skill_id__in=skill_ids)
+        .values('skill_id')
+        .annotate(count=Count('id'))
+        .values_list('skill_id', 'count')
+    )
+    student_counts = dict(
+        StudentSkill.objects.filter(skill_id__in=skill_ids)
+        .values('skill_id')
+        .annotate(count=Count('id'))
+        .values_list('skill_id', 'count')
+    )
+    SkillWeight.objects.bulk_create(
+        [
+            SkillWeight(
+                skill_id=skill_id,
+                job_count=job_counts.get(skill_id, 0),
+                student_count=student_counts.get(skill_id, 0),
+            )
+            for skill_id in skill_ids
+        ],
+        update_conflicts=True,
+        unique_fields=['skill'],
+        update_fields=['job_count', 'student_count', 'updated_at'],
+    )
+    skill_weights.invalidate()
+    bump_cache_version(WEIGHTS_VERSION)
+
+
+class RatioScoring:
+    """Share of the required skills the student holds"""
+    name = 'ratio'
+    uses_proficiency = False
+    uses_skill_weights = False
+
+    def skill_weight(self, skill_id):
+        return 1.0
+
+    def proficiency_weight(self, level):
+        return 1.0
+
+    def upper_bound(self, user_count, required_count):
+        """Best score a student with `user_count` skills can reach on a job requiring `required_count`"""
+        return min(user_count, required_count) / required_count
+
+    def score(self, user_skills, job_skill_ids, matched_count=None):
+        """
+        Score one student against one job.
+
+        Args:
+            user_skills: Skill ids the student holds, or a mapping of
+                         skill_id -> proficiency_level
+            job_skill_ids: Set of skill ids the job requires
+            matched_count: Number of required skills held, if already known
+
+        Returns:
+            Tuple: (match_score: float, matched_count: int, required_count: int)
+        """
+        required_count = len(job_skill_ids)
+        if not required_count:
+            return 0.0, 0, 0
+        if matched_count is None:
+            matched_count = sum(1 for skill_id in job_skill_ids if skill_id in user_skills)
+        return matched_count / required_count, matched_count, required_count
+
+
+class WeightedScoring(RatioScoring):
+    """Inverse-frequency skill weights times the student's proficiency"""
+    name = 'weighted'
+    uses_proficiency = True
+    uses_skill_weights = True
+
+    def __init__(self, weights=skill_weights):
+        self.weights = weights
+
+    def skill_weight(self, skill_id):
+        return self.weights.weight(skill_id)
+
+    def proficiency_weight(self, level):
+        return PROFICIENCY_WEIGHTS.get(level, PROFICIENCY_WEIGHTS['beginner'])
+
+    def upper_bound(self, user_count, required_count):
+        # A single rare skill can outweigh the rest, so nothing can be pruned
+        return 1.0
+
+    def score(self, user_skills, job_skill_ids, matched_count=None):
+        required_count = len(job_skill_ids)
+        if not required_count:
+            return 0.0, 0, 0
+        levels = user_skills if isinstance(user_skills, dict) else dict.fromkeys(user_skills)
+        gained = 0.0
+        matched_count = 0
+        for skill_id in job_skill_ids:
+            if skill_id in levels:
+                matched_count += 1
+                gained += self.weights.weight(skill_id) * self.proficiency_weight(levels[skill_id])
+        return gained / self.weights.total(job_skill_ids), matched_count, required_count
+
+
+SCORING_STRATEGIES = {
+    RatioScoring.name: RatioScoring,
+    WeightedScoring.name: WeightedScoring,
+}
+
+
+def get_match_scoring():
+    """Return the scoring strategy selected by SKILLNEST_MATCH_SCORING"""
+    name = getattr(settings, 'SKILLNEST_MATCH_SCORING', RatioScoring.name)
+    try:
+        return SCORING_STRATEGIES[name]()
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"SKILLNEST_MATCH_SCORING must be one of {', '.join(SCORING_STRATEGIES)}, not {name!r}"
+        )
@@ -0,0 +1,294 @@
+"""
+Course Full-Text Search
+Ranked search over course titles, descriptions, skill names and lesson
+titles, backed by the database's own full-text engine instead of a chain of
+icontains scans.
+
+Every course has a CourseSearchDocument row holding its searchable text,
+rewritten by model signals whenever the course, its skills or its lessons
+change (see models.py). On top of that table:
+
+- SQLite: an FTS5 virtual table using the documents as external content,
+  kept current by SQL triggers, ranked with bm25() and excerpted with
+  snippet().
+- PostgreSQL: a GIN index on the weighted tsvector of the documents, ranked
+  with ts_rank() and excerpted with ts_headline().
+- Anything else (or SQLite built without FTS5): icontains over the
+  documents, ordered by title matches first.
+
+Both indexes are created by migration 0021; `rebuild_course_search`
+repopulates them.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+DOCUMENT_TABLE = 'skillnest_app_coursesearchdocument'
+COURSE_TABLE = 'skillnest_app_course'
+FTS_TABLE = 'skillnest_course_fts'
+
+# Course columns a search can be narrowed by, applied before the LIMIT
+SEARCH_FILTER_FIELDS = ('category', 'level')
+
+# Upper bound of ranked hits fetched for one query
+SEARCH_RESULT_LIMIT = 240
+MAX_QUERY_TERMS = 8
+SNIPPET_WORDS = 16
+
+# Placeholders wrapped around matched words by the database, turned into
+# <mark> after the rest of the excerpt has been escaped
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Column weights: a hit in the title counts most, the description least
+SQLITE_BM25_WEIGHTS = (10.0, 2.0, 5.0, 3.0)  # title, description, skills, lessons
+
+POSTGRES_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(skills, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(lessons, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+)
+
+
+@dataclass
+class SearchHit:
+    course_id: int
+    rank: float
+    snippet: str
+
+
+def query_terms(query):
+    """Lower-cased words of a user query, capped at MAX_QUERY_TERMS"""
+    return TERM_RE.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+def highlight(text):
+    """Escape an excerpt and turn the match placeholders into <mark> tags"""
+    text = escape(text or '')
+    return mark_safe(text.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
+
+
+def course_document(course):
+    """
+    Searchable text of a course, as stored in CourseSearchDocument.
+
+    Skills and lessons are sorted in Python so a course fetched with
+    prefetch_related('skills', 'lessons') needs no further queries.
+    """
+    return {
+        'title': course.title,
+        'description': course.description,
+        'skills': ' '.join(sorted(skill.skill_name for skill in course.skills.all())),
+        'lessons': '\n'.join(
+            lesson.title for lesson in sorted(course.lessons.all(), key=lambda lesson: (lesson.order, lesson.id))
+        ),
+    }
+
+
+def _check_filters(filters):
+    for field in filters or {}:
+        if field not in SEARCH_FILTER_FIELDS:
+            raise ValueError(f'Cannot filter course search by {field!r}')
+
+
+def _filter_sql(filters, course_id_column):
+    """
+    WHERE condition (with a leading AND) restricting hits to courses matching
+    `filters`, and its params; empty without filters.
+    """
+    _check_filters(filters)
+    if not filters:
+        return '', []
+    conditions = ''.join(f' AND c.{field} = %s' for field in filters)
+    return (
+        f" AND EXISTS (SELECT 1 FROM {COURSE_TABLE} c WHERE c.id = {course_id_column}{conditions})",
+        list(filters.values()),
+    )
+
+
+def index_course(course_id):
+    """Rewrite the search document of one course (or drop it if the course is gone)"""
+    from .models import Course, CourseSearchDocument
+
+    course = Course.objects.filter(pk=course_id).first()
+    if course is None:
+        CourseSearchDocument.objects.filter(course_id=course_id).delete()
+        return
+    CourseSearchDocument.objects.update_or_create(course=course, defaults=course_document(course))
+
+
+def rebuild_index():
+    """
+    Recreate every course's search document and rebuild the FTS index.
+
+    Returns:
+        Number of courses indexed
+    """
+    from .models import Course, CourseSearchDocument
+
+    documents = [
+        CourseSearchDocument(course=course, **course_document(course))
+        for course in Course.objects.prefetch_related('skills', 'lessons')
+    ]
+    CourseSearchDocument.objects.all().delete()
+    CourseSearchDocument.objects.bulk_create(documents, batch_size=500)
+    if isinstance(get_search_backend(), SqliteFtsBackend):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return len(documents)
+
+
+class SqliteFtsBackend:
+    """FTS5 virtual table over the search documents"""
+
+    name = 'sqlite-fts5'
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, filters=None):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        # Each word quoted (no FTS5 operators from user input) and prefix-matched
+        match = ' '.join(f'"{term}"*' for term in terms)
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        filter_sql, filter_params = _filter_sql(filters, f'{FTS_TABLE}.rowid')
+        sql = (
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score, "
+            f"snippet({FTS_TABLE}, -1, %s, %s, '…', {SNIPPET_WORDS}) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s{filter_sql} ORDER BY score LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [_MARK_START, _MARK_END, match, *filter_params, limit])
+            rows = cursor.fetchall()
+        # bm25() is lower-is-better; flip it so every backend ranks high-is-better
+        return [SearchHit(course_id, -score, highlight(snippet)) for course_id, score, snippet in rows]
+
+
+class PostgresSearchBackend:
+    """GIN-indexed weighted tsvector over the search documents"""
+
+    name = 'postgresql'
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, filters=None):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        headline_options = (
+            f'StartSel={_MARK_START}, StopSel={_MARK_END}, '
+            f'MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=1'
+        )
+        filter_sql, filter_params = _filter_sql(filters, f'{DOCUMENT_TABLE}.course_id')
+        # The WHERE clause repeats the indexed expression so the GIN index is
+        # used; headlines are computed for the returned page of hits only
+        sql = (
+            f"SELECT ranked.course_id, ranked.score, ts_headline('english', "
+            f"d.title || ' ' || d.skills || ' ' || d.lessons || ' ' || d.description, "
+            f"ranked.q, %s) "
+            f"FROM (SELECT course_id, ts_rank({POSTGRES_VECTOR_SQL}, q) AS score, q "
+            f"      FROM {DOCUMENT_TABLE}, to_tsquery('english', %s) q "
+            f"      WHERE {POSTGRES_VECTOR_SQL} @@ q{filter_sql} ORDER BY score DESC LIMIT %s) ranked "
+            f"JOIN {DOCUMENT_TABLE} d ON d.course_id = ranked.course_id "
+            f"ORDER BY ranked.score DESC"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [headline_options, tsquery, *filter_params, limit])
+            rows = cursor.fetchall()
+        return [SearchHit(course_id, score, highlight(snippet)) for course_id, score, snippet in rows]
+
+
+class FallbackSearchBackend:
+    """Substring matching over the search documents, for databases without an index"""
+
+    name = 'fallback'
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, filters=None):
+        from django.db.models import Case, IntegerField, Q, Value, When
+        from .models import CourseSearchDocument
+
+        terms = query_terms(query)
+        if not terms:
+            return []
+        condition = Q()
+        title_hits = Q()
+        for term in terms:
+            condition &= (
+                Q(title__icontains=term) | Q(description__icontains=term)
+                | Q(skills__icontains=term) | Q(lessons__icontains=term)
+            )
+            title_hits &= Q(title__icontains=term)
+        _check_filters(filters)
+        for field, value in (filters or {}).items():
+            condition &= Q(**{f'course__{field}': value})
+        documents = (
+            CourseSearchDocument.objects.filter(condition)
+            .annotate(score=Case(When(title_hits, then=Value(1)), default=Value(0), output_field=IntegerField()))
+            .order_by('-score', '-course_id')
+            .values_list('course_id', 'score', 'description', 'lessons', 'skills', 'title')[:limit]
+        )
+        hits = []
+        for course_id, score, *fields in documents:
+            # Excerpt the first field with a match, the description if none has
+            text = next((field for field in fields if any(term in field.lower() for term in terms)), fields[0])
+            hits.append(SearchHit(course_id, score, _excerpt(text, terms)))
+        return hits
+
+
+def _excerpt(text, terms):
+    """First SNIPPET_WORDS words of `text` around the first matching term, highlighted"""
+    words = (text or '').split()
+    start = next(
+        (index for index, word in enumerate(words) if any(term in word.lower() for term in terms)),
+        0,
+    )
+    start = max(0, start - SNIPPET_WORDS // 4)
+    excerpt = []
+    for word in words[start:start + SNIPPET_WORDS]:
+        if any(term in word.lower() for term in terms):
+            word = f'{_MARK_START}{word}{_MARK_END}'
+        excerpt.append(word)
+    return highlight(('…' if start else '') + ' '.join(excerpt))
+
+
+_fts_available = {}
+
+
+def _sqlite_fts_available():
+    """Whether the FTS5 table exists (SQLite builds without FTS5 skip it)"""
+    alias = connection.alias
+    if alias not in _fts_available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_available[alias] = cursor.fetchone() is not None
+    return _fts_available[alias]
+
+
+def get_search_backend():
+    """The search backend matching the default database"""
+    if connection.vendor == 'sqlite' and _sqlite_fts_available():
+        return SqliteFtsBackend()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return FallbackSearchBackend()
+
+
+def search_courses(query, limit=SEARCH_RESULT_LIMIT, filters=None):
+    """
+    Rank courses against a free-text query.
+
+    Args:
+        query: What the user typed; every word must match, as a word or word prefix
+        limit: Maximum number of hits
+        filters: Optional dict of course column (see SEARCH_FILTER_FIELDS) to
+                 the value it must have; applied before the limit
+
+    Returns:
+        List of SearchHit, best match first, each with a highlighted excerpt
+    """
+    return get_search_backend().search(query, limit, filters)
@@ -0,0 +1,150 @@
+"""
+Course Progress Services
+Lesson completion, course completion, skill awards and certificates in one
+place, shared by every view that lets a student finish a lesson.
+"""
+
+import uuid
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Course, Enrollment, StudentSkill, Certificate, bump_skills_version, progress_percent
+from .recommendations import refresh_for_student_skills
+from .scoring import refresh_skill_weights, skill_weights_in_use
+from .stats import adjust_platform_stats
+
+# Fresh certificate codes tried before giving up on a run of collisions
+CERTIFICATE_CODE_ATTEMPTS = 5
+
+
+def complete_lesson(user, lesson):
+    """
+    Mark `lesson` complete for `user` and, when it is the last one, complete
+    the course: award its skills and issue the certificate.
+
+    Runs in one transaction with the enrollment row locked, so concurrent
+    requests for the same enrollment are applied one after the other.
+    Progress comes from the Course.lesson_count and
+    Enrollment.completed_count counters, so the work is constant no matter
+    how many lessons or skills the course has. Completing an already
+    completed lesson changes nothing, and the certificate is issued at most
+    once.
+
+    Args:
+        user: User object
+        lesson: Lesson object
+
+    Returns:
+        Dict with enrollment, newly_completed (the lesson was not complete
+        before), course_completed (this call completed the course) and
+        certificate (the user's certificate for the course, if any)
+
+    Raises:
+        Enrollment.DoesNotExist: the user is not enrolled in the course
+    """
+    Completion = Enrollment.completed_lessons.through
+
+    with transaction.atomic():
+        enrollment = (
+            Enrollment.objects.select_for_update(of=('self',))
+            .select_related('course')
+            .get(user=user, course_id=lesson.course_id)
+        )
+
+        # The bitmap on the locked row answers this without touching the M2M table
+        newly_completed = not enrollment.has_completed(lesson)
+        if not newly_completed:
+            return {
+                'enrollment': enrollment,
+                'newly_completed': False,
+                'course_completed': False,
+                'certificate': None,
+            }
+
+        Completion.objects.bulk_create(
+            [Completion(enrollment_id=enrollment.pk, lesson_id=lesson.pk)],
+            ignore_conflicts=True,
+        )
+        enrollment.mark_completed_in_bitmap(lesson)
+        enrollment.completed_count += 1
+        enrollment.progress_percent = progress_percent(enrollment.completed_count, enrollment.course.lesson_count)
+        updates = {
+            'completed_bitmap': enrollment.completed_bitmap,
+            'completed_count': F('completed_count') + 1,
+            'progress_percent': enrollment.progress_percent,
+        }
+        course_completed = enrollment.progress_percent >= 100 and enrollment.status != 'completed'
+        was_in_progress = enrollment.status == 'in_progress'
+        if course_completed:
+            enrollment.status = 'completed'
+            enrollment.completed_date = timezone.now()
+            updates.update(status=enrollment.status, completed_date=enrollment.completed_date)
+        Enrollment.objects.filter(pk=enrollment.pk).update(**updates)
+
+        certificate = None
+        if course_completed:
+            _award_course_skills(user.pk, lesson.course_id)
+            certificate = _issue_certificate(user, lesson.course_id)
+            # The update above skips the signal that keeps the active enrollment counter
+            adjust_platform_stats(active_enrollments=-1 if was_in_progress else 0)
+
+    return {
+        'enrollment': enrollment,
+        'newly_completed': newly_completed,
+        'course_completed': course_completed,
+        'certificate': certificate,
+    }
+
+
+def _issue_certificate(user, course_id):
+    """
+    Return the user's certificate for a course, issuing it if there is none.
+
+    The short random code can collide with another certificate's; only a
+    collision on the code is retried with a fresh one, a certificate issued
+    meanwhile for the same (user, course) is returned as is.
+    """
+    for attempt in range(CERTIFICATE_CODE_ATTEMPTS):
+        certificate = Certificate.objects.filter(user=user, course_id=course_id).first()
+        if certificate is not None:
+            return certificate
+        try:
+            with transaction.atomic():
+                return Certificate.objects.create(
+                    user=user, course_id=course_id, certificate_code=str(uuid.uuid4())[:8].upper()
+                )
+        except IntegrityError:
+            if attempt == CERTIFICATE_CODE_ATTEMPTS - 1:
+                raise
+
+
+def _award_course_skills(user_id, course_id):
+    """
+    Give a student every skill a course teaches that they do not hold yet.
+
+    bulk_create skips the StudentSkill signals, so the bookkeeping they do
+    (skills version, recommendation refresh, skill weights) is done here for
+    the new skills, once for the whole batch.
+    """
+    skill_ids = set(
+        Course.skills.through.objects.filter(course_id=course_id).values_list('skill_id', flat=True)
+    )
+    if not skill_ids:
+        return
+    skill_ids -= set(
+        StudentSkill.objects.filter(user_id=user_id, skill_id__in=skill_ids).values_list('skill_id', flat=True)
+    )
+    if not skill_ids:
+        return
+
+    skill_ids = sorted(skill_ids)
+    StudentSkill.objects.bulk_create(
+        [StudentSkill(user_id=user_id, skill_id=skill_id) for skill_id in skill_ids],
+        ignore_conflicts=True,
+    )
+    bump_skills_version(user_id)
+    transaction.on_commit(lambda: refresh_for_student_skills(user_id, skill_ids))
+    if skill_weights_in_use():
+        transaction.on_commit(lambda: refresh_skill_weights(skill_ids))
@@ -0,0 +1,103 @@
+"""
+Bitset Skill Vectors
+Skills are remapped to dense bit positions so a skill set becomes a single
+Python int. Matching a student against a job is then one AND plus a popcount
+instead of building and intersecting two sets.
+
+Skill vectors are not stored in the database. Job vectors live next to the
+posting lists of the in-memory job index (job_index.py) and are rebuilt with
+it. A student's vector is encoded per request from the StudentSkill rows,
+which are read anyway for proficiency levels and missing skills. Bit
+positions come from a per-process vocabulary, so stored bytes would not
+decode in another process. to_bytes/from_bytes serialize the bitmaps that
+are stored, keyed by stable positions (Enrollment.completed_bitmap by lesson
+slot, VideoUpload.received_chunks by chunk index).
+"""
+
+
+class SkillVocabulary:
+    """Dense skill_id -> bit position remap"""
+
+    def __init__(self, skill_ids=()):
+        self.positions = {}
+        self.skill_ids = []
+        for skill_id in sorted(skill_ids):
+            self.add(skill_id)
+
+    def __len__(self):
+        return len(self.skill_ids)
+
+    def add(self, skill_id):
+        """Return the bit position of `skill_id`, assigning one if needed"""
+        position = self.positions.get(skill_id)
+        if position is None:
+            position = len(self.skill_ids)
+            self.positions[skill_id] = position
+            self.skill_ids.append(skill_id)
+        return position
+
+    def encode(self, skill_ids, extend=False):
+        """
+        Encode skill ids as an int bitset.
+
+        Unknown skills are skipped unless `extend` is set; for a student they
+        cannot match any indexed job anyway.
+        """
+        bits = 0
+        for skill_id in skill_ids:
+            position = self.add(skill_id) if extend else self.positions.get(skill_id)
+            if position is not None:
+                bits |= 1 << position
+        return bits
+
+    def decode(self, bits):
+        """Return the skill ids set in `bits`"""
+        skill_ids = []
+        position = 0
+        while bits:
+            if bits & 1:
+                skill_ids.append(self.skill_ids[position])
+            bits >>= 1
+            position += 1
+        return skill_ids
+
+
+def to_bytes(bits):
+    """Serialize a bitset for storage (little-endian)"""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+
+def from_bytes(data):
+    """Inverse of to_bytes"""
+    return int.from_bytes(data, 'little')
+
+
+def match_score(user_bits, job_bits):
+    """
+    Bitset version of calculate_match_score.
+
+    Returns:
+        Tuple: (match_score: float, matched_count: int, required_count: int)
+    """
+    required = job_bits.bit_count()
+    if not required:
+        return 0.0, 0, 0
+    matched = (user_bits & job_bits).bit_count()
+    return matched / required, matched, required
+
+
+def score_user_against_jobs(user_bits, job_bits_list):
+    """Score one student against many jobs in a single pass"""
+    return [match_score(user_bits, job_bits) for job_bits in job_bits_list]
+
+
+def score_users_against_job(user_bits_list, job_bits):
+    """Score many students against one job in a single pass"""
+    required = job_bits.bit_count()
+    if not required:
+        return [(0.0, 0, 0)] * len(user_bits_list)
+    results = []
+    for user_bits in user_bits_list:
+        matched = (user_bits & job_bits).bit_count()
+        results.append((matched / required, matched, required))
+    return results
@@ -0,0 +1,90 @@
+"""
+Platform Statistics
+Materialized counters for the admin dashboard (users, courses,
+certificates, jobs, enrollments, contact messages), kept in the single
+PlatformStats row so the dashboard reads one row instead of counting the
+largest tables on every load.
+
+Model signals (see models.py) apply each change as an F() increment in the
+same transaction as the change itself, so a rolled-back save never skews
+the counters. Bulk paths that bypass signals (services.complete_lesson,
+job_expiry) call adjust_platform_stats() themselves. Anything else that
+slips past (raw SQL, queryset.update() from a shell) is corrected by
+reconcile_platform_stats(), run periodically by the `reconcile_platform_stats`
+management command.
+"""
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+STATS_ROW_ID = 1
+
+
+def count_platform_stats():
+    """Count every statistic from scratch (what the counters should hold)"""
+    from .models import Certificate, ContactMessage, Course, Enrollment, Job, UserProfile
+
+    return {
+        'total_users': User.objects.count(),
+        'total_students': UserProfile.objects.filter(role='student').count(),
+        'total_teachers': UserProfile.objects.filter(role='teacher').count(),
+        'total_courses': Course.objects.count(),
+        'total_certificates': Certificate.objects.count(),
+        'total_jobs': Job.objects.count(),
+        'active_jobs': Job.objects.filter(is_active=True).count(),
+        'total_enrollments': Enrollment.objects.count(),
+        'active_enrollments': Enrollment.objects.filter(status='in_progress').count(),
+        'pending_contacts': ContactMessage.objects.filter(is_resolved=False).count(),
+    }
+
+
+def reconcile_platform_stats():
+    """
+    Recount every statistic and overwrite the stored counters.
+
+    Returns:
+        Dict: counter -> drift that was corrected (stored minus actual),
+        only for counters that had drifted
+    """
+    from .models import PlatformStats
+
+    with transaction.atomic():
+        stats, _ = PlatformStats.objects.select_for_update().get_or_create(pk=STATS_ROW_ID)
+        actual = count_platform_stats()
+        drift = {
+            name: getattr(stats, name) - value
+            for name, value in actual.items()
+            if getattr(stats, name) != value
+        }
+        for name, value in actual.items():
+            setattr(stats, name, value)
+        stats.reconciled_at = timezone.now()
+        stats.save()
+    return drift
+
+
+def adjust_platform_stats(**deltas):
+    """Apply counter changes, e.g. adjust_platform_stats(total_jobs=1, active_jobs=1)"""
+    from .models import PlatformStats
+
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # Without a snapshot row (migration 0024 creates it) there is nothing to
+    # adjust; get_platform_stats() takes a full count instead
+    PlatformStats.objects.filter(pk=STATS_ROW_ID).update(
+        **{name: F(name) + delta for name, delta in deltas.items()}
+    )
+
+
+def get_platform_stats():
+    """The stored counters (one query), taking the first snapshot if there is none"""
+    from .models import PlatformStats
+
+    stats = PlatformStats.objects.filter(pk=STATS_ROW_ID).first()
+    if stats is None:
+        reconcile_platform_stats()
+        stats = PlatformStats.objects.get(pk=STATS_ROW_ID)
+    return stats
@@ -0,0 +1,175 @@
+"""
+Byte-Range File Streaming
+Serves uploaded media (lesson videos) with HTTP Range support so players can
+seek without re-downloading from byte 0.
+
+- Range: bytes=a-b answers 206 Partial Content; a single range is supported,
+  multi-range requests get the whole file
+- ETag / Last-Modified with If-None-Match, If-Modified-Since and If-Range
+- The file object itself is handed to FileResponse, so WSGI servers with a
+  file_wrapper (gunicorn, uWSGI) transfer it with sendfile()
+- Optionally the transfer is handed off to the front-end server entirely
+  (nginx X-Accel-Redirect or Apache X-Sendfile, see SKILLNEST_MEDIA_OFFLOAD)
+"""
+
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """
+    Read-only view of `length` bytes of an open file starting at `start`.
+
+    fileno() is passed through so sendfile-capable WSGI file wrappers can
+    still send straight from the descriptor (they stop at Content-Length);
+    everyone else reads through the length limit.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Parse a Range header against a file of `size` bytes.
+
+    Returns:
+        (start, end) inclusive, None to serve the whole file (no header,
+        multiple ranges or an invalid range such as bytes=5-2), or False
+        when a valid range cannot be satisfied (it starts past the end)
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # bytes=5-2 is not a valid range spec, so the header is ignored
+        return None
+    if start >= size:
+        return False
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+def _file_validators(path):
+    stat = os.stat(path)
+    etag = quote_etag(f'{stat.st_size:x}-{int(stat.st_mtime):x}')
+    return stat.st_size, etag, int(stat.st_mtime)
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _offload_response(name, path):
+    """X-Accel-Redirect / X-Sendfile hand-off, or None when disabled"""
+    offload = getattr(settings, 'SKILLNEST_MEDIA_OFFLOAD', None)
+    if not offload:
+        return None
+    response = HttpResponse()
+    # Let the front-end server pick the type and handle Range itself
+    del response['Content-Type']
+    if offload == 'x-accel-redirect':
+        prefix = getattr(settings, 'SKILLNEST_MEDIA_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + name.lstrip('/')
+    elif offload == 'x-sendfile':
+        response['X-Sendfile'] = path
+    else:
+        raise ValueError(f'Unknown SKILLNEST_MEDIA_OFFLOAD {offload!r}')
+    return response
+
+
+def serve_file(request, field_file, content_type=None):
+    """
+    Stream a FileField's file honouring Range and conditional headers.
+
+    Args:
+        request: HttpRequest
+        field_file: FieldFile on local storage (e.g. lesson.video_file)
+        content_type: Optional type; guessed from the file name otherwise
+
+    Returns:
+        HttpResponse: 200, 206, 304 or 416
+    """
+    return serve_media(request, field_file.name, content_type, storage=field_file.storage)
+
+
+def serve_media(request, name, content_type=None, storage=default_storage):
+    """
+    Like serve_file() for a file given by its storage name (e.g. the HLS
+    renditions of a lesson), relative to MEDIA_ROOT for default storage.
+    """
+    path = storage.path(name)
+    offloaded = _offload_response(name, path)
+    if offloaded is not None:
+        return offloaded
+
+    size, etag, last_modified = _file_validators(path)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    content_type = content_type or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(RangeFile(open(path, 'rb'), start, length), content_type=content_type, status=206)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
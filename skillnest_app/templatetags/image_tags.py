@@ -0,0 +1,74 @@
+from django import template
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from skillnest_app.images import get_derivatives
+
+register = template.Library()
+
+# preset -> (displayed width in CSS pixels, sizes attribute)
+IMAGE_PRESETS = {
+    'avatar': (96, '96px'),
+    'icon': (48, '48px'),
+    'card': (384, '(max-width: 768px) 100vw, 384px'),
+    'portrait': (384, '(max-width: 768px) 60vw, 384px'),
+    'cover': (768, '(max-width: 768px) 100vw, 768px'),
+}
+# Candidates offered up to this many times the displayed width (high-DPI screens)
+MAX_DENSITY = 4
+
+FALLBACK_PICTURES = tuple(f'images/pic-{number}.jpg' for number in range(1, 10))
+
+
+def _srcset(candidates):
+    return ', '.join(f'{url} {width}w' for url, width, height in candidates)
+
+
+def _pick(candidates, limit):
+    """Derivatives up to `limit` pixels wide (at least the smallest one)"""
+    fitting = [candidate for candidate in candidates if candidate[1] <= limit]
+    return fitting or candidates[:1]
+
+
+@register.simple_tag
+def responsive_image(image, preset='card', **attrs):
+    """
+    Render an uploaded image as a <picture> with WebP and JPEG srcsets.
+
+    Usage: {% responsive_image user.profile.profile_picture 'avatar' alt=user.username class="image" %}
+
+    Falls back to the original upload while its derivatives are being
+    generated. Extra keyword arguments become <img> attributes; `sizes`
+    overrides the preset's.
+    """
+    if not image:
+        return ''
+    display_width, sizes = IMAGE_PRESETS[preset]
+    limit = display_width * MAX_DENSITY
+    sizes = attrs.pop('sizes', sizes)
+    attrs.setdefault('alt', '')
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+
+    derivatives = get_derivatives(image.name)
+    webp = _pick(derivatives.get('webp', []), limit)
+    jpeg = _pick(derivatives.get('jpeg', []), limit)
+    if not (webp and jpeg):
+        return format_html('<img src="{}"{}>', image.url, flatatt(attrs))
+
+    # Plain <img> fallback: the first JPEG at least as wide as it is displayed
+    fallback = next((candidate for candidate in jpeg if candidate[1] >= display_width), jpeg[-1])
+    return format_html(
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}"{}>'
+        '</picture>',
+        _srcset(webp), sizes, fallback[0], _srcset(jpeg), sizes, flatatt(attrs),
+    )
+
+
+@register.filter
+def fallback_picture(user_id):
+    """Stock picture for a user without an upload; always the same one per user"""
+    return static(FALLBACK_PICTURES[(user_id or 0) % len(FALLBACK_PICTURES)])
@@ -1,3 +1,372 @@
-from django.test import TestCase
+import hashlib
+import io
+import shutil
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Course, Enrollment, Job, Lesson, VideoUpload
+from .images import derivative_name
+from .job_search import JobQuery, search_jobs
+from .pagination import decode_cursor, encode_cursor, keyset_paginate
+from .services import complete_lesson
+from .skill_vectors import from_bytes, match_score, to_bytes
+from .streaming import parse_range
+from .transcoding import HLS_JS_CDN_URL, claim_next_lesson, hls_js_source, transcode_lesson
+from .uploads import UploadError, complete_upload, start_upload, write_chunk
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp(prefix='skillnest-test-media-')
+# Keeps cached entries of one test out of the next (and out of the shared cache)
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def tearDownModule():
+    shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+
+def make_course(instructor, **fields):
+    fields.setdefault('title', 'Python Basics')
+    fields.setdefault('description', 'Learn Python')
+    fields.setdefault('category', 'programming')
+    return Course.objects.create(instructor=instructor, **fields)
+
+
+# ==================== BITSETS ====================
+class SkillBitsetTests(SimpleTestCase):
+    def test_bytes_round_trip(self):
+        for bits in (0, 1, 0b1011, 1 << 200 | 5):
+            self.assertEqual(from_bytes(to_bytes(bits)), bits)
+
+    def test_empty_bitset_is_stored_as_empty_bytes(self):
+        self.assertEqual(to_bytes(0), b'')
+        self.assertEqual(from_bytes(b''), 0)
+
+    def test_match_score(self):
+        self.assertEqual(match_score(0b0110, 0b1110), (2 / 3, 2, 3))
+        self.assertEqual(match_score(0b1, 0), (0.0, 0, 0))
+
+
+class CompletedLessonBitmapTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user('teacher', password='pw')
+        self.student = User.objects.create_user('student', password='pw')
+        self.course = make_course(teacher)
+        self.lessons = [
+            Lesson.objects.create(course=self.course, title=f'Lesson {n}', order=n) for n in range(3)
+        ]
+        self.enrollment = Enrollment.objects.create(user=self.student, course=self.course)
+
+    def test_lessons_get_distinct_slots(self):
+        self.assertEqual([lesson.slot for lesson in self.lessons], [0, 1, 2])
+
+    def test_deleted_slot_is_not_handed_out_again(self):
+        self.lessons[2].delete()
+        added = Lesson.objects.create(course=self.course, title='Lesson 3', order=3)
+        self.assertEqual(added.slot, 3)
+
+    def test_complete_lesson_sets_bit(self):
+        complete_lesson(self.student, self.lessons[1])
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.completed_bits, 0b010)
+        self.assertTrue(self.enrollment.has_completed(self.lessons[1]))
+        self.assertFalse(self.enrollment.has_completed(self.lessons[0]))
+        self.assertEqual(self.enrollment.completed_count, 1)
+        self.assertEqual(self.enrollment.next_incomplete_lesson(self.lessons), self.lessons[0])
+
+    def test_completing_twice_changes_nothing(self):
+        complete_lesson(self.student, self.lessons[0])
+        result = complete_lesson(self.student, self.lessons[0])
+        self.assertFalse(result['newly_completed'])
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.completed_count, 1)
+
+    def test_update_progress_repairs_bitmap(self):
+        complete_lesson(self.student, self.lessons[0])
+        complete_lesson(self.student, self.lessons[2])
+        Enrollment.objects.filter(pk=self.enrollment.pk).update(completed_bitmap=b'', completed_count=0)
+        self.enrollment.refresh_from_db()
+        self.enrollment.update_progress()
+        self.assertEqual(self.enrollment.completed_bits, 0b101)
+        self.assertEqual(self.enrollment.completed_count, 2)
+        self.assertEqual(self.enrollment.progress_percent, 66)
+
+
+# ==================== IMAGE DERIVATIVES ====================
+class DerivativeNameTests(SimpleTestCase):
+    def test_sources_differing_in_extension_get_distinct_names(self):
+        png = derivative_name('profile_pics/me.png', 96, 'jpg')
+        jpg = derivative_name('profile_pics/me.jpg', 96, 'jpg')
+        self.assertNotEqual(png, jpg)
+        self.assertTrue(png.startswith('derivatives/profile_pics/me-'))
+        self.assertTrue(png.endswith('-96w.jpg'))
+
+
+# ==================== RANGE REQUESTS ====================
+class ParseRangeTests(SimpleTestCase):
+    def test_no_header_serves_whole_file(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range('', 100))
+
+    def test_closed_and_open_ranges(self):
+        self.assertEqual(parse_range('bytes=0-4', 100), (0, 4))
+        self.assertEqual(parse_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=95-500', 100), (95, 99))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-500', 100), (0, 99))
+
+    def test_invalid_ranges_are_ignored(self):
+        for header in ('bytes=5-2', 'bytes=-', 'items=0-4', 'bytes=0-4,10-20', 'bytes=abc'):
+            self.assertIsNone(parse_range(header, 100), header)
+
+    def test_unsatisfiable_ranges(self):
+        self.assertIs(parse_range('bytes=100-', 100), False)
+        self.assertIs(parse_range('bytes=200-300', 100), False)
+        self.assertIs(parse_range('bytes=-0', 100), False)
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class LessonVideoRangeTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user('teacher', password='pw')
+        student = User.objects.create_user('student', password='pw')
+        course = make_course(teacher)
+        self.data = bytes(range(256)) * 4
+        self.lesson = Lesson.objects.create(course=course, title='Intro')
+        self.lesson.video_file.save('intro.mp4', ContentFile(self.data))
+        Enrollment.objects.create(user=student, course=course)
+        self.client.force_login(student)
+        self.url = reverse('lesson_video', args=[self.lesson.id])
+
+    def test_range_returns_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.data)}')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), self.data[10:20])
+
+    def test_without_range_returns_whole_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+
+    def test_invalid_range_returns_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5-2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.data)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    def test_stale_if_range_returns_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+
+# ==================== TRANSCODING ====================
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class TranscodeWorkerTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user('teacher', password='pw')
+        self.lesson = Lesson.objects.create(course=make_course(teacher), title='Intro')
+        self.lesson.video_file.save('intro.mp4', ContentFile(b'not really a video'))
+
+    def test_lesson_deleted_after_claim_is_skipped(self):
+        lesson_id = claim_next_lesson()
+        self.assertEqual(lesson_id, self.lesson.id)
+        self.lesson.delete()
+        self.assertFalse(transcode_lesson(lesson_id))
+
+    def test_hls_js_falls_back_to_pinned_cdn_release(self):
+        hls_js_source.cache_clear()
+        self.addCleanup(hls_js_source.cache_clear)
+        with self.settings(STATICFILES_DIRS=[]):
+            self.assertEqual(hls_js_source(), (HLS_JS_CDN_URL, True))
+
+
+# ==================== KEYSET PAGINATION ====================
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user('teacher', password='pw')
+        start = timezone.now()
+        for n in range(7):
+            course = make_course(teacher, title=f'Course {n}')
+            # Two courses share each timestamp so the id breaks the tie
+            Course.objects.filter(pk=course.pk).update(created_at=start - timedelta(minutes=n // 2))
+        self.expected = list(Course.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def page(self, **cursors):
+        return keyset_paginate(Course.objects.all(), ('created_at', 'id'), 3, **cursors)
+
+    def test_pages_forward_without_gaps_or_repeats(self):
+        seen = []
+        page = self.page()
+        self.assertFalse(page.has_previous)
+        while True:
+            seen.extend(course.id for course in page)
+            if not page.has_next:
+                break
+            page = self.page(after=page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_before_goes_back_to_previous_page(self):
+        first = self.page()
+        second = self.page(after=first.next_cursor)
+        back = self.page(before=second.previous_cursor)
+        self.assertEqual([course.id for course in back], [course.id for course in first])
+        self.assertFalse(back.has_previous)
+        self.assertTrue(back.has_next)
+
+    def test_cursor_round_trip(self):
+        course = Course.objects.get(pk=self.expected[0])
+        cursor = encode_cursor([course.created_at, course.id])
+        self.assertEqual(decode_cursor(cursor, Course, ('created_at', 'id')), [course.created_at, course.id])
+
+    def test_malformed_cursor_starts_from_first_page(self):
+        self.assertIsNone(decode_cursor('not-a-cursor', Course, ('created_at', 'id')))
+        page = self.page(after='not-a-cursor')
+        self.assertEqual([course.id for course in page], self.expected[:3])
+
+
+# ==================== CHUNKED UPLOADS ====================
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class ChunkedUploadTests(TestCase):
+    CHUNK_SIZE = 4
+
+    def setUp(self):
+        self.teacher = User.objects.create_user('teacher', password='pw')
+        self.data = b'AAAABBBBCC'
+        self.upload = self.start(self.data)
+
+    def start(self, data):
+        upload = start_upload(self.teacher, 'video.mp4', len(data))
+        # Small chunks keep the test data readable
+        VideoUpload.objects.filter(pk=upload.pk).update(chunk_size=self.CHUNK_SIZE)
+        upload.refresh_from_db()
+        return upload
+
+    def chunk(self, index, data=None):
+        data = data if data is not None else self.data[index * self.CHUNK_SIZE:(index + 1) * self.CHUNK_SIZE]
+        return data, hashlib.sha256(data).hexdigest()
+
+    def send(self, index, data=None, digest=None):
+        data, actual_digest = self.chunk(index, data)
+        received = write_chunk(self.upload, index, io.BytesIO(data), len(data), digest or actual_digest)
+        self.upload.refresh_from_db()
+        return received
+
+    def checksum(self):
+        digests = b''.join(bytes.fromhex(self.chunk(index)[1]) for index in range(self.upload.chunk_count))
+        return hashlib.sha256(digests).hexdigest()
+
+    def test_file_is_reserved_at_full_size(self):
+        self.assertEqual(self.upload.chunk_count, 3)
+        self.assertEqual(default_storage.size(self.upload.storage_name), len(self.data))
+
+    def test_resume_sends_only_missing_chunks(self):
+        self.assertEqual(self.send(2), 1)
+        self.assertEqual(self.send(0), 2)
+        self.assertEqual(self.upload.missing_chunks(), [1])
+        with self.assertRaises(UploadError):
+            complete_upload(self.upload, self.checksum())
+
+        self.send(1)
+        complete_upload(self.upload, self.checksum())
+        self.assertEqual(self.upload.status, 'complete')
+        with default_storage.open(self.upload.storage_name) as stored:
+            self.assertEqual(stored.read(), self.data)
+
+    def test_chunk_with_wrong_length_or_checksum_is_rejected(self):
+        with self.assertRaises(UploadError):
+            self.send(0, b'AAA')
+        with self.assertRaises(UploadError):
+            self.send(0, digest='0' * 64)
+        self.assertEqual(self.upload.missing_chunks(), [0, 1, 2])
+
+    def test_rejected_resend_forgets_the_overwritten_chunk(self):
+        self.send(0)
+        self.send(1)
+        with self.assertRaises(UploadError):
+            self.send(0, b'XXXX', digest=self.chunk(0)[1])
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.missing_chunks(), [0, 2])
+        self.send(2)
+        with self.assertRaises(UploadError):
+            complete_upload(self.upload, self.checksum())
+
+        self.send(0)
+        complete_upload(self.upload, self.checksum())
+        with default_storage.open(self.upload.storage_name) as stored:
+            self.assertEqual(stored.read(), self.data)
+
+    def test_checksum_mismatch_resets_only_differing_chunks(self):
+        for index in range(3):
+            self.send(index)
+        client_digests = [self.chunk(index)[1] for index in range(3)]
+        client_digests[1] = hashlib.sha256(b'XXXX').hexdigest()
+        checksum = hashlib.sha256(b''.join(bytes.fromhex(digest) for digest in client_digests)).hexdigest()
+        with self.assertRaises(UploadError):
+            complete_upload(self.upload, checksum, client_digests)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.missing_chunks(), [1])
+
+
+# ==================== CACHED QUERIES ====================
+@override_settings(CACHES=TEST_CACHES)
+class JobSearchCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user('employer', password='pw')
+        self.add_job('Backend Developer')
+
+    def add_job(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Job.objects.create(
+                job_title=title, company_name='Acme', location='Pune', description='-',
+                requirements='-', posted_by=self.employer, last_date=timezone.now() + timedelta(days=7),
+            )
+
+    def test_repeated_search_runs_no_queries(self):
+        self.assertEqual(search_jobs(JobQuery()).total, 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(search_jobs(JobQuery()).total, 1)
+
+    def test_new_posting_retires_cached_results(self):
+        search_jobs(JobQuery())
+        self.add_job('Frontend Developer')
+        self.assertEqual(search_jobs(JobQuery()).total, 2)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user('teacher', password='pw')
+        with self.captureOnCommitCallbacks(execute=True):
+            make_course(self.teacher)
+
+    def test_warm_anonymous_hit_runs_no_queries(self):
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['courses_count'], 1)
+
+    def test_new_course_shows_up_on_next_visit(self):
+        self.client.get(reverse('home'))
+        with self.captureOnCommitCallbacks(execute=True):
+            make_course(self.teacher, title='Django Basics')
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['courses_count'], 2)
+        self.assertContains(response, 'Django Basics')
@@ -0,0 +1,251 @@
+"""
+Lesson Video Transcoding
+Turns an uploaded lesson video into adaptive HLS renditions plus a poster
+frame with a local ffmpeg, outside the request cycle.
+
+Saving a Lesson with a new video_file only marks it 'pending' (see
+Lesson.save); `manage.py transcode_videos` is the worker that claims
+pending lessons one at a time, probes the source, encodes the renditions
+that fit its resolution and records the results on the Lesson:
+
+    MEDIA_ROOT/lesson_hls/<lesson id>/<version>/
+        master.m3u8, 360p.m3u8, 360p_000.ts, ..., poster.jpg
+
+Every run writes a fresh version directory and switches the Lesson to it in
+one update, so a player never sees a half-written rendition set. The files
+are served through the lesson access check (see views.lesson_stream_file).
+"""
+
+import functools
+import json
+import math
+import os
+import posixpath
+import re
+import shutil
+import subprocess
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+HLS_ROOT = 'lesson_hls'
+MASTER_PLAYLIST = 'master.m3u8'
+POSTER_IMAGE = 'poster.jpg'
+SEGMENT_SECONDS = 6
+
+# (name, height, video bits/s, audio bits/s)
+HLS_RENDITIONS = (
+    ('360p', 360, 800_000, 96_000),
+    ('480p', 480, 1_400_000, 128_000),
+    ('720p', 720, 2_800_000, 128_000),
+    ('1080p', 1080, 5_000_000, 192_000),
+)
+
+HLS_CONTENT_TYPES = {
+    '.m3u8': 'application/vnd.apple.mpegurl',
+    '.ts': 'video/mp2t',
+    '.jpg': 'image/jpeg',
+}
+
+# Names a player may request from a rendition directory
+HLS_FILE_RE = re.compile(r'^[\w-]+\.(m3u8|ts|jpg)$')
+
+# hls.js for browsers without native HLS: the vendored copy when it is in
+# the static files, the same pinned release from the CDN otherwise
+HLS_JS_STATIC_PATH = 'js/vendor/hls.min.js'
+HLS_JS_CDN_URL = 'https://cdn.jsdelivr.net/npm/hls.js@1.5.15/dist/hls.min.js'
+
+
+class TranscodeError(Exception):
+    """ffmpeg/ffprobe failed or the upload is not a usable video"""
+
+
+@functools.lru_cache(maxsize=None)
+def hls_js_source():
+    """
+    Where the lesson page loads hls.js from.
+
+    Returns:
+        Tuple: (url, cross_origin) where cross_origin is True for the CDN copy
+    """
+    from django.contrib.staticfiles import finders
+    from django.templatetags.static import static
+
+    if finders.find(HLS_JS_STATIC_PATH):
+        return static(HLS_JS_STATIC_PATH), False
+    return HLS_JS_CDN_URL, True
+
+
+def _binary(name):
+    return getattr(settings, f'SKILLNEST_{name.upper()}_BINARY', name)
+
+
+def _run(args):
+    try:
+        return subprocess.run(args, check=True, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise TranscodeError(f'{args[0]} not found; install ffmpeg or set SKILLNEST_FFMPEG_BINARY')
+    except subprocess.CalledProcessError as exc:
+        raise TranscodeError((exc.stderr or '').strip()[-2000:] or f'{args[0]} exited with {exc.returncode}')
+
+
+def probe(path):
+    """
+    Read duration and frame size of a video with ffprobe.
+
+    Returns:
+        Dict: duration (seconds, float), width, height
+    """
+    result = _run([
+        _binary('ffprobe'), '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height:format=duration',
+        '-of', 'json', path,
+    ])
+    info = json.loads(result.stdout or '{}')
+    streams = info.get('streams') or []
+    if not streams or not streams[0].get('height'):
+        raise TranscodeError('The upload has no video stream')
+    try:
+        duration = float(info.get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        raise TranscodeError('Could not read the video duration')
+    return {'duration': duration, 'width': int(streams[0]['width']), 'height': int(streams[0]['height'])}
+
+
+def renditions_for(height):
+    """Renditions no taller than the source (always at least the smallest)"""
+    fitting = [rendition for rendition in HLS_RENDITIONS if rendition[1] <= height]
+    return fitting or [HLS_RENDITIONS[0]]
+
+
+def encode_rendition(source, out_dir, rendition):
+    name, height, video_rate, audio_rate = rendition
+    _run([
+        _binary('ffmpeg'), '-hide_banner', '-loglevel', 'error', '-y',
+        '-i', source,
+        '-map', '0:v:0', '-map', '0:a:0?',
+        '-vf', f'scale=-2:{height}',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-profile:v', 'main', '-pix_fmt', 'yuv420p',
+        '-b:v', str(video_rate), '-maxrate', str(video_rate * 107 // 100), '-bufsize', str(video_rate * 2),
+        # Keyframes on segment boundaries so every rendition switches cleanly
+        '-force_key_frames', f'expr:gte(t,n_forced*{SEGMENT_SECONDS})', '-sc_threshold', '0',
+        '-c:a', 'aac', '-b:a', str(audio_rate), '-ac', '2',
+        '-f', 'hls', '-hls_time', str(SEGMENT_SECONDS), '-hls_playlist_type', 'vod',
+        '-hls_segment_filename', os.path.join(out_dir, f'{name}_%03d.ts'),
+        os.path.join(out_dir, f'{name}.m3u8'),
+    ])
+
+
+def extract_poster(source, out_dir, duration):
+    _run([
+        _binary('ffmpeg'), '-hide_banner', '-loglevel', 'error', '-y',
+        '-ss', f'{min(1.0, duration / 2):.3f}', '-i', source,
+        '-frames:v', '1', '-vf', 'scale=-2:720', '-q:v', '3',
+        os.path.join(out_dir, POSTER_IMAGE),
+    ])
+
+
+def write_master_playlist(out_dir, renditions, width, height):
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3']
+    for name, rendition_height, video_rate, audio_rate in renditions:
+        rendition_width = int(round(width * rendition_height / height / 2)) * 2
+        lines.append(
+            f'#EXT-X-STREAM-INF:BANDWIDTH={video_rate + audio_rate},'
+            f'RESOLUTION={rendition_width}x{rendition_height}'
+        )
+        lines.append(f'{name}.m3u8')
+    with open(os.path.join(out_dir, MASTER_PLAYLIST), 'w') as playlist:
+        playlist.write('\n'.join(lines) + '\n')
+
+
+def claim_next_lesson():
+    """
+    Atomically move the oldest pending lesson to 'processing'.
+
+    Returns:
+        The claimed lesson id, or None when nothing is pending
+    """
+    from .models import Lesson
+
+    for lesson_id in Lesson.objects.filter(video_status='pending').order_by('id').values_list('id', flat=True)[:5]:
+        # Losing the race to another worker updates nothing; try the next one
+        if Lesson.objects.filter(pk=lesson_id, video_status='pending').update(video_status='processing', video_error=''):
+            return lesson_id
+    return None
+
+
+def transcode_lesson(lesson_id):
+    """
+    Build the HLS renditions and poster of a claimed lesson.
+
+    Results are only recorded if the lesson still has the same video_file;
+    a re-upload during the run leaves it 'pending' for the next pass.
+
+    Returns:
+        True when the lesson ended up 'ready' (False when it failed, was
+        re-uploaded or deleted meanwhile)
+    """
+    from .models import Lesson
+    from .lesson_navigation import invalidate_lesson_navigation
+
+    lesson = Lesson.objects.filter(pk=lesson_id).first()
+    if lesson is None:
+        # Deleted after it was claimed; nothing to record
+        return False
+    source_name = lesson.video_file.name
+    current = Lesson.objects.filter(pk=lesson_id, video_file=source_name, video_status='processing')
+
+    version_name = posixpath.join(HLS_ROOT, str(lesson_id), uuid.uuid4().hex[:8])
+    out_dir = default_storage.path(version_name)
+    try:
+        if not source_name:
+            raise TranscodeError('The lesson has no uploaded video')
+        source = lesson.video_file.path
+        info = probe(source)
+        renditions = renditions_for(info['height'])
+        os.makedirs(out_dir)
+        for rendition in renditions:
+            encode_rendition(source, out_dir, rendition)
+        extract_poster(source, out_dir, info['duration'])
+        write_master_playlist(out_dir, renditions, info['width'], info['height'])
+    except (TranscodeError, OSError) as exc:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        if current.update(video_status='failed', video_error=str(exc)):
+            # Nothing refers to earlier renditions of this lesson any more
+            delete_lesson_renditions(lesson_id)
+        return False
+
+    updated = current.update(
+        video_status='ready',
+        hls_playlist=posixpath.join(version_name, MASTER_PLAYLIST),
+        video_poster=posixpath.join(version_name, POSTER_IMAGE),
+        video_renditions=[
+            {'name': name, 'height': height, 'bandwidth': video_rate + audio_rate,
+             'playlist': posixpath.join(version_name, f'{name}.m3u8')}
+            for name, height, video_rate, audio_rate in renditions
+        ],
+        video_duration_seconds=info['duration'],
+        duration_minutes=max(1, math.ceil(info['duration'] / 60)),
+    )
+    if not updated:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        return False
+
+    delete_lesson_renditions(lesson_id, keep=posixpath.basename(version_name))
+    # duration_minutes is part of the cached navigation entries
+    invalidate_lesson_navigation(lesson.course_id)
+    return True
+
+
+def delete_lesson_renditions(lesson_id, keep=None):
+    """Remove a lesson's rendition directories, except the `keep` version"""
+    lesson_dir = default_storage.path(posixpath.join(HLS_ROOT, str(lesson_id)))
+    if not os.path.isdir(lesson_dir):
+        return
+    for version in os.listdir(lesson_dir):
+        if version != keep:
+            shutil.rmtree(os.path.join(lesson_dir, version), ignore_errors=True)
+    if keep is None:
+        shutil.rmtree(lesson_dir, ignore_errors=True)
@@ -0,0 +1,257 @@
+"""
+Chunked Video Uploads
+Large lesson videos are sent as a series of fixed-size chunks instead of one
+multipart POST, so no request holds a worker for minutes and an interrupted
+upload resumes where it stopped:
+
+    POST /uploads/videos/                          {filename, size} -> upload_id, chunk_size
+    PUT  /uploads/videos/<upload_id>/chunks/<n>/   raw bytes, X-Chunk-SHA256 header
+    GET  /uploads/videos/<upload_id>/              chunks received so far
+    POST /uploads/videos/<upload_id>/complete/     {checksum[, chunk_checksums, lesson_id]}
+
+The destination file is created at full size under the Lesson.video_file
+upload directory when the upload starts, and every chunk is written straight
+to its offset in it. Received chunks are tracked in a bitmap on the
+VideoUpload row, next to the SHA-256 digest each chunk was verified with.
+The completion checksum is the SHA-256 of the concatenated per-chunk
+digests (computable by a browser without holding the whole file), so it is
+checked against the stored digests without reading the file again. Only
+then can the upload be attached to a lesson, which points video_file at the
+file.
+"""
+
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .skill_vectors import to_bytes
+
+CHUNK_SIZE = 8 * 1024 * 1024
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024 * 1024
+COPY_BUFFER_SIZE = 256 * 1024
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+class UploadError(Exception):
+    """The client sent something the upload cannot accept"""
+
+
+def chunk_length(upload, index):
+    """Bytes expected for chunk `index` (the last one may be short)"""
+    return min(upload.chunk_size, upload.size - index * upload.chunk_size)
+
+
+def start_upload(owner, filename, size):
+    """
+    Reserve the destination file and open an upload session.
+
+    Args:
+        owner: User uploading
+        filename: Client-side file name
+        size: Total size in bytes
+
+    Returns:
+        VideoUpload object
+    """
+    from .models import Lesson, VideoUpload
+
+    if not filename:
+        raise UploadError('filename is required')
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError('size must be a positive number of bytes')
+    if size > MAX_UPLOAD_SIZE:
+        raise UploadError(f'Videos are limited to {MAX_UPLOAD_SIZE // (1024 * 1024)} MB')
+
+    video_field = Lesson._meta.get_field('video_file')
+    name = video_field.generate_filename(None, os.path.basename(filename))
+    path = None
+    for _ in range(5):
+        name = default_storage.get_available_name(name, max_length=video_field.max_length)
+        path = default_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            # 'x' claims the name even if another upload picked it concurrently
+            with open(path, 'xb') as destination:
+                destination.truncate(size)
+            break
+        except FileExistsError:
+            continue
+    else:
+        raise UploadError('Could not reserve a file name, please retry')
+
+    return VideoUpload.objects.create(
+        owner=owner,
+        filename=os.path.basename(filename)[:255],
+        storage_name=name,
+        size=size,
+        chunk_size=CHUNK_SIZE,
+    )
+
+
+def write_chunk(upload, index, stream, content_length, expected_sha256):
+    """
+    Stream one chunk from `stream` into its offset of the destination file.
+
+    The chunk only counts as received if its length and SHA-256 match; a
+    bad chunk can simply be sent again. The bytes are written in place as
+    they arrive, so a rejected chunk also forgets any earlier copy of it
+    (its bit and digest) that the write may have overwritten.
+
+    Returns:
+        Number of chunks received so far
+    """
+    if upload.status != 'uploading':
+        raise UploadError('This upload is already complete')
+    if not 0 <= index < upload.chunk_count:
+        raise UploadError(f'Chunk index must be between 0 and {upload.chunk_count - 1}')
+    expected_length = chunk_length(upload, index)
+    if content_length != expected_length:
+        raise UploadError(f'Chunk {index} must be {expected_length} bytes, got {content_length}')
+    if not expected_sha256:
+        raise UploadError('The X-Chunk-SHA256 header is required')
+
+    digest = hashlib.sha256()
+    remaining = expected_length
+    try:
+        with open(default_storage.path(upload.storage_name), 'r+b') as destination:
+            destination.seek(index * upload.chunk_size)
+            while remaining:
+                data = stream.read(min(COPY_BUFFER_SIZE, remaining))
+                if not data:
+                    break
+                destination.write(data)
+                digest.update(data)
+                remaining -= len(data)
+    except OSError:
+        # e.g. the client went away mid-chunk
+        _record_chunk(upload, index, None)
+        raise
+    if remaining:
+        _record_chunk(upload, index, None)
+        raise UploadError(f'Chunk {index} ended {remaining} bytes early')
+    if digest.hexdigest() != expected_sha256.lower():
+        _record_chunk(upload, index, None)
+        raise UploadError(f'Chunk {index} checksum mismatch')
+    return _record_chunk(upload, index, digest.digest())
+
+
+def _record_chunk(upload, index, digest):
+    """
+    Mark chunk `index` received with `digest`, or missing when digest is None.
+
+    Returns:
+        Number of chunks received so far
+    """
+    from .models import VideoUpload
+
+    with transaction.atomic():
+        locked = VideoUpload.objects.select_for_update().get(pk=upload.pk)
+        digests = bytearray(locked.chunk_digests).ljust(locked.chunk_count * DIGEST_SIZE, b'\0')
+        digests[index * DIGEST_SIZE:(index + 1) * DIGEST_SIZE] = digest or bytes(DIGEST_SIZE)
+        locked.chunk_digests = bytes(digests)
+        if digest is None:
+            locked.received_chunks = to_bytes(locked.received_bits & ~(1 << index))
+        else:
+            locked.received_chunks = to_bytes(locked.received_bits | 1 << index)
+        locked.save(update_fields=['received_chunks', 'chunk_digests'])
+    return locked.received_count
+
+
+def chunk_digest_list(upload):
+    """The stored per-chunk digests in chunk order (None where unknown)"""
+    digests = bytes(upload.chunk_digests).ljust(upload.chunk_count * DIGEST_SIZE, b'\0')
+    unknown = bytes(DIGEST_SIZE)
+    return [
+        None if digest == unknown else digest
+        for digest in (digests[i:i + DIGEST_SIZE] for i in range(0, len(digests), DIGEST_SIZE))
+    ]
+
+
+def complete_upload(upload, checksum, chunk_checksums=None):
+    """
+    Verify the upload against the client's checksum and mark it complete.
+
+    Args:
+        upload: VideoUpload with every chunk received
+        checksum: Hex SHA-256 over the client's per-chunk digests
+        chunk_checksums: Optional list of the client's per-chunk hex digests.
+                         On a mismatch only the chunks that differ from it are
+                         forgotten and have to be sent again; without it every
+                         chunk is.
+    """
+    from .models import VideoUpload
+
+    if upload.status == 'complete':
+        return upload
+    missing = upload.missing_chunks()
+    if missing:
+        raise UploadError(f'{len(missing)} chunk(s) still missing, e.g. {missing[0]}')
+    if not checksum:
+        raise UploadError('checksum is required')
+
+    stored = chunk_digest_list(upload)
+    if None in stored or hashlib.sha256(b''.join(stored)).hexdigest() != checksum.lower():
+        bits = 0
+        if chunk_checksums is not None:
+            if not isinstance(chunk_checksums, list) or len(chunk_checksums) != upload.chunk_count:
+                raise UploadError(f'chunk_checksums must list {upload.chunk_count} digests')
+            bits = upload.received_bits
+            for index, digest in enumerate(stored):
+                if digest is None or digest.hex() != str(chunk_checksums[index]).lower():
+                    bits &= ~(1 << index)
+        with transaction.atomic():
+            locked = VideoUpload.objects.select_for_update().get(pk=upload.pk)
+            locked.received_chunks = to_bytes(locked.received_bits & bits)
+            locked.save(update_fields=['received_chunks'])
+        resend = upload.chunk_count - bin(bits).count('1')
+        raise UploadError(f'Checksum mismatch; {resend} chunk(s) have to be uploaded again')
+
+    upload.status = 'complete'
+    upload.completed_at = timezone.now()
+    VideoUpload.objects.filter(pk=upload.pk).update(status=upload.status, completed_at=upload.completed_at)
+    return upload
+
+
+def attach_upload(upload, lesson):
+    """
+    Point `lesson.video_file` at a completed upload's file (no copy) and
+    close the upload session. Saving queues the lesson for transcoding.
+    """
+    if upload.status != 'complete':
+        raise UploadError('The upload is not complete yet')
+    previous = lesson.video_file.name
+    lesson.video_file = upload.storage_name
+    lesson.save()
+    upload.delete()
+    if previous and previous != upload.storage_name:
+        transaction.on_commit(lambda: _delete_unused_video(previous))
+    return lesson
+
+
+def _delete_unused_video(name):
+    """Remove a replaced video file unless another lesson still points at it"""
+    from .models import Lesson
+
+    if not Lesson.objects.filter(video_file=name).exists():
+        default_storage.delete(name)
+
+
+def purge_stale_uploads(older_than):
+    """
+    Delete uploads started before `older_than` that were never attached to
+    a lesson, together with their files.
+
+    Returns:
+        Number of uploads removed
+    """
+    from .models import VideoUpload
+
+    removed = 0
+    for upload in VideoUpload.objects.filter(created_at__lt=older_than):
+        default_storage.delete(upload.storage_name)
+        upload.delete()
+        removed += 1
+    return removed
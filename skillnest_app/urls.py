@@ -21,6 +21,8 @@ urlpatterns = [
     path('courses/<int:course_id>/', views.course_detail, name='course_detail'),
     path('courses/<int:course_id>/lesson/<int:lesson_id>/', views.watch_lesson, name='watch_lesson'),
     path('courses/<int:course_id>/enroll/', views.enroll_course, name='enroll_course'),
+    path('lessons/<int:lesson_id>/video/', views.lesson_video, name='lesson_video'),
+    path('lessons/<int:lesson_id>/stream/<str:name>', views.lesson_stream_file, name='lesson_stream_file'),
     path('lessons/<int:lesson_id>/complete/', views.mark_lesson_complete, name='mark_lesson_complete'),
     
     # Certificates
@@ -72,6 +74,12 @@ urlpatterns += [
     path('teacher/course/<int:course_id>/lesson/add/', views.teacher_add_lesson, name='teacher_add_lesson'),
     path('teacher/lesson/<int:lesson_id>/edit/', views.teacher_edit_lesson, name='teacher_edit_lesson'),
     path('teacher/lesson/<int:lesson_id>/delete/', views.teacher_delete_lesson, name='teacher_delete_lesson'),
+    
+    # Chunked video uploads
+    path('uploads/videos/', views.video_upload_start, name='video_upload_start'),
+    path('uploads/videos/<uuid:upload_id>/', views.video_upload_status, name='video_upload_status'),
+    path('uploads/videos/<uuid:upload_id>/chunks/<int:index>/', views.video_upload_chunk, name='video_upload_chunk'),
+    path('uploads/videos/<uuid:upload_id>/complete/', views.video_upload_complete, name='video_upload_complete'),
     path('teacher/course/management/', views.teacher_course_management, name='teacher_course_management'),
 ]
 
@@ -99,6 +107,7 @@ urlpatterns += [
     path('admin-panel/jobs/<int:job_id>/edit/', views.admin_edit_job, name='admin_edit_job'),
     path('admin-panel/jobs/<int:job_id>/delete/', views.admin_delete_job, name='admin_delete_job'),
     path('admin-panel/jobs/<int:job_id>/toggle-status/', views.admin_toggle_job_status, name='admin_toggle_job_status'),
+    path('admin-panel/jobs/<int:job_id>/candidates/', views.admin_job_candidates, name='admin_job_candidates'),
     
     # Skill Management
     path('admin-panel/skills/', views.admin_skills, name='admin_skills'),
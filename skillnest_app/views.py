@@ -3,20 +3,34 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.db.models import Q, Count, F
 from django.views.decorators.http import require_http_methods
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, Http404
 from django.template.loader import render_to_string
-from datetime import datetime, timedelta
 import hashlib
-import uuid
-from django.templatetags.static import static
+import json
+from django.urls import reverse
 
 from .models import (
     UserProfile, Course, Enrollment, Skill, Certificate,
-    Lesson, StudentSkill, Job, JobRecommendation, CareerPath
+    Lesson, StudentSkill, Job, JobRecommendation, CareerPath, VideoUpload
 )
-from .recommendations import get_job_recommendations, calculate_match_score
+from .recommendations import (
+    generate_recommendations_for_user, recommendations_are_fresh,
+    get_job_candidates, load_user_skills, get_job_listing, JOB_SORTS,
+)
+from .scoring import get_match_scoring
+from .services import complete_lesson
+from .lesson_navigation import get_lesson_navigation
+from .pagination import keyset_paginate
+from .search import search_courses
+from .job_search import JobQuery, search_jobs
+from .stats import get_platform_stats
+from .home_cache import get_home_stats, get_featured_courses_html
+from .streaming import serve_file, serve_media
+from .uploads import UploadError, start_upload, write_chunk, complete_upload, attach_upload
+from .transcoding import MASTER_PLAYLIST, POSTER_IMAGE, HLS_CONTENT_TYPES, HLS_FILE_RE, hls_js_source
 from .decorators import teacher_required
 from .forms import CourseCreateForm
 from .forms import LessonForm
@@ -32,18 +46,11 @@ def home(request):
         elif request.user.profile.role == 'teacher':
             return redirect('dashboard')
     
-    featured_courses = Course.objects.all()[:6]
-    categories = Course.CATEGORY_CHOICES
-    skills_count = Skill.objects.count()
-    courses_count = Course.objects.count()
-    total_students = User.objects.filter(profile__role='student').count()
-    
+    # Counters and course cards come from the cache (see home_cache.py)
     context = {
-        'trending_courses': featured_courses,
-        'categories': categories,
-        'skills_count': skills_count,
-        'courses_count': courses_count,
-        'total_students': total_students,
+        'featured_courses_html': get_featured_courses_html(),
+        'categories': Course.CATEGORY_CHOICES,
+        **get_home_stats(),
     }
     return render(request, 'skillnest_app/home_merged.html', context)
 
@@ -159,7 +166,7 @@ def profile(request):
     teacher_context = {}
     if profile.role == 'teacher':
         courses = Course.objects.filter(instructor=user)
-        total_lessons = sum(course.lessons.count() for course in courses)
+        total_lessons = sum(course.lesson_count for course in courses)
         total_students = Enrollment.objects.filter(course__instructor=user).count()
         teacher_context = {
             'total_lessons': total_lessons,
@@ -193,7 +200,7 @@ def dashboard(request):
         role = profile.role
     
     if role == 'student':
-        enrollments = Enrollment.objects.filter(user=user)
+        enrollments = Enrollment.objects.filter(user=user).select_related('course')
         certificates = Certificate.objects.filter(user=user)
         skills = StudentSkill.objects.filter(user=user)
         
@@ -277,13 +284,18 @@ def teacher_create_course(request):
             title = form.cleaned_data.get('initial_lesson_title')
             video_file = form.cleaned_data.get('initial_lesson_video_file')
             video_url = form.cleaned_data.get('initial_lesson_video_url') if 'initial_lesson_video_url' in form.cleaned_data else None
-            if title or video_file or video_url:
-                Lesson.objects.create(
+            upload = _completed_upload(request.user, form.cleaned_data.get('initial_lesson_video_upload'))
+            if title or video_file or video_url or upload:
+                lesson = Lesson(
                     course=course,
                     title=title or 'Introduction',
                     video_file=video_file if video_file else None,
-                    video_url=video_url if not video_file else None,
+                    video_url=video_url if not (video_file or upload) else None,
                 )
+                if upload:
+                    attach_upload(upload, lesson)
+                else:
+                    lesson.save()
 
             messages.success(request, 'Course created successfully.')
             return redirect('dashboard')
@@ -339,7 +351,7 @@ def teacher_add_lesson(request, course_id):
         if form.is_valid():
             lesson = form.save(commit=False)
             lesson.course = course
-            lesson.save()
+            _save_lesson_with_upload(request, form, lesson)
             messages.success(request, 'Lesson added.')
             return redirect('dashboard')
     else:
@@ -357,7 +369,7 @@ def teacher_edit_lesson(request, lesson_id):
     if request.method == 'POST':
         form = LessonForm(request.POST, request.FILES, instance=lesson)
         if form.is_valid():
-            form.save()
+            _save_lesson_with_upload(request, form, form.save(commit=False))
             messages.success(request, 'Lesson updated.')
             return redirect('dashboard')
     else:
@@ -365,6 +377,86 @@ def teacher_edit_lesson(request, lesson_id):
     return render(request, 'skillnest_app/lesson_form_merged.html', {'form': form, 'course': lesson.course, 'action': 'Edit'})
 
 
+def _completed_upload(user, upload_id):
+    """The user's completed chunked upload with this id, or None"""
+    if not upload_id:
+        return None
+    return VideoUpload.objects.filter(upload_id=upload_id, owner=user, status='complete').first()
+
+
+def _save_lesson_with_upload(request, form, lesson):
+    """Save a LessonForm's lesson, attaching its chunked upload (if any) as the video"""
+    upload = _completed_upload(request.user, form.cleaned_data.get('video_upload'))
+    if upload:
+        attach_upload(upload, lesson)
+    else:
+        lesson.save()
+
+
+# Chunked video uploads (JSON API, see uploads.py)
+def _upload_state(upload):
+    return {
+        'upload_id': str(upload.upload_id),
+        'filename': upload.filename,
+        'size': upload.size,
+        'chunk_size': upload.chunk_size,
+        'chunk_count': upload.chunk_count,
+        'received_count': upload.received_count,
+        'missing_chunks': upload.missing_chunks(),
+        'status': upload.status,
+    }
+
+
+@teacher_required
+@require_http_methods(["POST"])
+def video_upload_start(request):
+    """Open a chunked upload: {filename, size} -> upload_id, chunk_size, chunk_count"""
+    try:
+        payload = json.loads(request.body or b'{}')
+        upload = start_upload(request.user, payload.get('filename'), payload.get('size'))
+    except (ValueError, UploadError) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse(_upload_state(upload), status=201)
+
+
+@teacher_required
+@require_http_methods(["GET"])
+def video_upload_status(request, upload_id):
+    """Chunks received so far, for resuming an interrupted upload"""
+    upload = get_object_or_404(VideoUpload, upload_id=upload_id, owner=request.user)
+    return JsonResponse(_upload_state(upload))
+
+
+@teacher_required
+@require_http_methods(["PUT"])
+def video_upload_chunk(request, upload_id, index):
+    """Write one chunk (raw request body, X-Chunk-SHA256 header) at its offset"""
+    upload = get_object_or_404(VideoUpload, upload_id=upload_id, owner=request.user)
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        received_count = write_chunk(upload, index, request, content_length, request.headers.get('X-Chunk-SHA256'))
+    except (ValueError, UploadError) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse({'index': index, 'received_count': received_count, 'chunk_count': upload.chunk_count})
+
+
+@teacher_required
+@require_http_methods(["POST"])
+def video_upload_complete(request, upload_id):
+    """Verify the checksum (and chunk_checksums); with lesson_id, also attach the video to that lesson"""
+    upload = get_object_or_404(VideoUpload, upload_id=upload_id, owner=request.user)
+    try:
+        payload = json.loads(request.body or b'{}')
+        complete_upload(upload, payload.get('checksum'), payload.get('chunk_checksums'))
+        if payload.get('lesson_id'):
+            lesson = get_object_or_404(Lesson, pk=payload['lesson_id'], course__instructor=request.user)
+            attach_upload(upload, lesson)
+            return JsonResponse({'upload_id': str(upload_id), 'status': 'attached', 'lesson_id': lesson.id})
+    except (ValueError, UploadError) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse(_upload_state(upload))
+
+
 @teacher_required
 def teacher_delete_lesson(request, lesson_id):
     lesson = get_object_or_404(Lesson, pk=lesson_id)
@@ -399,34 +491,17 @@ def teacher_course_management(request):
 
 
 # ==================== COURSES ====================
+COURSES_PER_PAGE = 12
+
+
 def courses(request):
-    """List all courses with filters"""
-    courses_list = Course.objects.all()
-    # Provide a deterministic fallback image per instructor using images/pic-1..pic-9.jpg
-    fallback_names = [f'images/pic-{i}.jpg' for i in range(1, 10)]
-    total = len(fallback_names) or 1
-    for course in courses_list:
-        instructor = getattr(course, 'instructor', None)
-        # choose index from instructor id if available, else from username hash
-        try:
-            if instructor and getattr(instructor, 'id', None) is not None:
-                key = int(instructor.id)
-            elif instructor and getattr(instructor, 'username', None):
-                key = abs(hash(instructor.username))
-            else:
-                key = id(course)
-            idx = int(key) % total
-            course.fallback_image = static(fallback_names[idx])
-        except Exception:
-            course.fallback_image = static('images/pic-2.jpg')
-    
-    # Search
-    search_query = request.GET.get('search', '')
-    if search_query:
-        courses_list = courses_list.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+    """
+    List courses with filters, newest first, one keyset page at a time.
+    With a search query the full-text matches are listed best first instead,
+    each with a highlighted excerpt.
+    """
+    courses_list = Course.objects.select_related('instructor__profile')
+    search_query = request.GET.get('search', '').strip()
     
     # Filter by category
     category = request.GET.get('category', '')
@@ -438,8 +513,33 @@ def courses(request):
     if level:
         courses_list = courses_list.filter(level=level)
     
+    if search_query:
+        # Ranked hits, narrowed down by the other filters inside the search
+        # query (before its result limit), paged by position
+        filters = {field: value for field, value in (('category', category), ('level', level)) if value}
+        hits = search_courses(search_query, filters=filters)
+        matches = courses_list.in_bulk([hit.course_id for hit in hits])
+        ranked = []
+        for hit in hits:
+            course = matches.get(hit.course_id)
+            if course is not None:
+                course.search_snippet = hit.snippet
+                ranked.append(course)
+        page = Paginator(ranked, COURSES_PER_PAGE).get_page(request.GET.get('page'))
+    else:
+        page = keyset_paginate(
+            courses_list, ('created_at', 'id'), COURSES_PER_PAGE,
+            after=request.GET.get('after'), before=request.GET.get('before'),
+        )
+    # Filters carried over to the next/previous page links
+    filter_query = request.GET.copy()
+    for key in ('after', 'before', 'page'):
+        filter_query.pop(key, None)
+    
     context = {
-        'courses': courses_list,
+        'courses': page,
+        'page': page,
+        'filter_query': filter_query.urlencode(),
         'categories': Course.CATEGORY_CHOICES,
         'levels': Course.LEVEL_CHOICES,
         'search_query': search_query,
@@ -452,11 +552,11 @@ def courses(request):
 def course_detail(request, course_id):
     """Course detail page"""
     course = get_object_or_404(Course, pk=course_id)
-    lessons = course.lessons.all()
+    lessons = get_lesson_navigation(course.id)
     skills = course.skills.all()
     enrollment = None
     is_enrolled = False
-    # Handle POST actions from the course detail page: enroll or mark lesson complete
+    # Handle POST actions from the course detail page: enroll or save playlist
     if request.method == 'POST':
         # Enroll action (form with name 'enroll')
         if request.POST.get('enroll') is not None:
@@ -475,39 +575,6 @@ def course_detail(request, course_id):
         if request.POST.get('save_playlist') is not None:
             messages.info(request, 'Course saving feature coming soon!')
             return redirect('course_detail', course_id=course_id)
-            if not request.user.is_authenticated:
-                messages.error(request, 'Please login to mark lessons as complete.')
-                return redirect('login')
-            lesson_id = request.POST.get('mark_complete')
-            try:
-                lesson = Lesson.objects.get(pk=int(lesson_id))
-            except Exception:
-                messages.error(request, 'Invalid lesson.')
-                return redirect('course_detail', course_id=course_id)
-
-            try:
-                enrollment = Enrollment.objects.get(user=request.user, course=lesson.course)
-            except Enrollment.DoesNotExist:
-                messages.error(request, 'You need to enroll in the course before marking lessons complete.')
-                return redirect('course_detail', course_id=course_id)
-
-            enrollment.completed_lessons.add(lesson)
-            enrollment.update_progress()
-
-            # If course completed, set status, award skills and certificate
-            if enrollment.progress_percent >= 100:
-                enrollment.status = 'completed'
-                enrollment.completed_date = datetime.now()
-                enrollment.save()
-                for skill in lesson.course.skills.all():
-                    StudentSkill.objects.get_or_create(user=request.user, skill=skill)
-                certificate_code = str(uuid.uuid4())[:8].upper()
-                Certificate.objects.create(user=request.user, course=lesson.course, certificate_code=certificate_code)
-                messages.success(request, f'Congratulations! You completed {lesson.course.title}! Certificate awarded.')
-            else:
-                messages.success(request, f'Lesson "{lesson.title}" marked as complete.')
-
-            return redirect('course_detail', course_id=course_id)
 
     if request.user.is_authenticated:
         enrollment = Enrollment.objects.filter(user=request.user, course=course).first()
@@ -517,12 +584,11 @@ def course_detail(request, course_id):
         # Calculate progress variables
         if enrollment:
             progress_percentage = enrollment.progress_percent
-            completed_lessons = enrollment.completed_lessons.count()
-            total_lessons = course.lessons.count()
+            completed_lessons = enrollment.completed_count
         else:
             progress_percentage = 0
             completed_lessons = 0
-            total_lessons = course.lessons.count()
+        total_lessons = course.lesson_count
         
         # Check if course is saved by user (placeholder for future implementation)
         is_saved = False  # TODO: Implement course saving functionality
@@ -530,7 +596,7 @@ def course_detail(request, course_id):
         is_instructor = False
         progress_percentage = 0
         completed_lessons = 0
-        total_lessons = course.lessons.count()
+        total_lessons = course.lesson_count
         is_saved = False
     
     context = {
@@ -551,12 +617,12 @@ def course_detail(request, course_id):
 @login_required
 def watch_lesson(request, course_id, lesson_id):
     """Lesson watching page with video player and completion button"""
-    course = get_object_or_404(Course, pk=course_id)
-    lesson = get_object_or_404(Lesson, pk=lesson_id, course=course)
+    lesson = get_object_or_404(Lesson.objects.select_related('course'), pk=lesson_id, course_id=course_id)
+    course = lesson.course
     
     # Check if user is enrolled
     try:
-        enrollment = Enrollment.objects.get(user=request.user, course=course)
+        enrollment = Enrollment.objects.get(user=request.user, course_id=course_id)
         is_enrolled = True
     except Enrollment.DoesNotExist:
         messages.error(request, 'You need to enroll in this course to watch lessons.')
@@ -564,50 +630,44 @@ def watch_lesson(request, course_id, lesson_id):
     
     # Handle lesson completion
     if request.method == 'POST' and request.POST.get('mark_complete'):
-        if lesson not in enrollment.completed_lessons.all():
-            enrollment.completed_lessons.add(lesson)
-            enrollment.update_progress()
-            
-            # Check if course is completed
-            if enrollment.progress_percent >= 100:
-                enrollment.status = 'completed'
-                enrollment.completed_date = datetime.now()
-                enrollment.save()
-                
-                # Award skills and certificate
-                for skill in course.skills.all():
-                    StudentSkill.objects.get_or_create(user=request.user, skill=skill)
-                certificate_code = str(uuid.uuid4())[:8].upper()
-                Certificate.objects.create(user=request.user, course=course, certificate_code=certificate_code)
-                messages.success(request, f'Congratulations! You completed {course.title}! Certificate awarded.')
-            else:
-                messages.success(request, f'Lesson "{lesson.title}" marked as complete.')
+        result = complete_lesson(request.user, lesson)
+        if result['newly_completed']:
+            _lesson_completed_message(request, lesson, result)
         
         return redirect('course_detail', course_id=course_id)
     
-    # Check if lesson is already completed
-    is_completed = lesson in enrollment.completed_lessons.all()
+    # Completion state comes from the enrollment's lesson bitmap, not the M2M table
+    is_completed = enrollment.has_completed(lesson)
     
     # Calculate progress variables for the template
     progress_percentage = enrollment.progress_percent
-    completed_lessons = enrollment.completed_lessons.count()
-    total_lessons = course.lessons.count()
-    
-    # Calculate current lesson number
-    current_lesson_number = list(course.lessons.order_by('id')).index(lesson) + 1
-    
-    # Get completed lesson IDs for the sidebar
-    completed_lesson_ids = [lesson.id for lesson in enrollment.completed_lessons.all()]
-    
-    # Get previous and next lessons
-    lessons_list = list(course.lessons.order_by('id'))
-    lesson_index = lessons_list.index(lesson)
-    previous_lesson = lessons_list[lesson_index - 1] if lesson_index > 0 else None
-    next_lesson = lessons_list[lesson_index + 1] if lesson_index < len(lessons_list) - 1 else None
+    completed_lessons = enrollment.completed_count
+    
+    # Lesson number, previous/next and the sidebar all come from the cached
+    # navigation index (in the course's display order); completion flags
+    # come from the enrollment's lesson bitmap
+    navigation = get_lesson_navigation(course_id, lesson.id)
+    if lesson.id not in navigation:
+        raise Http404('Lesson not found.')
+    total_lessons = len(navigation)
+    current_lesson_number = navigation.number(lesson.id)
+    previous_lesson = navigation.previous(lesson.id)
+    next_lesson = navigation.next(lesson.id)
+    course_lessons = navigation.entries
+    completed_lesson_ids = navigation.completed_ids(enrollment)
     
     # Calculate SVG stroke-dasharray for circular progress (339 is circumference)
     progress_stroke_dasharray = progress_percentage * 3.39
     
+    # Adaptive stream once the transcoding worker has finished; the original
+    # upload stays as the fallback source until then
+    hls_url = poster_url = hls_js_url = None
+    hls_js_cross_origin = False
+    if lesson.video_file and lesson.video_status == 'ready':
+        hls_url = reverse('lesson_stream_file', args=[lesson.id, MASTER_PLAYLIST])
+        poster_url = reverse('lesson_stream_file', args=[lesson.id, POSTER_IMAGE])
+        hls_js_url, hls_js_cross_origin = hls_js_source()
+    
     context = {
         'course': course,
         'lesson': lesson,
@@ -617,14 +677,64 @@ def watch_lesson(request, course_id, lesson_id):
         'completed_lessons': completed_lessons,
         'total_lessons': total_lessons,
         'current_lesson_number': current_lesson_number,
+        'course_lessons': course_lessons,
         'completed_lesson_ids': completed_lesson_ids,
         'previous_lesson': previous_lesson,
         'next_lesson': next_lesson,
         'progress_stroke_dasharray': progress_stroke_dasharray,
+        'hls_url': hls_url,
+        'hls_js_url': hls_js_url,
+        'hls_js_cross_origin': hls_js_cross_origin,
+        'poster_url': poster_url,
     }
     return render(request, 'skillnest_app/watch_lesson.html', context)
 
 
+@login_required(login_url='login')
+def lesson_video(request, lesson_id):
+    """
+    Stream a lesson's uploaded video with HTTP Range support.
+
+    Only enrolled students, the course instructor and admins may watch it.
+    """
+    lesson = get_object_or_404(Lesson.objects.select_related('course'), pk=lesson_id)
+    if not lesson.video_file:
+        raise Http404('This lesson has no uploaded video.')
+    if not _can_watch_lesson(request.user, lesson):
+        return HttpResponse('You need to enroll in this course to watch lessons.', status=403)
+    
+    try:
+        return serve_file(request, lesson.video_file)
+    except FileNotFoundError:
+        raise Http404('Video file not found.')
+
+
+@login_required(login_url='login')
+def lesson_stream_file(request, lesson_id, name):
+    """Serve a lesson's HLS playlists, segments and poster (same access rules as lesson_video)"""
+    lesson = get_object_or_404(Lesson.objects.select_related('course'), pk=lesson_id)
+    match = HLS_FILE_RE.match(name)
+    if lesson.video_status != 'ready' or not lesson.hls_playlist or not match:
+        raise Http404('Stream not available.')
+    if not _can_watch_lesson(request.user, lesson):
+        return HttpResponse('You need to enroll in this course to watch lessons.', status=403)
+    
+    stream_dir = lesson.hls_playlist.rsplit('/', 1)[0]
+    try:
+        return serve_media(request, f'{stream_dir}/{name}', HLS_CONTENT_TYPES['.' + match.group(1)])
+    except FileNotFoundError:
+        raise Http404('Stream file not found.')
+
+
+def _can_watch_lesson(user, lesson):
+    """Enrolled students, the course instructor and admins may watch a lesson's videos"""
+    if hasattr(user, 'profile') and user.profile.role == 'admin':
+        return True
+    if lesson.course.instructor_id == user.id:
+        return True
+    return Enrollment.objects.filter(user=user, course_id=lesson.course_id).exists()
+
+
 @login_required(login_url='login')
 def enroll_course(request, course_id):
     """Enroll a student in a course"""
@@ -646,38 +756,22 @@ def enroll_course(request, course_id):
 @login_required(login_url='login')
 def mark_lesson_complete(request, lesson_id):
     """Mark a lesson as completed"""
-    lesson = get_object_or_404(Lesson, pk=lesson_id)
-    user = request.user
+    lesson = get_object_or_404(Lesson.objects.select_related('course'), pk=lesson_id)
     
-    enrollment = get_object_or_404(Enrollment, user=user, course=lesson.course)
-    
-    # Add lesson to completed
-    enrollment.completed_lessons.add(lesson)
-    enrollment.update_progress()
+    try:
+        result = complete_lesson(request.user, lesson)
+    except Enrollment.DoesNotExist:
+        raise Http404('You are not enrolled in this course.')
+    _lesson_completed_message(request, lesson, result)
     
-    # Check if course is completed (100%)
-    if enrollment.progress_percent >= 100:
-        enrollment.status = 'completed'
-        enrollment.completed_date = datetime.now()
-        enrollment.save()
-        
-        # Award skills from course
-        for skill in lesson.course.skills.all():
-            StudentSkill.objects.get_or_create(user=user, skill=skill)
-        
-        # Create certificate
-        certificate_code = str(uuid.uuid4())[:8].upper()
-        Certificate.objects.create(
-            user=user,
-            course=lesson.course,
-            certificate_code=certificate_code
-        )
-        
+    return redirect('course_detail', course_id=lesson.course_id)
+
+
+def _lesson_completed_message(request, lesson, result):
+    if result['course_completed']:
         messages.success(request, f'Congratulations! You completed {lesson.course.title}! Certificate awarded.')
     else:
         messages.success(request, f'Lesson "{lesson.title}" marked as complete.')
-    
-    return redirect('course_detail', course_id=lesson.course.id)
 
 
 # ==================== PORTFOLIO ====================
@@ -745,32 +839,35 @@ def certificate_view(request, certificate_id):
 
 # ==================== JOBS ====================
 def jobs(request):
-    """List all job openings"""
-    jobs_list = Job.objects.filter(is_active=True)
-    
-    # Search
-    search_query = request.GET.get('search', '')
-    if search_query:
-        jobs_list = jobs_list.filter(
-            Q(job_title__icontains=search_query) |
-            Q(company_name__icontains=search_query) |
-            Q(location__icontains=search_query)
-        )
-    
-    # Calculate match score for authenticated users
-    if request.user.is_authenticated:
-        user_skills = set(StudentSkill.objects.filter(user=request.user).values_list('skill_id', flat=True))
-        for job in jobs_list:
-            required_skills = set(job.skills_required.values_list('id', flat=True))
-            if required_skills:
-                matched = len(user_skills & required_skills)
-                job.match_percent = (matched / len(required_skills)) * 100
-            else:
-                job.match_percent = 0
+    """
+    List open job postings with facet filters (type, location, salary,
+    skills), a page at a time, newest first or by match score
+    """
+    query = JobQuery.from_params(request.GET)
+    result = search_jobs(query)
+    
+    sort = request.GET.get('sort', 'newest')
+    if sort not in JOB_SORTS:
+        sort = 'newest'
+    page = get_job_listing(
+        result.job_ids,
+        user=request.user if request.user.is_authenticated else None,
+        sort=sort,
+        page_number=request.GET.get('page'),
+    )
+    # Search, filters and sort carried over to the page links
+    filter_query = request.GET.copy()
+    filter_query.pop('page', None)
     
     context = {
-        'jobs': jobs_list,
-        'search_query': search_query,
+        'jobs': page.object_list,
+        'page': page,
+        'filter_query': filter_query.urlencode(),
+        'search_query': query.text,
+        'query': query,
+        'facets': result.facets,
+        'total_jobs': result.total,
+        'sort': sort,
     }
     return render(request, 'skillnest_app/jobs_merged.html', context)
 
@@ -782,11 +879,9 @@ def job_detail(request, job_id):
     
     match_percent = 0
     if request.user.is_authenticated:
-        user_skills = set(StudentSkill.objects.filter(user=request.user).values_list('skill_id', flat=True))
-        required_skill_ids = set(required_skills.values_list('id', flat=True))
-        if required_skill_ids:
-            matched = len(user_skills & required_skill_ids)
-            match_percent = (matched / len(required_skill_ids)) * 100
+        user_skills = load_user_skills(request.user.pk)
+        required_skill_ids = frozenset(required_skills.values_list('id', flat=True))
+        match_percent = get_match_scoring().score(user_skills, required_skill_ids)[0] * 100
     
     context = {
         'job': job,
@@ -803,29 +898,32 @@ def recommended_jobs(request):
     """Get AI-powered job recommendations"""
     user = request.user
     
-    # Get user's skills
-    user_skills = StudentSkill.objects.filter(user=user).values_list('skill_id', flat=True)
+    # Stored rows are kept current by the incremental refresh; rescore live
+    # only when the user's skills changed since they were computed
+    if not recommendations_are_fresh(user.profile):
+        generate_recommendations_for_user(user)
     
-    recommendations = []
+    stored = (
+        JobRecommendation.objects.filter(user=user)
+        .select_related('job')
+        .prefetch_related('job__skills_required')
+        .order_by('-match_score', '-job__posted_date')[:10]
+    )
     
-    if user_skills:
-        # Get recommendations
-        rec_list = get_job_recommendations(user, list(user_skills))
-        
-        # Transform recommendation dicts to have job attributes accessible at top level
-        recommendations = []
-        for rec in rec_list:
-            job = rec['job']
-            # Add match info as properties on job object
-            job.match_percentage = rec['match_percent']
-            job.matched_skills_count = rec['matched_skills_count']
-            job.missing_skills_count = rec['missing_skills_count']
-            job.required_skills = job.skills_required.all()
-            recommendations.append(job)
+    # Transform recommendation rows to have job attributes accessible at top level
+    recommendations = []
+    for rec in stored:
+        job = rec.job
+        # Add match info as properties on job object
+        job.match_percentage = int(rec.match_score * 100)
+        job.matched_skills_count = rec.matched_skills_count
+        job.missing_skills_count = rec.total_required_skills - rec.matched_skills_count
+        job.required_skills = job.skills_required.all()
+        recommendations.append(job)
     
     context = {
         'recommendations': recommendations,
-        'user_skills_count': len(user_skills),
+        'user_skills_count': StudentSkill.objects.filter(user=user).count(),
     }
     return render(request, 'skillnest_app/recommended_jobs_merged.html', context)
 
@@ -1025,34 +1123,26 @@ def admin_dashboard(request):
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('dashboard')
     
-    # Calculate statistics
-    total_users = User.objects.count()
-    total_students = User.objects.filter(profile__role='student').count()
-    total_teachers = User.objects.filter(profile__role='teacher').count()
-    total_courses = Course.objects.count()
-    total_certificates = Certificate.objects.count()
-    total_jobs = Job.objects.count()
-    active_jobs = Job.objects.filter(is_active=True).count()
-    total_enrollments = Enrollment.objects.count()
-    active_enrollments = Enrollment.objects.filter(status='in_progress').count()
-    pending_contacts = ContactMessage.objects.filter(is_resolved=False).count()
+    # Counters kept by model signals (see stats.py): one row instead of ten counts
+    stats = get_platform_stats()
     
     # Recent data
-    recent_users = User.objects.order_by('-date_joined')[:5]
-    recent_courses = Course.objects.order_by('-created_at')[:5]
+    recent_users = User.objects.select_related('profile').order_by('-date_joined')[:5]
+    recent_courses = Course.objects.select_related('instructor').order_by('-created_at')[:5]
     recent_certificates = Certificate.objects.order_by('-issue_date')[:5]
     
     context = {
-        'total_users': total_users,
-        'total_students': total_students,
-        'total_teachers': total_teachers,
-        'total_courses': total_courses,
-        'total_certificates': total_certificates,
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'total_enrollments': total_enrollments,
-        'active_enrollments': active_enrollments,
-        'pending_contacts': pending_contacts,
+        'stats': stats,
+        'total_users': stats.total_users,
+        'total_students': stats.total_students,
+        'total_teachers': stats.total_teachers,
+        'total_courses': stats.total_courses,
+        'total_certificates': stats.total_certificates,
+        'total_jobs': stats.total_jobs,
+        'active_jobs': stats.active_jobs,
+        'total_enrollments': stats.total_enrollments,
+        'active_enrollments': stats.active_enrollments,
+        'pending_contacts': stats.pending_contacts,
         'recent_users': recent_users,
         'recent_courses': recent_courses,
         'recent_certificates': recent_certificates,
@@ -1352,6 +1442,26 @@ def admin_toggle_job_status(request, job_id):
     return redirect('admin_jobs')
 
 
+@login_required(login_url='login')
+def admin_job_candidates(request, job_id):
+    """Ranked list of the students who best fit a job posting"""
+    # Check admin role
+    if not hasattr(request.user, 'profile') or request.user.profile.role != 'admin':
+        messages.error(request, 'Access denied. Admin privileges required.')
+        return redirect('dashboard')
+    
+    job = get_object_or_404(Job, pk=job_id)
+    result = get_job_candidates(job, request.GET.get('page'))
+    
+    context = {
+        'job': job,
+        'page_obj': result['page'],
+        'candidates': result['candidates'],
+        'total_required_skills': result['total_required_skills'],
+    }
+    return render(request, 'skillnest_app/admin_job_candidates.html', context)
+
+
 @login_required(login_url='login')
 def admin_skills(request):
     """Skill management - list all skills"""
@@ -0,0 +1,121 @@
+// Chunked, resumable lesson video uploads (see skillnest_app/uploads.py)
+//
+// A form with data-video-upload-url sends the file of its
+// input[data-chunked-upload] in chunks before submitting, then submits the
+// upload id in the hidden field named by that attribute instead of the file.
+// An interrupted upload of the same file resumes with the missing chunks.
+
+(function(){
+  const RETRIES = 3;
+
+  function hex(buffer){
+    return Array.from(new Uint8Array(buffer)).map(b => b.toString(16).padStart(2, '0')).join('');
+  }
+
+  async function sha256(buffer){
+    return crypto.subtle.digest('SHA-256', buffer);
+  }
+
+  function jsonRequest(method, url, csrfToken, body){
+    return fetch(url, {
+      method: method,
+      credentials: 'same-origin',
+      headers: {'Content-Type': 'application/json', 'X-CSRFToken': csrfToken},
+      body: body === undefined ? undefined : JSON.stringify(body)
+    }).then(async response => {
+      const data = await response.json().catch(() => ({}));
+      if(!response.ok) throw new Error(data.error || ('Upload failed (' + response.status + ')'));
+      return data;
+    });
+  }
+
+  async function putChunk(url, csrfToken, blob, digest){
+    for(let attempt = 1; ; attempt++){
+      try{
+        const response = await fetch(url, {
+          method: 'PUT',
+          credentials: 'same-origin',
+          headers: {'X-CSRFToken': csrfToken, 'X-Chunk-SHA256': digest, 'Content-Type': 'application/octet-stream'},
+          body: blob
+        });
+        if(response.ok) return;
+        const data = await response.json().catch(() => ({}));
+        throw new Error(data.error || ('Chunk upload failed (' + response.status + ')'));
+      }catch(err){
+        if(attempt >= RETRIES) throw err;
+        await new Promise(resolve => setTimeout(resolve, 1000 * attempt));
+      }
+    }
+  }
+
+  async function uploadInChunks(baseUrl, csrfToken, file, onProgress){
+    const resumeKey = 'skillnest-upload:' + file.name + ':' + file.size + ':' + file.lastModified;
+    let state = null;
+    const savedId = localStorage.getItem(resumeKey);
+    if(savedId){
+      state = await jsonRequest('GET', baseUrl + savedId + '/', csrfToken).catch(() => null);
+      if(state && state.status === 'complete') return state.upload_id;
+    }
+    if(!state){
+      state = await jsonRequest('POST', baseUrl, csrfToken, {filename: file.name, size: file.size});
+      localStorage.setItem(resumeKey, state.upload_id);
+    }
+
+    const missing = new Set(state.missing_chunks);
+    const digests = new Uint8Array(state.chunk_count * 32);
+    const chunkChecksums = [];
+    for(let index = 0; index < state.chunk_count; index++){
+      const start = index * state.chunk_size;
+      const blob = file.slice(start, Math.min(file.size, start + state.chunk_size));
+      const digest = await sha256(await blob.arrayBuffer());
+      digests.set(new Uint8Array(digest), index * 32);
+      chunkChecksums.push(hex(digest));
+      if(missing.has(index)){
+        await putChunk(baseUrl + state.upload_id + '/chunks/' + index + '/', csrfToken, blob, hex(digest));
+      }
+      onProgress((index + 1) / state.chunk_count);
+    }
+
+    await jsonRequest('POST', baseUrl + state.upload_id + '/complete/', csrfToken, {
+      checksum: hex(await sha256(digests)),
+      // On a mismatch the server forgets only the chunks that differ
+      chunk_checksums: chunkChecksums
+    });
+    localStorage.removeItem(resumeKey);
+    return state.upload_id;
+  }
+
+  document.querySelectorAll('form[data-video-upload-url]').forEach(form => {
+    const input = form.querySelector('input[type="file"][data-chunked-upload]');
+    if(!input || !window.crypto || !crypto.subtle || !window.fetch) return;
+    const target = form.querySelector('input[name="' + input.dataset.chunkedUpload + '"]');
+    const csrf = form.querySelector('input[name="csrfmiddlewaretoken"]');
+    if(!target || !csrf) return;
+
+    const status = document.createElement('small');
+    status.className = 'form-help upload-progress';
+    input.insertAdjacentElement('afterend', status);
+
+    let uploading = false;
+    form.addEventListener('submit', async event => {
+      const file = input.files && input.files[0];
+      if(!file || target.value) return;
+      event.preventDefault();
+      if(uploading) return;
+      uploading = true;
+      try{
+        target.value = await uploadInChunks(form.dataset.videoUploadUrl, csrf.value, file, fraction => {
+          status.textContent = 'Uploading video... ' + Math.floor(fraction * 100) + '%';
+        });
+        // The video is on the server already; submit the form without it
+        input.value = '';
+        status.textContent = 'Upload complete, saving...';
+        form.submit();
+      }catch(err){
+        status.textContent = err.message + ' Submit again to resume.';
+      }finally{
+        uploading = false;
+      }
+    });
+  });
+})();